@@ -1,147 +1,260 @@
 ## Flask 기반의 API 서버 메인 파일
 ## 클라이언트 요청 수신 -> 추천 알고리즘 모듈과 연동해 서버로 추천 결과 반환
+## import 시점에는 무거운 모듈(sklearn, konlpy, openai)을 불러오지 않고, 각 컴포넌트를 처음 사용할 때 생성합니다.
 
-from flask import Flask, request, jsonify
+from flask import Flask, Blueprint, current_app, request, jsonify, Response
 from flask_cors import CORS
 import logging
-import mysql.connector
-from mysql.connector import Error
-from dotenv import load_dotenv
-import os
-import time
-import sys
-from recommendation.recommendation import RecommendationAlgorithm
-from database.user_queries import UserQueries
-from database.item_queries import ItemQueries
-from database.save_preference import PreferenceQueries
-from chatbot.chatbot_main import Chatbot
-from chatbot.keyword_extractor import KeywordExtractor
-from config.settings import OPENAI_API_KEY, OPENAI_MODEL
-
-# .env 파일 로드
-load_dotenv()
-
-
-# 로깅 설정
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+import threading
+import functools
+from config.settings import OPENAI_API_KEY, OPENAI_MODEL, LOGGING_SETTINGS, SERVING_SETTINGS, KEYWORD_SETTINGS
+from monitoring import request_scope, current_request, log_payload, REGISTRY
+
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
-CORS(app)
-
-# 인스턴스 생성&초기화
-user_queries = UserQueries()
-item_queries = ItemQueries()
-save_preference = PreferenceQueries()
-recommender = RecommendationAlgorithm()
-logging.info("RecommendationAlgorithm 인스턴스 생성 완료")
-chatbot = Chatbot(openai_api_key=OPENAI_API_KEY, model=OPENAI_MODEL)
-logging.info("Chatbot 인스턴스 생성 완료")
-extractor = KeywordExtractor(openai_api_key=OPENAI_API_KEY, model=OPENAI_MODEL)
-logging.info("KeywordExtractor 인스턴스 생성 완료")
-user_sessions = {}
+SERVICE_ROLES = ('all', 'recommendations', 'chatbot')
+
+
+class AppComponents:
+    """
+    추천기, 챗봇, 키워드 추출기, DB 저장 객체를 처음 사용할 때 생성해 보관합니다.
+    역할(role)에 필요 없는 컴포넌트는 만들지 않으므로 추천 전용 워커는 konlpy/openai를 불러오지 않습니다.
+    """
+
+    def __init__(self, role: str = 'all'):
+        self.role = role
+        self._lock = threading.Lock()
+        self._recommender = None
+        self._chatbot = None
+        self._extractor = None
+        self._save_preference = None
+        self._sessions = None
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def serves_recommendations(self) -> bool:
+        return self.role in ('all', 'recommendations')
+
+    @property
+    def serves_chatbot(self) -> bool:
+        return self.role in ('all', 'chatbot')
+
+    @property
+    def recommender(self):
+        if self._recommender is None:
+            with self._lock:
+                if self._recommender is None:
+                    from recommendation.recommendation import RecommendationAlgorithm
+                    self._recommender = RecommendationAlgorithm()
+                    self._logger.info("RecommendationAlgorithm 인스턴스 생성 완료")
+        return self._recommender
+
+    @property
+    def chatbot(self):
+        if self._chatbot is None:
+            with self._lock:
+                if self._chatbot is None:
+                    from chatbot.chatbot_main import Chatbot
+                    self._chatbot = Chatbot(openai_api_key=OPENAI_API_KEY, model=OPENAI_MODEL)
+                    self._logger.info("Chatbot 인스턴스 생성 완료")
+        return self._chatbot
+
+    @property
+    def extractor(self):
+        if self._extractor is None:
+            with self._lock:
+                if self._extractor is None:
+                    from chatbot.keyword_extractor import KeywordExtractor
+                    # 추천도 함께 서비스하는 워커는 카탈로그 장르/키워드 어휘로 로컬 키워드 추출
+                    provider = self._catalog_vocabulary if self.serves_recommendations else None
+                    self._extractor = KeywordExtractor(openai_api_key=OPENAI_API_KEY, model=OPENAI_MODEL,
+                                                       vocabulary_provider=provider)
+                    self._logger.info("KeywordExtractor 인스턴스 생성 완료")
+        return self._extractor
+
+    def _catalog_vocabulary(self):
+        """(카탈로그 버전, 장르/키워드 어휘). 카탈로그를 아직 만들지 않았으면 None"""
+        catalog = self.recommender.current_catalog
+        if catalog is None:
+            return None
+        return catalog.version, catalog.vocabulary
+
+    @property
+    def sessions(self):
+        """챗봇 대화 세션 (워커 메모리, 턴별 키워드 추출 스레드 풀 포함)"""
+        if self._sessions is None:
+            with self._lock:
+                if self._sessions is None:
+                    from chatbot.session import SessionStore
+                    self._sessions = SessionStore(workers=KEYWORD_SETTINGS['turn_workers'],
+                                                  ttl_s=KEYWORD_SETTINGS['session_ttl_s'])
+        return self._sessions
+
+    def session_keywords(self, user_id) -> list:
+        """진행 중인 대화에서 지금까지 추출된 키워드 (챗봇을 서비스하지 않는 워커거나 세션이 없으면 빈 목록)"""
+        if self._sessions is None:
+            return []
+        session = self._sessions.get(user_id)
+        return session.keywords_so_far() if session is not None else []
+
+    @property
+    def save_preference(self):
+        if self._save_preference is None:
+            with self._lock:
+                if self._save_preference is None:
+                    from database.save_preference import PreferenceQueries
+                    self._save_preference = PreferenceQueries()
+        return self._save_preference
+
+    def preferences_changed(self, user_id) -> None:
+        """선호도를 저장한 사용자의 보관된 선호 벡터 무효화 (이 워커에서 추천기를 만든 경우에만)"""
+        if self._recommender is not None:
+            self._recommender.invalidate_user(user_id)
+
+    def preload(self) -> bool:
+        """
+        fork 전에 공유할 상태(카탈로그 스냅샷, vectorizer, 이웃 테이블)를 미리 만듭니다.
+        gunicorn preload_app 사용 시 master에서 한 번 호출됩니다. (gunicorn_conf.py)
+        """
+        if not self.serves_recommendations:
+            return True
+        return self.recommender.warm_up()
+
+    def warm_up_worker(self) -> None:
+        """워커 프로세스별 초기화: Okt(JVM)는 fork 이후 워커마다 띄워야 합니다."""
+        if self.serves_chatbot:
+            self.extractor.warm_up()
+            self.chatbot
+        if self.serves_recommendations:
+            if not self.recommender.is_warm:
+                # preload 없이 실행된 경우 워커에서 직접 카탈로그 생성
+                self.recommender.warm_up()
+            # CATALOG_SNAPSHOT_MODE=follow면 새 스냅샷을 감시하는 스레드 시작 (워커마다)
+            self.recommender.start_snapshot_watcher()
+
+    def readiness(self) -> dict:
+        checks = {}
+        if self.serves_recommendations:
+            checks['catalog'] = self._recommender is not None and self._recommender.is_warm
+        if self.serves_chatbot:
+            checks['okt'] = self._extractor is not None and self._extractor.is_warm
+        return checks
+
+
+def components() -> AppComponents:
+    return current_app.extensions['forest']
+
+
+def with_request_log(view):
+    """엔드포인트 요청마다 단계별 소요 시간을 모아 요약 로그 한 줄을 남기는 데코레이터"""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        with request_scope(request.path) as req_log:
+            response = view(*args, **kwargs)
+            status = response[1] if isinstance(response, tuple) else getattr(response, 'status_code', 200)
+            req_log.set(status=status)
+            return response
+    return wrapper
+
+
+chatbot_bp = Blueprint('chatbot', __name__)
+recommendation_bp = Blueprint('recommendation', __name__)
+ops_bp = Blueprint('ops', __name__)
 
 # 챗봇
-@app.route('/chatbot/answer', methods=['POST'])
+@chatbot_bp.route('/chatbot/answer', methods=['POST'])
+@with_request_log
 def chatbot_answer():
-    start_time = time.time()
-    logging.info("/chatbot/answer 엔드포인트 호출됨")
     try:
         data = request.get_json()
         user_id = data.get('user_id')
         question_id = data.get('question_id')
         message = data.get('message')
-        logging.info(f"question_id: {question_id}, user_id: {user_id}, message: {message}")
+        current_request().set(user_id=user_id, question_id=question_id)
+        log_payload(logger, "question_id: %s, user_id: %s, message: %s", question_id, user_id, message)
         if not user_id or not question_id or not message:
-            logging.warning(f'필수 데이터 누락 - user_id: {user_id}, question_id: {question_id} message: {message}')
+            logger.warning('필수 데이터 누락 - user_id: %s, question_id: %s', user_id, question_id)
             return jsonify({'status': 'error', 'message': '요청 데이터가 올바르지 않습니다.'}), 400
 
+        forest = components()
         # question_id가 1이면 세션 초기화
         if question_id == "1":
-            logging.info(f"user_id: {user_id} - 대화 세션 초기화")
-            user_sessions[user_id] = []
-
-        # 대화 세션 관리(실제는 DB 등 추천)
-        logging.info("챗봇 대화 세션 저장")
-        dialogue = user_sessions.setdefault(user_id, [])
-        # dialogue.append(message)
-        last_bot_question = dialogue[-1][1] if dialogue else ""
-        dialogue.append((message, ""))
-
-        # 취향 키워드 추출 (질문 생성 용도)
-        #logging.info("챗봇 키워드 추출")
-        #keywords = extractor.extract(message)
-
-        # 챗봇의 '후속 질문' 생성 (few-shot + 현재 내역 & 키워드 반영)
-        logging.info("챗봇 후속 질문 생성")
-        logging.info("dialogue 구조 확인: %s", repr(dialogue))
-        #logging.info("keywords: %s", repr(keywords))
-        next_question = chatbot.generate_next_question(dialogue)
+            logger.debug("user_id: %s - 대화 세션 초기화", user_id)
+            session = forest.sessions.reset(user_id)
+        else:
+            session = forest.sessions.get_or_create(user_id)
+
+        turn = session.add_turn(message)
+
+        # 취향 키워드 추출은 백그라운드에서 턴마다 수행하고 세션에 누적 (/chatbot/save는 저장만)
+        # strict: GPT 호출 실패를 빈 결과가 아닌 실패로 기록해 저장 시 그 턴만 다시 추출
+        if KEYWORD_SETTINGS['per_turn']:
+            extractor = forest.extractor
+            forest.sessions.extract_in_background(session, turn, message,
+                                                  lambda text: extractor.extract(text, strict=True))
+
+        # 챗봇의 '후속 질문' 생성 (few-shot + 현재 내역 반영)
+        log_payload(logger, "dialogue 구조 확인: %r", session.dialogue)
+        next_question = forest.chatbot.generate_next_question(session.dialogue)
 
         # dialogue 최신 발화 갱신
-        logging.info("발화 갱신")
-        dialogue[-1] = (message, next_question)
+        session.set_reply(turn, next_question)
 
-        logging.info("질문 반환")
-        end_time = time.time()
-        logging.info(f"챗봇 응답 소요 시간: {end_time - start_time:.2f}초")
         # **reply에는 오직 질문만 반환 (키워드 등은 절대 노출X)**
         return jsonify({'status': 'success', 'reply': next_question}), 200
 
     except Exception as e:
-        logging.error(f"챗봇 처리 중 오류: {str(e)}")
+        logger.error("챗봇 처리 중 오류: %s", e)
         return jsonify({'status': 'error', 'message': '챗봇 처리 중 오류가 발생했습니다.'}), 500
 
-@app.route('/chatbot/save', methods=['POST'])
+@chatbot_bp.route('/chatbot/save', methods=['POST'])
+@with_request_log
 def chatbot_save():
-    logging.info("/chatbot/save 엔드포인트 호출됨")
     try:
         data = request.get_json()
         user_id = data.get('user_id')
         if not user_id:
             return jsonify({'status': 'error', 'message': 'user_id가 필요합니다.'}), 400
-        
-        logging.info(f"{user_id} 대화 내역 불러오기")
-        dialogue = user_sessions.get(user_id, [])
-        logging.info("dialogue 구조 확인: %s", repr(dialogue))
-        if not dialogue:
+
+        current_request().set(user_id=user_id)
+        forest = components()
+        session = forest.sessions.get(user_id)
+        if session is None or not session.dialogue:
             return jsonify({'status': 'error', 'message': '대화 기록 없음'}), 404
+        log_payload(logger, "dialogue 구조 확인: %r", session.dialogue)
+
+        if KEYWORD_SETTINGS['per_turn']:
+            # 턴별로 모아둔 키워드를 합침 (진행 중인 추출만 잠시 기다리고, 실패한 턴만 다시 추출)
+            keywords = session.finalize(forest.extractor.extract, timeout=KEYWORD_SETTINGS['save_wait_s'])
+        else:
+            # 메시지 합치기
+            all_text = " ".join(ut[0] for ut in session.dialogue)
+            keywords = forest.extractor.extract(all_text)
+        current_request().set(turns=len(session.dialogue), keywords=len(keywords))
+        log_payload(logger, "대화 키워드 추출 결과: %s", keywords)
 
-        # 메시지 합치기
-        logging.info("메시지 통합")
-        logging.info("dialogue 구조 확인: %s", repr(dialogue))
-        all_text = " ".join(ut[0] for ut in dialogue)
-        logging.info(f"모든 발화 통합: {all_text}")
-        logging.info("키워드 추출")
-        keywords = extractor.extract(all_text)
-        print("[전체 발화 기준 키워드 추출 결과]",keywords)
-    
-        logging.info("키워드 저장")
         # DB 저장 (preference)
-        save_preference.save_like_words(user_id, keywords)
+        forest.save_preference.save_like_words(user_id, keywords)
+        # /recommendations/live가 저장 전 선호 벡터를 계속 쓰지 않도록
+        forest.preferences_changed(user_id)
 
         # # 대화 세션 초기화
-        # if user_id in user_sessions:
-        #     del user_sessions[user_id]
+        # forest.sessions.reset(user_id)
 
         return jsonify({'status': 'success', 'message': '성공적으로 저장되었습니다.'}), 200
 
     except Exception as e:
-        print("[ERROR]", str(e))
+        logger.error("키워드 저장 중 오류: %s", e)
         return jsonify({'status': 'error', 'message': '키워드 저장 중 오류가 발생했습니다.'}), 500
 
 # 추천 리스트
-@app.route("/recommendations", methods=["POST"])
+@recommendation_bp.route("/recommendations", methods=["POST"])
+@with_request_log
 def create_recommendations():
-    start_time = time.time()
     try:
-        logging.info("recommendations 엔드포인트 호출됨")
         data = request.get_json()   # Request body에서 JSON 데이터 가져오기
-        logging.debug(f"수신된 데이터: {data}")
-        
+        log_payload(logger, "수신된 데이터: %s", data)
+
         # user_id 검증
         if not data or 'user_id' not in data:
             # user_id 없는 경우 400 에러 처리
@@ -149,18 +262,27 @@ def create_recommendations():
                 "status": "error",
                 "message": "유효하지 않은 사용자 ID입니다."
             }), 400
-        
+
         user_id = data['user_id']
-        logging.info(f"처리 중인 user_id: {user_id}")
+        current_request().set(user_id=user_id)
 
-        # 추천 목록 생성
+        # 컨텐츠 타입/장르/리뷰한 아이템 제외 필터 (선택)
         try:
-            logging.info("추천 알고리즘 실행 시작")
-            recommendation_list = recommender.get_recommendations(user_id)
-            logging.info(f"추천 결과 생성됨: {recommendation_list}")
+            item_filter = _item_filter(data)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        if item_filter:
+            current_request().set(item_filter=item_filter)
+
+        # cursor 또는 limit이 있으면 페이지 단위로 반환 (없으면 기존처럼 top_k개)
+        if 'cursor' in data or 'limit' in data:
+            return _recommendation_page(user_id, data.get('cursor'), data.get('limit'), item_filter)
 
-            end_time = time.time()
-            logging.info(f"추천 생성 완료, 소요 시간: {end_time - start_time:.2f}초")
+        # 추천 목록 생성
+        try:
+            recommendation_list = components().recommender.get_recommendations(user_id, item_filter)
+            current_request().set(results=len(recommendation_list))
+            log_payload(logger, "추천 결과 생성됨: %s", recommendation_list)
 
             if len(recommendation_list) > 0:
                 return jsonify({
@@ -176,18 +298,231 @@ def create_recommendations():
                 })
 
         except Exception as e:
-            logging.error(f"추천 생성 중 오류 발생: {str(e)}")
+            logger.error("추천 생성 중 오류 발생: %s", e)
             return jsonify({
                 "status": "error",
                 "message": f"추천 생성 중 오류 발생: {str(e)}"
             }),500
-    
+
     except Exception as e:
         # 서버 내부 오류 발생 시 500 에러 처리
         return jsonify({
             "status" : "error",
             "message": "서버 내부 오류가 발생했습니다."
         }),500
-    
+
+def _item_filter(data):
+    """요청 본문의 content_type, genre(문자열 또는 리스트), exclude_reviewed -> ItemFilter"""
+    from recommendation.filters import ItemFilter
+    from recommendation.preprocessor import ContentType
+    for field in ('content_type', 'genre'):
+        value = data.get(field)
+        if value is not None and not isinstance(value, (str, list)):
+            raise ValueError(f"{field}는 문자열 또는 문자열 리스트여야 합니다.")
+    return ItemFilter.create(
+        content_types=data.get('content_type'),
+        genres=data.get('genre'),
+        exclude_reviewed=data.get('exclude_reviewed', False),
+        valid_types=ContentType.get_valid_types()
+    )
+
+def _recommendation_page(user_id, cursor, limit, item_filter):
+    if limit is not None and (not isinstance(limit, int) or limit <= 0):
+        return jsonify({"status": "error", "message": "limit는 양의 정수여야 합니다."}), 400
+    if cursor is not None and not isinstance(cursor, str):
+        return jsonify({"status": "error", "message": "유효하지 않은 cursor입니다."}), 400
+
+    try:
+        page = components().recommender.get_recommendation_page(user_id, cursor, limit, item_filter)
+    except ValueError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
+    except Exception as e:
+        logger.error("추천 페이지 생성 중 오류 발생: %s", e)
+        return jsonify({
+            "status": "error",
+            "message": f"추천 생성 중 오류 발생: {str(e)}"
+        }), 500
+
+    current_request().set(results=len(page['recommendations']))
+    log_payload(logger, "추천 페이지: %s", page)
+    return jsonify({
+        "status": "success" if page['recommendations'] else "fail",
+        "recommendations": page['recommendations'],
+        "next_cursor": page['next_cursor'],
+        "message": "추천 상품 목록을 성공적으로 가져왔습니다." if page['recommendations'] else "추천 상품 목록이 없습니다."
+    })
+
+# 대화 중 추천 (진행 중인 챗봇 세션 키워드 반영, DB 쓰기 없음)
+@recommendation_bp.route("/recommendations/live", methods=["POST"])
+@with_request_log
+def create_live_recommendations():
+    try:
+        data = request.get_json()
+        if not data or 'user_id' not in data:
+            return jsonify({
+                "status": "error",
+                "message": "유효하지 않은 사용자 ID입니다."
+            }), 400
+
+        user_id = data['user_id']
+        k = data.get('k')
+        if k is not None and (not isinstance(k, int) or k <= 0):
+            return jsonify({"status": "error", "message": "k는 양의 정수여야 합니다."}), 400
+
+        forest = components()
+        session_keywords = forest.session_keywords(user_id)
+        current_request().set(user_id=user_id, session_keywords=len(session_keywords))
+        recommendation_list = forest.recommender.get_live_recommendations(user_id, session_keywords, k)
+        current_request().set(results=len(recommendation_list))
+        log_payload(logger, "대화 중 추천 결과 (키워드: %s): %s", session_keywords, recommendation_list)
+
+        return jsonify({
+            "status": "success" if recommendation_list else "fail",
+            "recommendations": recommendation_list,
+            "keywords": session_keywords,
+            "message": "추천 상품 목록을 성공적으로 가져왔습니다." if recommendation_list else "추천 상품 목록이 없습니다."
+        })
+
+    except Exception as e:
+        logger.error("대화 중 추천 생성 중 오류 발생: %s", e)
+        return jsonify({
+            "status": "error",
+            "message": "서버 내부 오류가 발생했습니다."
+        }), 500
+
+# 비슷한 아이템 (상세 페이지용, 카탈로그 갱신 시 만든 이웃 테이블 조회)
+@recommendation_bp.route("/items/<int:activity_id>/similar", methods=["GET"])
+@with_request_log
+def get_similar_items(activity_id):
+    try:
+        k = request.args.get('k', type=int)
+        if k is not None and k <= 0:
+            return jsonify({"status": "error", "message": "k는 양의 정수여야 합니다."}), 400
+        content_type = request.args.get('content_type')
+
+        current_request().set(activity_id=activity_id)
+        try:
+            similar_items = components().recommender.get_similar_items(activity_id, k, content_type)
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+        if similar_items is None:
+            return jsonify({
+                "status": "error",
+                "message": "존재하지 않는 activity_id입니다."
+            }), 404
+        current_request().set(results=len(similar_items))
+
+        return jsonify({
+            "status": "success" if similar_items else "fail",
+            "activity_id": activity_id,
+            "items": similar_items,
+            "message": "비슷한 아이템 목록을 성공적으로 가져왔습니다." if similar_items else "비슷한 아이템이 없습니다."
+        })
+
+    except Exception as e:
+        logger.error("비슷한 아이템 조회 중 오류 발생: %s", e)
+        return jsonify({
+            "status": "error",
+            "message": "서버 내부 오류가 발생했습니다."
+        }), 500
+
+# 제목/장르/키워드 검색 (카탈로그 역색인 조회, DB 조회 없음)
+@recommendation_bp.route("/search", methods=["GET"])
+@with_request_log
+def search_items():
+    try:
+        query = (request.args.get('q') or '').strip()
+        if not query:
+            return jsonify({"status": "error", "message": "검색어(q)가 없습니다."}), 400
+        k = request.args.get('k', type=int)
+        if k is not None and k <= 0:
+            return jsonify({"status": "error", "message": "k는 양의 정수여야 합니다."}), 400
+        try:
+            item_filter = _item_filter({'content_type': request.args.getlist('content_type') or None,
+                                        'genre': request.args.getlist('genre') or None})
+        except ValueError as e:
+            return jsonify({"status": "error", "message": str(e)}), 400
+
+        current_request().set(query_length=len(query))
+        items = components().recommender.search_items(query, k, item_filter)
+        current_request().set(results=len(items))
+        log_payload(logger, "검색 결과 (%s): %s", query, items)
+
+        return jsonify({
+            "status": "success" if items else "fail",
+            "query": query,
+            "items": items,
+            "message": "검색 결과를 성공적으로 가져왔습니다." if items else "검색 결과가 없습니다."
+        })
+
+    except Exception as e:
+        logger.error("검색 중 오류 발생: %s", e)
+        return jsonify({
+            "status": "error",
+            "message": "서버 내부 오류가 발생했습니다."
+        }), 500
+
+# 헬스 체크 (live: 프로세스 동작 여부, ready: 역할에 필요한 카탈로그/Okt 초기화 완료 여부)
+@ops_bp.route('/health/live', methods=['GET'])
+def health_live():
+    return jsonify({'status': 'ok'}), 200
+
+@ops_bp.route('/health/ready', methods=['GET'])
+def health_ready():
+    checks = components().readiness()
+    status = 200 if all(checks.values()) else 503
+    return jsonify({'status': 'ok' if status == 200 else 'warming_up', 'role': components().role,
+                    'checks': checks}), status
+
+# 메트릭 (Prometheus 텍스트 포맷)
+@ops_bp.route('/metrics', methods=['GET'])
+def metrics():
+    if not REGISTRY.enabled:
+        return jsonify({'status': 'error', 'message': '메트릭 수집이 비활성화되어 있습니다.'}), 404
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
+def create_app(role: str = None) -> Flask:
+    """
+    Flask 앱 생성. 역할(SERVICE_ROLE)에 해당하는 엔드포인트만 등록하며,
+    컴포넌트는 첫 요청 또는 preload/warm_up 시점에 생성됩니다.
+    """
+    role = role or SERVING_SETTINGS['role']
+    if role not in SERVICE_ROLES:
+        raise ValueError(f"알 수 없는 SERVICE_ROLE: {role} (가능한 값: {', '.join(SERVICE_ROLES)})")
+
+    # 로깅 설정
+    logging.basicConfig(
+        level=LOGGING_SETTINGS['level'],
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    flask_app = Flask(__name__)
+    CORS(flask_app)
+    forest = AppComponents(role)
+    flask_app.extensions['forest'] = forest
+    if forest.serves_chatbot:
+        flask_app.register_blueprint(chatbot_bp)
+    if forest.serves_recommendations:
+        flask_app.register_blueprint(recommendation_bp)
+    flask_app.register_blueprint(ops_bp)
+    logger.info("Flask 앱 생성 완료 (role: %s)", role)
+    return flask_app
+
+
+app = create_app()
+
+
+def preload_models() -> bool:
+    return app.extensions['forest'].preload()
+
+
+def warm_up_worker() -> None:
+    app.extensions['forest'].warm_up_worker()
+
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5000)
\ No newline at end of file
+    # 개발 서버 실행. 운영 환경에서는 gunicorn -c gunicorn_conf.py wsgi:app 사용
+    preload_models()
+    warm_up_worker()
+    app.run(host='0.0.0.0', port=5000)
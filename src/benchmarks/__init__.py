@@ -0,0 +1 @@
+## 벤치마크 및 로컬 테스트 도구
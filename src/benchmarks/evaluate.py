@@ -0,0 +1,159 @@
+## 오프라인 추천 품질 평가
+## REVIEW 데이터 중 일부 사용자의 높은 평점 리뷰를 정답으로 떼어두고(held-out),
+## get_recommendations 결과와 비교해 precision@K, recall@K, NDCG@K, coverage와 지연 시간을 백엔드별로 비교합니다.
+##
+## 실행 (src 디렉토리에서):
+##   python -m benchmarks.evaluate --items 10k --users 2000 --backends exact,mmr
+##   python -m benchmarks.evaluate --db forest_local.db --backends exact,mmr --k 20
+import argparse
+import json
+import logging
+import math
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Set
+
+# 평가할 점수 계산 백엔드: 이름 -> RECOMMENDATION_SETTINGS 덮어쓰기
+BACKENDS = {
+    'exact': {'use_mmr': False},
+    'mmr': {'use_mmr': True},
+    'process': {'use_mmr': True, 'scoring_backend': 'process'},
+}
+
+
+def precision_recall_ndcg(recommended: List[int], relevant: Set[int], k: int) -> Dict[str, float]:
+    top = recommended[:k]
+    hits = [1.0 if activity_id in relevant else 0.0 for activity_id in top]
+    dcg = sum(hit / math.log2(rank + 2) for rank, hit in enumerate(hits))
+    ideal = sum(1.0 / math.log2(rank + 2) for rank in range(min(len(relevant), k)))
+    return {
+        'precision': sum(hits) / k if k else 0.0,
+        'recall': sum(hits) / len(relevant) if relevant else 0.0,
+        'ndcg': dcg / ideal if ideal else 0.0,
+    }
+
+
+def split_held_out(reviews: List[Dict[str, Any]], test_users: int, min_rate: float,
+                   seed: int) -> Dict[int, Set[int]]:
+    """min_rate 이상 평점을 2개 이상 남긴 사용자 중 test_users명을 골라 정답 아이템 집합을 만듭니다."""
+    positives = {}
+    for review in reviews:
+        if review.get('rate') is not None and float(review['rate']) >= min_rate:
+            positives.setdefault(review['user_id'], set()).add(review['item_id'])
+    candidates = sorted(user_id for user_id, items in positives.items() if len(items) >= 2)
+    random.Random(seed).shuffle(candidates)
+    return {user_id: positives[user_id] for user_id in candidates[:test_users]}
+
+
+def remove_held_out(db_path: str, held_out: Dict[int, Set[int]]) -> None:
+    """정답 리뷰를 로컬 DB에서 지워 인기 목록 등에 새지 않도록 합니다."""
+    import sqlite3
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany(
+            "DELETE FROM REVIEW WHERE user_id = ? AND activity_id = ?",
+            [(user_id, activity_id) for user_id, items in held_out.items() for activity_id in items]
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def evaluate_backend(name: str, settings: Dict[str, Any], held_out: Dict[int, Set[int]],
+                     k: int) -> Dict[str, Any]:
+    from recommendation.recommendation import RecommendationAlgorithm
+
+    recommender = RecommendationAlgorithm({**settings, 'top_k': k})
+    refresh_start = time.perf_counter()
+    catalog = recommender.refresh_catalog()
+    refresh_seconds = time.perf_counter() - refresh_start
+
+    totals = {'precision': 0.0, 'recall': 0.0, 'ndcg': 0.0}
+    latencies = []
+    recommended_items = set()
+    for user_id, relevant in held_out.items():
+        start = time.perf_counter()
+        recommended = recommender.get_recommendations(user_id)
+        latencies.append(time.perf_counter() - start)
+        recommended_items.update(recommended)
+        for metric, value in precision_recall_ndcg(recommended, relevant, k).items():
+            totals[metric] += value
+
+    n_users = len(held_out) or 1
+    latencies_ms = sorted(latency * 1000 for latency in latencies)
+    return {
+        'backend': name,
+        'settings': settings,
+        f'precision@{k}': round(totals['precision'] / n_users, 4),
+        f'recall@{k}': round(totals['recall'] / n_users, 4),
+        f'ndcg@{k}': round(totals['ndcg'] / n_users, 4),
+        'coverage': round(len(recommended_items) / max(1, len(catalog)), 4),
+        'refresh_ms': round(refresh_seconds * 1000, 1),
+        'p50_ms': round(latencies_ms[len(latencies_ms) // 2], 3) if latencies_ms else 0.0,
+        'p95_ms': round(latencies_ms[int(0.95 * (len(latencies_ms) - 1))], 3) if latencies_ms else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='오프라인 추천 품질 평가')
+    parser.add_argument('--db', default='', help='기존 로컬 SQLite DB 경로 (복사본에서 평가). 없으면 새로 생성')
+    parser.add_argument('--items', default='10k', help='새로 생성할 합성 아이템 수')
+    parser.add_argument('--users', type=int, default=2000, help='새로 생성할 합성 사용자 수')
+    parser.add_argument('--test-users', type=int, default=500, help='평가에 사용할 사용자 수')
+    parser.add_argument('--min-rate', type=float, default=4.0, help='정답으로 볼 최소 평점')
+    parser.add_argument('--k', type=int, default=50)
+    parser.add_argument('--backends', default=','.join(BACKENDS), help=f"쉼표 구분 ({', '.join(BACKENDS)})")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='', help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix='forest_eval_')
+    db_path = os.path.join(workdir, 'eval.db')
+    try:
+        if args.db:
+            shutil.copyfile(args.db, db_path)
+        else:
+            from benchmarks.local_db import build_local_db, parse_scale
+            build_local_db(db_path, parse_scale(args.items), args.users, seed=args.seed)
+
+        # 설정 모듈은 환경 변수를 import 시점에 읽으므로 프로젝트 모듈 import 전에 지정
+        os.environ['DB_BACKEND'] = 'sqlite'
+        os.environ['SQLITE_PATH'] = db_path
+        logging.disable(logging.INFO)
+
+        from database.rating_queries import RatingQueries
+        held_out = split_held_out(RatingQueries().get_ratings_data() or [], args.test_users,
+                                  args.min_rate, args.seed)
+        if not held_out:
+            print("평가할 사용자가 없습니다. (평점 데이터 부족)", file=sys.stderr)
+            sys.exit(1)
+        remove_held_out(db_path, held_out)
+
+        results = []
+        for name in [b.strip() for b in args.backends.split(',') if b.strip()]:
+            if name not in BACKENDS:
+                print(f"알 수 없는 백엔드: {name}", file=sys.stderr)
+                sys.exit(1)
+            results.append(evaluate_backend(name, BACKENDS[name], held_out, args.k))
+
+        columns = [f'precision@{args.k}', f'recall@{args.k}', f'ndcg@{args.k}', 'coverage', 'p50_ms', 'p95_ms']
+        print(f"평가 사용자 {len(held_out)}명, K={args.k}")
+        print(f"{'backend':12s}" + ''.join(f"{column:>16s}" for column in columns))
+        for result in results:
+            print(f"{result['backend']:12s}" + ''.join(f"{result[column]:>16}" for column in columns))
+
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                json.dump({'test_users': len(held_out), 'k': args.k, 'results': results}, f,
+                          ensure_ascii=False, indent=2)
+            print(f"결과 저장: {args.output}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
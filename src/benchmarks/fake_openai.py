@@ -0,0 +1,225 @@
+## 부하 테스트용 OpenAI 호환 가짜 서버
+## /v1/chat/completions 요청에 설정한 지연 시간/오류율로 응답합니다. (stream=true면 토큰 단위 SSE 전송)
+## 프롬프트 유형(후속 질문, 키워드 추출, 긍정 판별)에 맞는 형태의 답을 돌려주므로 챗봇 흐름을 그대로 탈 수 있습니다.
+##
+## 실행 (src 디렉토리에서):
+##   python -m benchmarks.fake_openai --port 8089 --latency-ms 400 --jitter-ms 150 --error-rate 0.02
+##   OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=sk-fake python3 app.py
+import argparse
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+FOLLOW_UP_QUESTIONS = [
+    "그 작품에서 가장 인상 깊었던 장면은 무엇이었나요?",
+    "평소에 어떤 분위기의 공연을 즐겨 보시나요?",
+    "최근에 다녀오신 전시 중 기억에 남는 작품이 있으신가요?",
+    "좋아하시는 영화 장르를 조금 더 자세히 말씀해주실 수 있으신가요?",
+]
+
+_WORD_PATTERN = re.compile(r"[가-힣a-zA-Z0-9]{2,}")
+
+
+class FakeOpenAIConfig:
+    """응답 지연/오류 설정 (실행 중 /admin/config로 변경 가능)"""
+
+    def __init__(self, latency_ms: float = 300.0, jitter_ms: float = 100.0, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, tokens_per_sec: float = 50.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.tokens_per_sec = tokens_per_sec
+        self._lock = threading.Lock()
+        self.counts = {'requests': 0, 'errors': 0, 'rate_limited': 0, 'streams': 0}
+
+    def update(self, values: Dict[str, Any]) -> None:
+        for key in ('latency_ms', 'jitter_ms', 'error_rate', 'rate_limit_rate', 'tokens_per_sec'):
+            if key in values:
+                setattr(self, key, float(values[key]))
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'latency_ms': self.latency_ms,
+            'jitter_ms': self.jitter_ms,
+            'error_rate': self.error_rate,
+            'rate_limit_rate': self.rate_limit_rate,
+            'tokens_per_sec': self.tokens_per_sec,
+            'counts': dict(self.counts),
+        }
+
+    def sample_latency(self) -> float:
+        return max(0.0, random.gauss(self.latency_ms, self.jitter_ms)) / 1000 if self.jitter_ms else self.latency_ms / 1000
+
+
+def fake_completion_text(messages: List[Dict[str, Any]]) -> str:
+    """프롬프트 유형에 맞는 가짜 응답 생성"""
+    prompt = '\n'.join(str(m.get('content', '')) for m in messages)
+    if '"예"' in prompt:
+        # 긍정 키워드 판별
+        return random.choice(['예', '예', '아니요'])
+    if 'Keywords:' in prompt:
+        # 키워드 추출: 대상 문장에서 단어 몇 개를 골라 쉼표로 구분
+        sentence = prompt.rsplit('Sentence:', 1)[-1]
+        words = list(dict.fromkeys(_WORD_PATTERN.findall(sentence)))
+        return ', '.join(words[:random.randint(3, 5)])
+    return random.choice(FOLLOW_UP_QUESTIONS)
+
+
+def _completion_body(model: str, text: str) -> Dict[str, Any]:
+    return {
+        'id': f"chatcmpl-{uuid.uuid4().hex[:24]}",
+        'object': 'chat.completion',
+        'created': int(time.time()),
+        'model': model,
+        'choices': [{
+            'index': 0,
+            'message': {'role': 'assistant', 'content': text},
+            'finish_reason': 'stop',
+        }],
+        'usage': {'prompt_tokens': 0, 'completion_tokens': len(text.split()), 'total_tokens': len(text.split())},
+    }
+
+
+def _chunk_body(completion_id: str, model: str, delta: Dict[str, Any], finish_reason=None) -> Dict[str, Any]:
+    return {
+        'id': completion_id,
+        'object': 'chat.completion.chunk',
+        'created': int(time.time()),
+        'model': model,
+        'choices': [{'index': 0, 'delta': delta, 'finish_reason': finish_reason}],
+    }
+
+
+def make_handler(config: FakeOpenAIConfig):
+    class FakeOpenAIHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            logger.debug(format, *args)
+
+        def _send_json(self, status: int, body: Dict[str, Any]) -> None:
+            payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _read_json(self) -> Dict[str, Any]:
+            length = int(self.headers.get('Content-Length') or 0)
+            return json.loads(self.rfile.read(length) or b'{}')
+
+        def do_GET(self):
+            if self.path.rstrip('/') == '/admin/config':
+                self._send_json(200, config.to_dict())
+            else:
+                self._send_json(404, {'error': {'message': 'not found'}})
+
+        def do_POST(self):
+            path = self.path.rstrip('/')
+            body = self._read_json()
+            if path == '/admin/config':
+                config.update(body)
+                self._send_json(200, config.to_dict())
+                return
+            if not path.endswith('/chat/completions'):
+                self._send_json(404, {'error': {'message': 'not found'}})
+                return
+
+            config.count('requests')
+            time.sleep(config.sample_latency())
+
+            roll = random.random()
+            if roll < config.rate_limit_rate:
+                config.count('rate_limited')
+                self._send_json(429, {'error': {'message': 'Rate limit reached (fake)', 'type': 'rate_limit_error'}})
+                return
+            if roll < config.rate_limit_rate + config.error_rate:
+                config.count('errors')
+                self._send_json(500, {'error': {'message': 'Internal error (fake)', 'type': 'server_error'}})
+                return
+
+            model = body.get('model', 'fake-model')
+            text = fake_completion_text(body.get('messages', []))
+            if body.get('stream'):
+                config.count('streams')
+                self._stream(model, text)
+            else:
+                self._send_json(200, _completion_body(model, text))
+
+        def _stream(self, model: str, text: str) -> None:
+            """토큰(어절) 단위로 tokens_per_sec 속도에 맞춰 SSE 청크 전송"""
+            completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            self.close_connection = True
+
+            delay = 1.0 / config.tokens_per_sec if config.tokens_per_sec > 0 else 0.0
+            tokens = re.findall(r'\S+\s*', text)
+            chunks = [_chunk_body(completion_id, model, {'role': 'assistant', 'content': ''})]
+            chunks += [_chunk_body(completion_id, model, {'content': token}) for token in tokens]
+            chunks.append(_chunk_body(completion_id, model, {}, finish_reason='stop'))
+            for i, chunk in enumerate(chunks):
+                if i > 1 and delay:
+                    time.sleep(delay)
+                self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode('utf-8'))
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+    return FakeOpenAIHandler
+
+
+def start_server(host: str = '127.0.0.1', port: int = 0, config: FakeOpenAIConfig = None):
+    """백그라운드 스레드에서 서버를 띄우고 (server, config)를 반환합니다. (port=0이면 빈 포트 사용)"""
+    config = config or FakeOpenAIConfig()
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, config
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OpenAI 호환 가짜 서버 (부하 테스트용)')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--latency-ms', type=float, default=300.0, help='평균 응답 지연')
+    parser.add_argument('--jitter-ms', type=float, default=100.0, help='지연 표준편차')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='500 응답 비율')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help='429 응답 비율')
+    parser.add_argument('--tokens-per-sec', type=float, default=50.0, help='stream=true 응답의 토큰 전송 속도')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    config = FakeOpenAIConfig(args.latency_ms, args.jitter_ms, args.error_rate,
+                              args.rate_limit_rate, args.tokens_per_sec)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(config))
+    server.daemon_threads = True
+    logger.info("가짜 OpenAI 서버 시작: http://%s:%s/v1 (%s)", args.host, args.port, config.to_dict())
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,237 @@
+## Flask 엔드포인트 부하 테스트
+## /recommendations, /chatbot/answer, /chatbot/save를 목표 RPS로 호출(open-loop)하고
+## 엔드포인트별 p50/p95/p99 지연 시간, 오류율, 실제 처리량을 기록합니다.
+## 서버 워커/스레드 설정을 바꿔 가며 --rps 목록을 단계적으로 올리면 처리량 한계를 찾을 수 있습니다.
+##
+## 실행 (src 디렉토리에서, 서버와 가짜 OpenAI 서버를 먼저 띄운 상태):
+##   python -m benchmarks.fake_openai --port 8089 --latency-ms 400
+##   OPENAI_BASE_URL=http://127.0.0.1:8089/v1 OPENAI_API_KEY=sk-fake \
+##     DB_BACKEND=sqlite SQLITE_PATH=forest_local.db python3 app.py
+##   python -m benchmarks.load_test --url http://127.0.0.1:5000 --rps 10,20,50 --duration 30 --output load.json
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+# 엔드포인트별 요청 비율 기본값
+DEFAULT_MIX = {'recommendations': 0.6, 'answer': 0.3, 'save': 0.1}
+
+SAMPLE_MESSAGES = [
+    "최근에 친구와 함께 <웡카> 영화를 봤는데 정말 재미있었어요.",
+    "감동적인 드라마와 로맨스 장르를 좋아합니다.",
+    "미술관에서 본 현대미술 전시가 인상적이었어요.",
+    "뮤지컬과 발레 공연을 자주 보러 갑니다.",
+    "잔잔한 음악이 나오는 힐링 영화를 좋아해요.",
+]
+
+
+def parse_mix(value: str) -> Dict[str, float]:
+    """'recommendations=0.6,answer=0.3,save=0.1' 형식을 비율 dict로 변환"""
+    mix = {}
+    for part in value.split(','):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition('=')
+        if name.strip() not in DEFAULT_MIX:
+            raise ValueError(f"알 수 없는 엔드포인트: {name}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))]
+
+
+class VirtualUsers:
+    """가상 사용자별 챗봇 대화 진행 상태 (question_id, 저장 가능 여부)"""
+
+    def __init__(self, user_ids: List[int], seed: int):
+        self._user_ids = user_ids
+        self._random = random.Random(seed)
+        self._turns = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def pick(self) -> int:
+        with self._lock:
+            return self._random.choice(self._user_ids)
+
+    def next_answer(self, user_id: int) -> Tuple[str, str]:
+        """다음 question_id와 메시지 (5턴마다 대화를 새로 시작)"""
+        with self._lock:
+            turn = self._turns[user_id] % 5 + 1
+            self._turns[user_id] += 1
+            return str(turn), self._random.choice(SAMPLE_MESSAGES)
+
+    def has_dialogue(self, user_id: int) -> bool:
+        with self._lock:
+            return self._turns[user_id] > 0
+
+
+class LoadTester:
+    def __init__(self, base_url: str, mix: Dict[str, float], users: VirtualUsers, timeout: float,
+                 max_in_flight: int, seed: int):
+        self.base_url = base_url.rstrip('/')
+        self.mix = mix
+        self.users = users
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self._random = random.Random(seed)
+
+    def _post(self, path: str, body: Dict[str, Any]) -> int:
+        request = urllib.request.Request(
+            self.base_url + path, data=json.dumps(body).encode('utf-8'),
+            headers={'Content-Type': 'application/json'}, method='POST')
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    def _call(self, endpoint: str) -> Tuple[str, int]:
+        """엔드포인트 한 번 호출. 실제 호출한 엔드포인트와 상태 코드 반환 (연결 실패는 0)"""
+        user_id = self.users.pick()
+        if endpoint == 'save' and not self.users.has_dialogue(user_id):
+            # 대화 기록이 없으면 404가 나므로 답변을 먼저 보냄
+            endpoint = 'answer'
+        try:
+            if endpoint == 'recommendations':
+                return endpoint, self._post('/recommendations', {'user_id': user_id})
+            if endpoint == 'answer':
+                question_id, message = self.users.next_answer(user_id)
+                return endpoint, self._post('/chatbot/answer', {
+                    'user_id': user_id, 'question_id': question_id, 'message': message})
+            return endpoint, self._post('/chatbot/save', {'user_id': user_id})
+        except (urllib.error.URLError, OSError):
+            return endpoint, 0
+
+    def run_step(self, rps: float, duration: float) -> Dict[str, Any]:
+        """목표 RPS로 duration초 동안 요청을 보내고 결과를 집계합니다."""
+        endpoints = list(self.mix)
+        weights = [self.mix[name] for name in endpoints]
+        latencies = defaultdict(list)
+        statuses = defaultdict(lambda: defaultdict(int))
+        lock = threading.Lock()
+        in_flight = threading.Semaphore(self.max_in_flight)
+        dropped = 0
+
+        def task(endpoint: str, scheduled: float):
+            try:
+                actual, status = self._call(endpoint)
+                # 예약 시각 기준으로 측정 (서버가 밀리면 대기 시간까지 지연에 포함, coordinated omission 방지)
+                elapsed = time.perf_counter() - scheduled
+                with lock:
+                    latencies[actual].append(elapsed)
+                    statuses[actual][status] += 1
+            finally:
+                in_flight.release()
+
+        n_requests = int(rps * duration)
+        interval = 1.0 / rps
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            for i in range(n_requests):
+                scheduled = start + i * interval
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                if not in_flight.acquire(blocking=False):
+                    # 동시 요청 한도 초과: 클라이언트가 밀린 것이므로 보내지 않고 기록
+                    dropped += 1
+                    continue
+                endpoint = self._random.choices(endpoints, weights)[0]
+                pool.submit(task, endpoint, scheduled)
+        elapsed = time.perf_counter() - start
+
+        per_endpoint = {}
+        for endpoint, values in latencies.items():
+            ms = [v * 1000 for v in values]
+            errors = sum(count for status, count in statuses[endpoint].items() if status == 0 or status >= 500)
+            per_endpoint[endpoint] = {
+                'requests': len(ms),
+                'p50_ms': round(_percentile(ms, 0.50), 2),
+                'p95_ms': round(_percentile(ms, 0.95), 2),
+                'p99_ms': round(_percentile(ms, 0.99), 2),
+                'error_rate': round(errors / len(ms), 4) if ms else 0.0,
+                'statuses': {str(status): count for status, count in sorted(statuses[endpoint].items())},
+            }
+        completed = sum(item['requests'] for item in per_endpoint.values())
+        all_ms = [v * 1000 for values in latencies.values() for v in values]
+        total_errors = sum(item['error_rate'] * item['requests'] for item in per_endpoint.values())
+        return {
+            'target_rps': rps,
+            'achieved_rps': round(completed / elapsed, 2) if elapsed else 0.0,
+            'duration_sec': round(elapsed, 2),
+            'requests': completed,
+            'dropped': dropped,
+            'p50_ms': round(_percentile(all_ms, 0.50), 2),
+            'p95_ms': round(_percentile(all_ms, 0.95), 2),
+            'p99_ms': round(_percentile(all_ms, 0.99), 2),
+            'error_rate': round(total_errors / completed, 4) if completed else 0.0,
+            'endpoints': per_endpoint,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Flask 엔드포인트 부하 테스트')
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='대상 서버 주소')
+    parser.add_argument('--rps', default='10', help='쉼표로 구분한 목표 RPS 단계 (예: 10,20,50,100)')
+    parser.add_argument('--duration', type=float, default=30.0, help='단계별 측정 시간(초)')
+    parser.add_argument('--mix', default=','.join(f"{k}={v}" for k, v in DEFAULT_MIX.items()),
+                        help='엔드포인트별 요청 비율')
+    parser.add_argument('--users', type=int, default=1000, help='가상 사용자 수')
+    parser.add_argument('--user-id-start', type=int, default=1_000_000, help='가상 사용자 ID 시작값 (합성 DB 기준)')
+    parser.add_argument('--max-in-flight', type=int, default=256, help='동시 요청 최대 수')
+    parser.add_argument('--timeout', type=float, default=30.0, help='요청 타임아웃(초)')
+    parser.add_argument('--max-error-rate', type=float, default=0.01, help='이 오류율을 넘으면 이후 단계 중단')
+    parser.add_argument('--label', default='', help='결과에 남길 서버 설정 설명 (예: gunicorn-4w-8t)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='', help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    users = VirtualUsers(list(range(args.user_id_start, args.user_id_start + args.users)), args.seed)
+    tester = LoadTester(args.url, parse_mix(args.mix), users, args.timeout, args.max_in_flight, args.seed)
+
+    report = {
+        'meta': {
+            'url': args.url,
+            'label': args.label,
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'mix': tester.mix,
+            'duration': args.duration,
+        },
+        'steps': [],
+    }
+    for rps in [float(r) for r in args.rps.split(',') if r.strip()]:
+        print(f"[{rps:g} rps] {args.duration:g}초 측정 중...", file=sys.stderr)
+        step = tester.run_step(rps, args.duration)
+        report['steps'].append(step)
+        print(f"[{rps:g} rps] 처리량 {step['achieved_rps']:.1f} req/s | p50 {step['p50_ms']:.1f}ms "
+              f"p95 {step['p95_ms']:.1f}ms p99 {step['p99_ms']:.1f}ms | 오류율 {step['error_rate']:.2%} | "
+              f"미전송 {step['dropped']}")
+        for endpoint, item in step['endpoints'].items():
+            print(f"    {endpoint:16s} {item['requests']:6d}건 p50 {item['p50_ms']:8.1f}ms "
+                  f"p95 {item['p95_ms']:8.1f}ms p99 {item['p99_ms']:8.1f}ms 오류율 {item['error_rate']:.2%}")
+        if step['error_rate'] > args.max_error_rate or step['dropped']:
+            print(f"[{rps:g} rps] 한계 도달 (오류율/미전송 초과), 이후 단계 생략", file=sys.stderr)
+            break
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,337 @@
+## 벤치마크/평가용 로컬 DB 생성
+## sample_data.sql을 SQLite로 불러오고, 규모별(1k/10k/100k/1M) 합성 카탈로그와 사용자/리뷰 데이터를 생성합니다.
+import json
+import os
+import random
+import re
+import sqlite3
+from typing import Dict, List, Tuple
+from chatbot.keyword_examples import PREFERENCE_KEYWORD_EXAMPLES
+
+SAMPLE_SQL_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'sample_data.sql')
+
+# 애플리케이션 쿼리가 사용하는 컬럼 기준의 스키마
+# (sample_data.sql의 CREATE TABLE 문은 실제 쿼리와 컬럼이 일부 다르므로 사용하지 않음)
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS PREFERENCE (
+        preference_id INTEGER PRIMARY KEY,
+        user_id INTEGER NOT NULL,
+        movie_preference INTEGER,
+        performance_preference TEXT,
+        exhibition_preference INTEGER,
+        movie_genre_preference TEXT,
+        performance_genre_preference TEXT,
+        exhibition_genre_preference TEXT,
+        like_words TEXT,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS MOVIE (
+        activity_id INTEGER PRIMARY KEY,
+        title TEXT, genre_nm TEXT, director TEXT, actors TEXT, keywords TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS PERFORMANCE (
+        activity_id INTEGER PRIMARY KEY,
+        title TEXT, "cast" TEXT, genre TEXT, keywords TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS EXHIBITION (
+        activity_id INTEGER PRIMARY KEY,
+        title TEXT, keywords TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS REVIEW (
+        review_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        activity_id INTEGER NOT NULL,
+        rate REAL,
+        created_at TEXT DEFAULT CURRENT_TIMESTAMP
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_preference_user ON PREFERENCE (user_id)",
+    "CREATE INDEX IF NOT EXISTS idx_review_user ON REVIEW (user_id)",
+]
+
+SCALES = {'1k': 1_000, '10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+
+def parse_scale(value: str) -> int:
+    """'10k', '1m', '2500' 형태의 규모 문자열을 정수로 변환"""
+    value = value.strip().lower()
+    if value in SCALES:
+        return SCALES[value]
+    return int(value)
+
+
+def _parse_sql_values(text: str, pos: int) -> Tuple[List[tuple], int]:
+    """VALUES 뒤의 (..), (..) 튜플 목록을 파싱합니다. (중간에 잘못 들어간 ';' 뒤의 튜플도 이어서 읽음)"""
+    rows = []
+    length = len(text)
+    while pos < length:
+        while pos < length and text[pos] in ' \t\r\n,;':
+            pos += 1
+        if pos >= length or text[pos] != '(':
+            break
+        pos += 1
+        row, token = [], ''
+        while pos < length:
+            ch = text[pos]
+            if ch == "'":
+                pos += 1
+                value = []
+                while pos < length:
+                    if text[pos] == "'" and pos + 1 < length and text[pos + 1] == "'":
+                        value.append("'")
+                        pos += 2
+                    elif text[pos] == "'":
+                        pos += 1
+                        break
+                    else:
+                        value.append(text[pos])
+                        pos += 1
+                row.append(''.join(value))
+                token = None
+            elif ch in ',)':
+                if token is not None:
+                    token = token.strip()
+                    if token.upper() == 'NULL':
+                        row.append(None)
+                    elif token:
+                        row.append(float(token) if '.' in token else int(token))
+                token = ''
+                pos += 1
+                if ch == ')':
+                    break
+            else:
+                if token is not None:
+                    token += ch
+                pos += 1
+        rows.append(tuple(row))
+    return rows, pos
+
+
+def parse_sample_sql(path: str = SAMPLE_SQL_PATH) -> Dict[str, Tuple[List[str], List[tuple]]]:
+    """sample_data.sql의 INSERT 문을 {테이블: (컬럼 목록, 행 목록)} 형태로 읽어옵니다."""
+    with open(path, encoding='utf-8') as f:
+        text = f.read()
+    # 주석 제거
+    text = re.sub(r'--[^\n]*', '', text)
+
+    tables = {}
+    pattern = re.compile(r'INSERT INTO\s+(?:\w+\.)?(\w+)\s*\(([^)]*)\)\s*VALUES', re.IGNORECASE)
+    for match in pattern.finditer(text):
+        table = match.group(1).upper()
+        columns = [column.strip() for column in match.group(2).split(',')]
+        rows, _ = _parse_sql_values(text, match.end())
+        existing = tables.setdefault(table, (columns, []))
+        existing[1].extend(rows)
+    return tables
+
+
+def create_database(path: str) -> sqlite3.Connection:
+    """빈 로컬 DB 파일을 새로 만듭니다. (기존 파일은 덮어씀)"""
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    for statement in SCHEMA:
+        conn.execute(statement)
+    conn.commit()
+    return conn
+
+
+def load_sample_data(conn: sqlite3.Connection, path: str = SAMPLE_SQL_PATH) -> Dict[str, int]:
+    """sample_data.sql의 데이터를 로컬 DB에 넣고 테이블별 행 수를 반환합니다."""
+    counts = {}
+    for table, (columns, rows) in parse_sample_sql(path).items():
+        quoted = ', '.join(f'"{column}"' for column in columns)
+        placeholders = ', '.join('?' for _ in columns)
+        conn.executemany(f"INSERT OR REPLACE INTO {table} ({quoted}) VALUES ({placeholders})", rows)
+        counts[table] = len(rows)
+    conn.commit()
+    return counts
+
+
+class SyntheticCatalog:
+    """
+    샘플 데이터의 장르/키워드 분포를 바탕으로 합성 데이터를 생성합니다.
+    키워드는 샘플에서 자주 나온 순서대로 Zipf 분포 가중치를 주어, '드라마', '감동' 같은 흔한 키워드가
+    실제 데이터처럼 많이 등장하도록 합니다.
+    """
+
+    def __init__(self, sample_tables: Dict[str, Tuple[List[str], List[tuple]]], seed: int = 42):
+        self._random = random.Random(seed)
+        keyword_counts = {}
+        self.genres = {'MOVIE': set(), 'PERFORMANCE': set()}
+        self.people = set()
+        self.title_words = set()
+
+        for table, (columns, rows) in sample_tables.items():
+            for row in rows:
+                record = dict(zip(columns, row))
+                for keyword in self._json_list(record.get('keywords')):
+                    keyword_counts[keyword] = keyword_counts.get(keyword, 0) + 1
+                if table == 'MOVIE' and record.get('genre_nm'):
+                    self.genres['MOVIE'].update(g.strip() for g in record['genre_nm'].split(',') if g.strip())
+                if table == 'PERFORMANCE' and record.get('genre'):
+                    self.genres['PERFORMANCE'].add(record['genre'])
+                for column in ('actors', 'cast', 'director'):
+                    if record.get(column):
+                        self.people.update(p.strip() for p in record[column].split(',') if p.strip())
+                if record.get('title'):
+                    self.title_words.update(re.findall(r'[가-힣A-Za-z]{2,}', record['title']))
+
+        for keyword in PREFERENCE_KEYWORD_EXAMPLES:
+            keyword_counts[keyword] = keyword_counts.get(keyword, 0) + 1
+
+        ranked = sorted(keyword_counts, key=lambda k: (-keyword_counts[k], k))
+        self.keywords = ranked
+        self.keyword_weights = [1.0 / (rank + 1) ** 1.1 for rank in range(len(ranked))]
+        self.genres = {key: sorted(value) for key, value in self.genres.items()}
+        self.people = sorted(self.people)
+        self.title_words = sorted(self.title_words)
+
+    @staticmethod
+    def _json_list(value) -> List[str]:
+        if not value:
+            return []
+        try:
+            parsed = json.loads(value)
+            return [str(v) for v in parsed] if isinstance(parsed, list) else []
+        except (TypeError, ValueError):
+            return []
+
+    def sample_keywords(self, low: int = 4, high: int = 12) -> List[str]:
+        count = self._random.randint(low, high)
+        return list(dict.fromkeys(self._random.choices(self.keywords, weights=self.keyword_weights, k=count)))
+
+    def _title(self, activity_id: int) -> str:
+        words = self._random.sample(self.title_words, k=min(len(self.title_words), self._random.randint(1, 3)))
+        return f"{' '.join(words)} {activity_id}"
+
+    def _people(self) -> str:
+        return ', '.join(self._random.sample(self.people, k=min(len(self.people), self._random.randint(1, 5))))
+
+    def movie(self, activity_id: int) -> tuple:
+        genres = self._random.sample(self.genres['MOVIE'], k=self._random.randint(1, 2))
+        return (activity_id, self._title(activity_id), ', '.join(genres), self._people(), self._people(),
+                json.dumps(self.sample_keywords() + genres, ensure_ascii=False))
+
+    def performance(self, activity_id: int) -> tuple:
+        genre = self._random.choice(self.genres['PERFORMANCE'])
+        return (activity_id, self._title(activity_id), self._people(), genre,
+                json.dumps(self.sample_keywords() + [genre], ensure_ascii=False))
+
+    def exhibition(self, activity_id: int) -> tuple:
+        return (activity_id, self._title(activity_id),
+                json.dumps(self.sample_keywords(6, 14), ensure_ascii=False))
+
+    def preference(self, preference_id: int, user_id: int) -> tuple:
+        return (
+            preference_id, user_id,
+            self._random.randint(0, 10), str(self._random.randint(0, 10)), self._random.randint(0, 10),
+            json.dumps(self._random.sample(self.genres['MOVIE'], k=self._random.randint(0, 3)), ensure_ascii=False),
+            json.dumps(self._random.sample(self.genres['PERFORMANCE'], k=self._random.randint(0, 2)), ensure_ascii=False),
+            json.dumps(self.sample_keywords(0, 3), ensure_ascii=False),
+            json.dumps(self.sample_keywords(3, 15), ensure_ascii=False),
+        )
+
+
+def generate_synthetic(conn: sqlite3.Connection, n_items: int, n_users: int,
+                       reviews_per_user: int = 5, seed: int = 42, batch_size: int = 10_000) -> Dict[str, int]:
+    """
+    합성 MOVIE/PERFORMANCE/EXHIBITION/PREFERENCE/REVIEW 데이터를 생성합니다.
+    아이템은 영화:공연:전시 = 5:3:2 비율이며, 리뷰는 사용자의 선호 키워드와 겹치는 아이템에 더 높은 확률/평점을 줍니다.
+    """
+    generator = SyntheticCatalog(parse_sample_sql(), seed=seed)
+    rnd = random.Random(seed + 1)
+
+    # 샘플 데이터와 겹치지 않도록 큰 ID부터 사용
+    next_id = 1_000_000
+    counts = {'MOVIE': int(n_items * 0.5), 'PERFORMANCE': int(n_items * 0.3)}
+    counts['EXHIBITION'] = n_items - counts['MOVIE'] - counts['PERFORMANCE']
+    inserts = {
+        'MOVIE': ("INSERT INTO MOVIE (activity_id, title, genre_nm, director, actors, keywords) VALUES (?, ?, ?, ?, ?, ?)",
+                  generator.movie),
+        'PERFORMANCE': ('INSERT INTO PERFORMANCE (activity_id, title, "cast", genre, keywords) VALUES (?, ?, ?, ?, ?)',
+                        generator.performance),
+        'EXHIBITION': ("INSERT INTO EXHIBITION (activity_id, title, keywords) VALUES (?, ?, ?)",
+                       generator.exhibition),
+    }
+
+    # 리뷰 생성을 위해 키워드 -> 아이템 역색인(샘플링용)
+    keyword_items = {}
+    all_ids = []
+    for table, count in counts.items():
+        query, factory = inserts[table]
+        batch = []
+        for _ in range(count):
+            row = factory(next_id)
+            batch.append(row)
+            all_ids.append(next_id)
+            for keyword in json.loads(row[-1])[:3]:
+                keyword_items.setdefault(keyword, []).append(next_id)
+            next_id += 1
+            if len(batch) >= batch_size:
+                conn.executemany(query, batch)
+                batch = []
+        if batch:
+            conn.executemany(query, batch)
+    conn.commit()
+
+    preference_rows, review_rows = [], []
+    for offset in range(n_users):
+        user_id = 1_000_000 + offset
+        row = generator.preference(user_id, user_id)
+        preference_rows.append(row)
+
+        liked = json.loads(row[-1]) + json.loads(row[-2])
+        for _ in range(reviews_per_user):
+            candidates = keyword_items.get(rnd.choice(liked)) if liked and rnd.random() < 0.8 else None
+            if candidates:
+                review_rows.append((user_id, rnd.choice(candidates), float(rnd.choice([4, 4.5, 5]))))
+            elif all_ids:
+                review_rows.append((user_id, rnd.choice(all_ids), float(rnd.choice([1, 2, 3, 3.5]))))
+
+        if len(preference_rows) >= batch_size:
+            _insert_users(conn, preference_rows, review_rows)
+            preference_rows, review_rows = [], []
+    _insert_users(conn, preference_rows, review_rows)
+    conn.commit()
+
+    return {**counts, 'PREFERENCE': n_users, 'REVIEW': n_users * reviews_per_user}
+
+
+def _insert_users(conn: sqlite3.Connection, preference_rows: List[tuple], review_rows: List[tuple]) -> None:
+    conn.executemany(
+        "INSERT INTO PREFERENCE (preference_id, user_id, movie_preference, performance_preference, exhibition_preference, "
+        "movie_genre_preference, performance_genre_preference, exhibition_genre_preference, like_words) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        preference_rows
+    )
+    conn.executemany("INSERT INTO REVIEW (user_id, activity_id, rate) VALUES (?, ?, ?)", review_rows)
+
+
+def build_local_db(path: str, n_items: int = 0, n_users: int = 0, reviews_per_user: int = 5,
+                   seed: int = 42) -> Dict[str, int]:
+    """
+    샘플 데이터 + 합성 데이터로 로컬 DB를 만듭니다.
+    DB_BACKEND=sqlite, SQLITE_PATH=<path> 로 애플리케이션을 실행하면 이 DB를 사용합니다.
+    """
+    conn = create_database(path)
+    try:
+        counts = load_sample_data(conn)
+        if n_items or n_users:
+            synthetic = generate_synthetic(conn, n_items, n_users, reviews_per_user=reviews_per_user, seed=seed)
+            for table, count in synthetic.items():
+                counts[table] = counts.get(table, 0) + count
+        return counts
+    finally:
+        conn.close()
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description='로컬 SQLite DB 생성 (sample_data.sql + 합성 데이터)')
+    parser.add_argument('--path', default='forest_local.db')
+    parser.add_argument('--items', default='0', help='합성 아이템 수 (예: 1k, 10k, 100k, 1m)')
+    parser.add_argument('--users', type=int, default=0, help='합성 사용자 수')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+    print(build_local_db(args.path, parse_scale(args.items), args.users, seed=args.seed))
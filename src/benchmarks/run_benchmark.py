@@ -0,0 +1,278 @@
+## 추천 파이프라인 벤치마크
+## 규모별 로컬 DB(sample_data.sql + 합성 데이터)를 만들고 단계별 지연 시간, 최대 RSS, 초당 요청 수를 측정합니다.
+##
+## 실행 (src 디렉토리에서):
+##   python -m benchmarks.run_benchmark --scales 1k,10k --requests 200 --output bench_results.json
+##   python -m benchmarks.run_benchmark --scales 1k,10k --compare bench_results.json
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# 리포트에 묶어서 보여줄 단계 (monitoring 단계 이름 기준)
+REFRESH_STAGE_GROUPS = {
+    'catalog_load': ['db.movies', 'db.performances', 'db.exhibitions'],
+    'text': ['preprocess.text'],
+    'fit': ['preprocess.fit'],
+    'transform': ['preprocess.transform'],
+    'neighbors': ['catalog.neighbors'],
+    'popularity': ['db.popularity'],
+}
+REQUEST_STAGE_GROUPS = {
+    'user_fetch': ['db.user_preferences'],
+    'user_vector': ['preprocess.user'],
+    'scoring': ['recommend.scoring'],
+    'top_k': ['recommend.sorting', 'recommend.rerank'],
+}
+
+# 값이 클수록 좋은 지표 (그 외는 작을수록 좋음)
+HIGHER_IS_BETTER = ('requests_per_sec',)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, int(round(q * (len(ordered) - 1)))))
+    return ordered[idx]
+
+
+def _summarize_ms(values: List[float]) -> Dict[str, float]:
+    """초 단위 값 목록을 ms 단위 통계로 변환"""
+    ms = [v * 1000 for v in values]
+    return {
+        'mean_ms': round(sum(ms) / len(ms), 3) if ms else 0.0,
+        'p50_ms': round(_percentile(ms, 0.50), 3),
+        'p95_ms': round(_percentile(ms, 0.95), 3),
+        'p99_ms': round(_percentile(ms, 0.99), 3),
+    }
+
+
+def _group_stages(stages: Dict[str, float], groups: Dict[str, List[str]]) -> Dict[str, float]:
+    return {group: sum(stages.get(name, 0.0) for name in names) for group, names in groups.items()}
+
+
+def _peak_rss_mb() -> float:
+    # 리눅스는 KB, macOS는 byte 단위
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def run_single_scale(n_items: int, n_users: int, n_requests: int, concurrency: int, seed: int,
+                     settings: Dict[str, Any] = None) -> Dict[str, Any]:
+    """
+    현재 프로세스에서 한 규모를 측정합니다.
+    DB_BACKEND=sqlite, SQLITE_PATH 환경 변수가 설정된 상태에서 호출해야 합니다.
+    """
+    from benchmarks.local_db import build_local_db
+    from config.settings import SQLITE_PATH
+
+    build_start = time.perf_counter()
+    counts = build_local_db(SQLITE_PATH, n_items, n_users, seed=seed)
+    db_build_seconds = time.perf_counter() - build_start
+
+    # 프로젝트 모듈은 DB 생성 후 import (import 시간도 별도로 기록)
+    import_start = time.perf_counter()
+    from recommendation.recommendation import RecommendationAlgorithm
+    from monitoring import request_scope
+    import_seconds = time.perf_counter() - import_start
+
+    recommender = RecommendationAlgorithm(settings)
+
+    # 1. 카탈로그 갱신 (DB 조회 + 전처리 + 학습 + 변환 + 이웃 테이블)
+    with request_scope('benchmark.refresh') as refresh_log:
+        recommender.refresh_catalog()
+    refresh_total = sum(refresh_log.stages.get(name, 0.0) for name in ['catalog.refresh'])
+    refresh = {
+        'total_ms': round(refresh_total * 1000, 3),
+        **{f"{group}_ms": round(seconds * 1000, 3)
+           for group, seconds in _group_stages(refresh_log.stages, REFRESH_STAGE_GROUPS).items()},
+    }
+
+    # 2. 순차 요청
+    rnd = random.Random(seed)
+    user_ids = [1] + [1_000_000 + i for i in range(n_users)]
+    request_user_ids = [rnd.choice(user_ids) for _ in range(n_requests)]
+
+    totals, group_values = [], {group: [] for group in REQUEST_STAGE_GROUPS}
+    sequential_start = time.perf_counter()
+    for user_id in request_user_ids:
+        start = time.perf_counter()
+        with request_scope('benchmark.recommendations') as req_log:
+            recommender.get_recommendations(user_id)
+        totals.append(time.perf_counter() - start)
+        for group, seconds in _group_stages(req_log.stages, REQUEST_STAGE_GROUPS).items():
+            group_values[group].append(seconds)
+    sequential_seconds = time.perf_counter() - sequential_start
+
+    result = {
+        'items': counts.get('MOVIE', 0) + counts.get('PERFORMANCE', 0) + counts.get('EXHIBITION', 0),
+        'users': counts.get('PREFERENCE', 0),
+        'db_build_seconds': round(db_build_seconds, 3),
+        'import_seconds': round(import_seconds, 3),
+        'refresh': refresh,
+        'request': {
+            'total': _summarize_ms(totals),
+            **{group: _summarize_ms(values) for group, values in group_values.items()},
+        },
+        'requests_per_sec': round(n_requests / sequential_seconds, 2) if sequential_seconds else 0.0,
+    }
+
+    # 3. 동시 요청 처리량 (스레드)
+    if concurrency > 1:
+        queue = list(request_user_ids)
+        lock = threading.Lock()
+
+        def worker():
+            while True:
+                with lock:
+                    if not queue:
+                        return
+                    user_id = queue.pop()
+                recommender.get_recommendations(user_id)
+
+        threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+        concurrent_start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        concurrent_seconds = time.perf_counter() - concurrent_start
+        result[f'requests_per_sec_c{concurrency}'] = round(n_requests / concurrent_seconds, 2)
+
+    result['peak_rss_mb'] = _peak_rss_mb()
+    return result
+
+
+def _run_scale_subprocess(scale: str, args, workdir: str) -> Dict[str, Any]:
+    """규모마다 별도 프로세스에서 측정 (최대 RSS와 import 상태가 섞이지 않도록)"""
+    env = dict(os.environ, DB_BACKEND='sqlite', SQLITE_PATH=os.path.join(workdir, f'bench_{scale}.db'),
+               METRICS_ENABLED='true')
+    cmd = [sys.executable, '-m', 'benchmarks.run_benchmark', '--worker',
+           '--scales', scale, '--requests', str(args.requests), '--concurrency', str(args.concurrency),
+           '--users', str(args.users), '--seed', str(args.seed)]
+    if args.settings:
+        cmd += ['--settings', args.settings]
+    completed = subprocess.run(cmd, cwd=SRC_DIR, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{scale} 벤치마크 실패:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=SRC_DIR,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ''
+
+
+def _flatten(data: Dict[str, Any], prefix: str = '') -> Dict[str, float]:
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)):
+            flat[name] = float(value)
+    return flat
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """기준 결과 대비 변화를 출력하고, threshold 이상 나빠진 지표 목록을 반환합니다."""
+    regressions = []
+    for scale, result in current['results'].items():
+        if scale not in baseline.get('results', {}):
+            continue
+        print(f"\n[{scale}] 기준({baseline.get('meta', {}).get('revision', '?')}) 대비")
+        old_flat = _flatten(baseline['results'][scale])
+        for name, new_value in _flatten(result).items():
+            old_value = old_flat.get(name)
+            if not old_value or name in ('items', 'users'):
+                continue
+            change = (new_value - old_value) / old_value
+            worse = -change if name.startswith(HIGHER_IS_BETTER) else change
+            flag = '  <-- 성능 저하' if worse > threshold else ''
+            print(f"  {name:45s} {old_value:12.3f} -> {new_value:12.3f} ({change:+.1%}){flag}")
+            if flag:
+                regressions.append(f"{scale}:{name}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='추천 파이프라인 벤치마크')
+    parser.add_argument('--scales', default='1k,10k', help='쉼표로 구분한 아이템 규모 (1k, 10k, 100k, 1m 또는 숫자)')
+    parser.add_argument('--users', type=int, default=0, help='합성 사용자 수 (0이면 아이템 수의 1/10, 최대 10,000)')
+    parser.add_argument('--requests', type=int, default=200, help='규모별 get_recommendations 호출 수')
+    parser.add_argument('--concurrency', type=int, default=1, help='동시 요청 스레드 수 (1이면 순차만 측정)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--settings', default='', help='RECOMMENDATION_SETTINGS 덮어쓰기 (JSON 문자열)')
+    parser.add_argument('--output', default='', help='결과 JSON 저장 경로')
+    parser.add_argument('--compare', default='', help='비교할 기준 결과 JSON 경로')
+    parser.add_argument('--threshold', type=float, default=0.10, help='성능 저하로 판단할 변화율')
+    parser.add_argument('--fail-on-regression', action='store_true', help='성능 저하가 있으면 종료 코드 1')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    from benchmarks.local_db import parse_scale
+
+    if args.worker:
+        logging.disable(logging.INFO)
+        n_items = parse_scale(args.scales)
+        n_users = args.users or max(100, min(10_000, n_items // 10))
+        settings = json.loads(args.settings) if args.settings else None
+        result = run_single_scale(n_items, n_users, args.requests, args.concurrency, args.seed, settings)
+        print(json.dumps(result, ensure_ascii=False))
+        return
+
+    report = {
+        'meta': {
+            'revision': _git_revision(),
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'settings': json.loads(args.settings) if args.settings else {},
+        },
+        'results': {},
+    }
+    with tempfile.TemporaryDirectory(prefix='forest_bench_') as workdir:
+        for scale in [s.strip() for s in args.scales.split(',') if s.strip()]:
+            print(f"[{scale}] 측정 중...", file=sys.stderr)
+            result = _run_scale_subprocess(scale, args, workdir)
+            report['results'][scale] = result
+            request = result['request']
+            print(f"[{scale}] 아이템 {result['items']}개 | 갱신 {result['refresh']['total_ms']:.1f}ms | "
+                  f"요청 p50 {request['total']['p50_ms']:.2f}ms p95 {request['total']['p95_ms']:.2f}ms | "
+                  f"{result['requests_per_sec']:.1f} req/s | 최대 RSS {result['peak_rss_mb']}MB")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_results(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n성능 저하 {len(regressions)}건: {', '.join(regressions)}")
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
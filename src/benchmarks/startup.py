@@ -0,0 +1,150 @@
+## 서버 기동 시간 측정
+## 역할(SERVICE_ROLE)별로 `python -X importtime -c "import app"`의 import 시간과 무거운 모듈 로딩 여부,
+## 카탈로그 미리 불러오기/워커 초기화까지 걸린 시간(ready)을 측정하고 예산 초과 여부를 확인합니다.
+##
+## 실행 (src 디렉토리에서):
+##   python -m benchmarks.startup --roles recommendations,all --items 10k
+##   python -m benchmarks.startup --roles recommendations --import-budget-ms 800 --ready-budget-ms 5000 --fail-over-budget
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# import 시점에 불러오면 안 되는 무거운 패키지 (처음 사용할 때 불러와야 함)
+HEAVY_PACKAGES = ('sklearn', 'scipy', 'konlpy', 'jpype', 'openai', 'numpy', 'mysql')
+
+# 하위 프로세스에서 실행: import -> preload -> warm_up 단계별 시간과 로딩된 무거운 모듈
+_READY_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+heavy_after_import = sorted({name.split('.')[0] for name in sys.modules} & set(%(heavy)r))
+app.preload_models()
+preloaded = time.perf_counter()
+app.warm_up_worker()
+ready = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - start) * 1000,
+    'preload_ms': (preloaded - imported) * 1000,
+    'warm_up_ms': (ready - preloaded) * 1000,
+    'ready_ms': (ready - start) * 1000,
+    'heavy_after_import': heavy_after_import,
+    'heavy_after_ready': sorted({name.split('.')[0] for name in sys.modules} & set(%(heavy)r)),
+}))
+"""
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """-X importtime 출력에서 (모듈, self_us, cumulative_us, 깊이) 목록 추출"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_part, cumulative_us, name = line.split('|', 2)
+        rows.append({
+            'module': name.strip(),
+            'depth': (len(name) - len(name.lstrip()) - 1) // 2,
+            'self_us': int(self_part.split(':', 1)[1]),
+            'cumulative_us': int(cumulative_us),
+        })
+    return rows
+
+
+def measure_importtime(role: str, env: Dict[str, str], top: int) -> Dict[str, Any]:
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=SRC_DIR,
+                               env=dict(env, SERVICE_ROLE=role), capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"[{role}] import 실패:\n{completed.stderr[-2000:]}")
+    rows = parse_importtime(completed.stderr)
+    app_row = next((row for row in rows if row['module'] == 'app'), None)
+    # 최상위 패키지별 self 시간 합계
+    packages = {}
+    for row in rows:
+        package = row['module'].split('.')[0]
+        packages[package] = packages.get(package, 0) + row['self_us']
+    return {
+        'import_ms': round(app_row['cumulative_us'] / 1000, 1) if app_row else 0.0,
+        'modules': len(rows),
+        'top_packages': [
+            {'package': name, 'ms': round(us / 1000, 1)}
+            for name, us in sorted(packages.items(), key=lambda item: -item[1])[:top]
+        ],
+    }
+
+
+def measure_ready(role: str, env: Dict[str, str]) -> Dict[str, Any]:
+    completed = subprocess.run([sys.executable, '-c', _READY_SCRIPT % {'heavy': HEAVY_PACKAGES}], cwd=SRC_DIR,
+                               env=dict(env, SERVICE_ROLE=role), capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"[{role}] 초기화 실패:\n{completed.stderr[-2000:]}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    return {key: round(value, 1) if isinstance(value, float) else value for key, value in result.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='서버 기동 시간 측정')
+    parser.add_argument('--roles', default='recommendations,all', help='쉼표로 구분한 SERVICE_ROLE 목록')
+    parser.add_argument('--items', default='10k', help='로컬 DB 아이템 규모 (preload 측정용)')
+    parser.add_argument('--db', default='', help='기존 로컬 SQLite DB 경로 (없으면 새로 생성)')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 측정 횟수 (최솟값 사용)')
+    parser.add_argument('--top', type=int, default=8, help='import 시간이 긴 패키지 표시 개수')
+    parser.add_argument('--import-budget-ms', type=float, default=0.0, help='import 시간 예산 (0이면 확인 안 함)')
+    parser.add_argument('--ready-budget-ms', type=float, default=0.0,
+                        help='recommendations 역할의 ready 시간 예산 (0이면 확인 안 함)')
+    parser.add_argument('--fail-over-budget', action='store_true', help='예산 초과 시 종료 코드 1')
+    parser.add_argument('--output', default='', help='결과 JSON 저장 경로')
+    args = parser.parse_args()
+
+    from benchmarks.local_db import build_local_db, parse_scale
+
+    report = {'results': {}}
+    over_budget = []
+    with tempfile.TemporaryDirectory(prefix='forest_startup_') as workdir:
+        db_path = args.db or os.path.join(workdir, 'startup.db')
+        if not args.db:
+            n_items = parse_scale(args.items)
+            build_local_db(db_path, n_items, max(100, min(10_000, n_items // 10)))
+        env = dict(os.environ, DB_BACKEND='sqlite', SQLITE_PATH=db_path, LOG_LEVEL='WARNING',
+                   OPENAI_API_KEY=os.getenv('OPENAI_API_KEY') or 'sk-startup-benchmark')
+
+        for role in [r.strip() for r in args.roles.split(',') if r.strip()]:
+            imports = [measure_importtime(role, env, args.top) for _ in range(args.repeat)]
+            readies = [measure_ready(role, env) for _ in range(args.repeat)]
+            result = {
+                'importtime': min(imports, key=lambda item: item['import_ms']),
+                'ready': min(readies, key=lambda item: item['ready_ms']),
+            }
+            report['results'][role] = result
+
+            importtime, ready = result['importtime'], result['ready']
+            print(f"[{role}] import {importtime['import_ms']:.0f}ms (모듈 {importtime['modules']}개) | "
+                  f"preload {ready['preload_ms']:.0f}ms | warm_up {ready['warm_up_ms']:.0f}ms | "
+                  f"ready {ready['ready_ms']:.0f}ms")
+            print(f"    import 직후 로딩된 무거운 패키지: {', '.join(ready['heavy_after_import']) or '없음'}")
+            print("    import 시간 상위: " + ', '.join(f"{item['package']} {item['ms']:.0f}ms"
+                                              for item in importtime['top_packages']))
+
+            if args.import_budget_ms and importtime['import_ms'] > args.import_budget_ms:
+                over_budget.append(f"{role}:import {importtime['import_ms']:.0f}ms > {args.import_budget_ms:.0f}ms")
+            if args.ready_budget_ms and role == 'recommendations' and ready['ready_ms'] > args.ready_budget_ms:
+                over_budget.append(f"{role}:ready {ready['ready_ms']:.0f}ms > {args.ready_budget_ms:.0f}ms")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+    if over_budget:
+        print(f"\n예산 초과 {len(over_budget)}건: {'; '.join(over_budget)}")
+        if args.fail_over_budget:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,21 @@
-import openai
 from config.settings import OPENAI_API_KEY, OPENAI_MODEL
+import logging
 import random
+from monitoring import timed
+from .llm_client import LLMClient, shared_llm_client
+
+FALLBACK_QUESTION = "최근 본 문화 예술 작품 중 기억에 남는 게 있으신가요?"
 
 class Chatbot:
-    def __init__(self, openai_api_key=OPENAI_API_KEY, model=OPENAI_MODEL):
+    def __init__(self, openai_api_key=OPENAI_API_KEY, model=OPENAI_MODEL, llm_client=None):
         self.model = model
-        # 최신 버전에서 클라이언트 인스턴스를 활용합니다.
-        self.client = openai.OpenAI(api_key=openai_api_key)
+        # 데드라인/헤징/서킷 브레이커가 적용된 공용 클라이언트 (키를 따로 지정하면 전용 클라이언트)
+        if llm_client is None:
+            llm_client = shared_llm_client() if openai_api_key == OPENAI_API_KEY else LLMClient(api_key=openai_api_key)
+        self.llm = llm_client
+        self._logger = logging.getLogger(__name__)
 
+    @timed('llm.next_question')
     def generate_next_question(self, dialogue_history):
         # 대화내역을 질문-답변 쌍 형태로 구성
         messages=[]
@@ -74,13 +82,14 @@ class Chatbot:
         ]
 
         try:
-            response = self.client.chat.completions.create(
+            # 서킷 브레이커가 열려 있으면 호출 없이 바로 대체 질문 반환
+            question = self.llm.complete(
+                'next_question',
+                messages,
                 model=self.model,
-                messages=messages,
                 max_tokens=128,
                 temperature=0.8
-            )
-            question = response.choices[0].message.content.strip()
+            ).strip()
             # '챗봇:'으로 시작하면 제거
             if question.startswith("챗봇:"):
                 question = question[len("챗봇:"):].strip()
@@ -88,5 +97,5 @@ class Chatbot:
                 question += "?"
             return question
         except Exception as e:
-            print("[GPT ERROR]", e)
-            return "최근 본 문화 예술 작품 중 기억에 남는 게 있으신가요?"
\ No newline at end of file
+            self._logger.error("후속 질문 생성 실패 - 기본 질문 사용: %s", e)
+            return FALLBACK_QUESTION
\ No newline at end of file
@@ -1,56 +1,163 @@
+import os
 import re
-from konlpy.tag import Okt
-import openai
-from config.settings import OPENAI_API_KEY, OPENAI_MODEL
+from config.settings import OPENAI_API_KEY, OPENAI_MODEL, KEYWORD_SETTINGS
 from .stopwords import STOPWORDS
 from .keyword_examples import PREFERENCE_KEYWORD_EXAMPLES
 import datetime
+import logging
+import threading
+from monitoring import REGISTRY, current_request, timed
+from .llm_client import LLMClient, shared_llm_client
+from .local_keywords import LocalKeywordExtractor
+
+KEYWORD_EXTRACTIONS = REGISTRY.counter(
+    'forest_keyword_extractions_total',
+    '키워드 추출 경로 (tier: local/llm, reason: confident/no_match/uncertain_polarity/low_coverage/disabled)',
+    ['tier', 'reason'])
+
+# 추출 결과 기록 파일(KEYWORD_RESULT_LOG)에 여러 턴 추출 스레드가 동시에 쓰지 않도록
+_RESULT_LOG_LOCK = threading.Lock()
 
 class KeywordExtractor:
     def __init__(self, 
                  openai_api_key=OPENAI_API_KEY, 
                  model=OPENAI_MODEL, 
                  stopwords=STOPWORDS, 
-                 preference_examples=PREFERENCE_KEYWORD_EXAMPLES):
-        # 최신 openai 패키지 방식
-        self.client = openai.OpenAI(api_key=openai_api_key)
+                 preference_examples=PREFERENCE_KEYWORD_EXAMPLES,
+                 llm_client=None,
+                 vocabulary_provider=None,
+                 settings=None):
+        # Chatbot과 같은 공용 클라이언트 사용 (서킷 브레이커/지연 통계 공유)
+        if llm_client is None:
+            llm_client = shared_llm_client() if openai_api_key == OPENAI_API_KEY else LLMClient(api_key=openai_api_key)
+        self.llm = llm_client
         self.model = model
-        self.okt = Okt()
+        # Okt는 JVM을 띄우므로 처음 사용할 때 생성 (gunicorn preload 시 master에서 JVM이 뜨지 않도록)
+        self._okt = None
+        self._okt_lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
         self.stopwords = stopwords
         self.preference_examples = preference_examples
+        self._settings = {**KEYWORD_SETTINGS, **(settings or {})}
+        # 로컬 추출: 카탈로그 장르/키워드 어휘 + 예시 키워드 트라이 (어휘는 카탈로그 버전이 바뀔 때 다시 구성)
+        self._local = LocalKeywordExtractor(preference_examples, min_coverage=self._settings['local_min_coverage'])
+        # () -> (버전, 어휘 목록) 또는 None (카탈로그가 없는 chatbot 전용 워커는 예시 키워드만 사용)
+        self._vocabulary_provider = vocabulary_provider
+
+    @property
+    def okt(self):
+        if self._okt is None:
+            with self._okt_lock:
+                if self._okt is None:
+                    # konlpy(JPype) import 자체도 무거우므로 처음 사용할 때 불러옴
+                    from konlpy.tag import Okt
+                    self._okt = Okt()
+        return self._okt
+
+    @property
+    def is_warm(self) -> bool:
+        return self._okt is not None
+
+    def warm_up(self) -> None:
+        """Okt(JVM)를 생성하고 한 번 실행해 첫 요청의 초기화 지연을 없앱니다. (워커 fork 이후 호출)"""
+        start = datetime.datetime.now()
+        self.okt.nouns("영화와 공연 전시를 좋아합니다")
+        self._logger.info("Okt 초기화 완료 (%.1f초)", (datetime.datetime.now() - start).total_seconds())
 
-    def extract(self, text: str):
-        """(a)-(b)-(c)-(d) 통합 프로세스"""
+    @timed('keyword.extract')
+    def extract(self, text: str, strict: bool = False):
+        """
+        (a)-(b)-(c)-(d) 통합 프로세스
+
+        Args:
+            strict: True이면 GPT 호출 실패(시간 초과, 서킷 브레이커 열림 등)를 빈 결과로 넘기지 않고 예외로 전달
+                    (턴별 백그라운드 추출에서 실패한 턴을 /chatbot/save 때 다시 추출하기 위해 사용)
+
+        Raises:
+            Exception: strict일 때 GPT 호출 실패
+        """
         # (a) 명사 추출+불용어 제거
         text_clean = self._clean_text(text)
         base_keywords = [w for w in self.okt.nouns(text_clean) 
                          if w not in self.stopwords and len(w) > 1]
 
+        # 로컬 추출: 명사가 어휘로 충분히 설명되고 긍정/부정이 분명하면 GPT 호출 없이 반환
+        local = None
+        if self._settings['local_enabled']:
+            self._refresh_vocabulary()
+            local = self._local.extract(text, base_keywords)
+            if local.confident:
+                KEYWORD_EXTRACTIONS.inc(tier='local', reason=local.reason)
+                self._record_tier('local', local.reason)
+                result = local.keywords
+                self._append_result(text, result)
+                return result
+        reason = local.reason if local else 'disabled'
+        KEYWORD_EXTRACTIONS.inc(tier='llm', reason=reason)
+        self._record_tier('llm', reason)
+
         # (b) GPT 기반 "의미중심" 키워드 보조 추출
-        gpt_keywords = self._extract_keywords_gpt(text)
+        gpt_keywords = self._extract_keywords_gpt(text, strict)
         
-        # (c) 통합, 중복 제거
-        candidates = list(set(base_keywords + gpt_keywords))
+        # (c) 통합, 중복 제거 (로컬에서 찾은 어휘 포함)
+        local_keywords = local.keywords if local else []
+        candidates = list(set(base_keywords + gpt_keywords + local_keywords))
 
-        # (d) 감성 분석 통한 긍정 키워드만 추림
-        result = [kw for kw in candidates if self._is_positive(kw, text)]
+        # (d) 감성 분석 통한 긍정 키워드만 추림 (로컬 규칙으로 극성이 분명한 어휘는 GPT 판별 생략)
+        known = local.polarity if local else {}
+        result = []
+        for kw in candidates:
+            sign = known.get(kw, 'neutral')
+            if sign == 'neutral':
+                if self._is_positive(kw, text, strict):
+                    result.append(kw)
+            elif sign == 'positive':
+                result.append(kw)
+
+        self._append_result(text, result)
+        return result
 
-        # (e) 파일에 계속해서 저장(append)하는 방식
-        filename = "extract_result_total.txt"
+    def _append_result(self, text, result):
+        # (e) 추출 결과 확인용 파일 기록 (KEYWORD_RESULT_LOG 경로를 지정한 경우에만, 기본은 DEBUG 로그)
+        self._logger.debug("키워드 추출 결과: %s", result)
+        path = self._settings['result_log_path']
+        if not path:
+            return
+        entry = (
+            "입력 텍스트:\n" + text + "\n\n"
+            "추출 결과 키워드:\n" + ", ".join(result) + "\n" +
+            "=" * 30 + "\n"
+        )
+        try:
+            with _RESULT_LOG_LOCK, open(os.path.expanduser(path), 'a', encoding='utf-8') as f:
+                f.write(entry)
+        except OSError as e:
+            self._logger.warning("키워드 추출 결과 기록 실패 (%s): %s", path, e)
 
-        with open(filename, 'a', encoding='utf-8') as f:  # 'a' 모드는 append(추가) 모드입니다.
-            f.write("입력 텍스트:\n")
-            f.write(text + "\n\n")
-            f.write("추출 결과 키워드:\n")
-            f.write(", ".join(result) + "\n")
-            f.write("="*30 + "\n")  # 구분선 추가(원하시는 경우)
+    def _record_tier(self, tier, reason):
+        req_log = current_request()
+        if req_log is not None:
+            req_log.set(keyword_tier=tier, keyword_reason=reason)
 
-        return result
+    def _refresh_vocabulary(self):
+        """카탈로그 버전이 바뀌었으면 로컬 추출 트라이를 다시 만듭니다."""
+        if self._vocabulary_provider is None:
+            return
+        try:
+            vocabulary = self._vocabulary_provider()
+            if vocabulary is None or vocabulary[0] == self._local.vocabulary_version:
+                return
+            version, terms = vocabulary
+            self._local.set_vocabulary(terms, version)
+            self._logger.info("로컬 키워드 어휘 갱신 (버전: %s, 어휘: %d개)", version, self._local.vocabulary_size)
+        except Exception as e:
+            self._logger.error("로컬 키워드 어휘 갱신 실패: %s", e)
 
     def _clean_text(self, text):
         return re.sub(r"[^\uAC00-\uD7A3a-zA-Z0-9\s]", " ", text).strip()
 
-    def _extract_keywords_gpt(self, text):
+    @timed('llm.keywords')
+    def _extract_keywords_gpt(self, text, strict=False):
         ex_keywords = ', '.join(self.preference_examples)
         prompt = (
             "From the following Korean sentence, extract only 3 to 5 important and representative keywords in Korean that are related to taste, mood, or genre, specifically concerning movies, performances, or exhibitions. "
@@ -63,39 +170,44 @@ class KeywordExtractor:
             "Keywords:"
         )
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            answer = self.llm.complete(
+                'keywords',
+                [
                     {"role": "system", "content": prompt}
                 ],
+                model=self.model,
                 max_tokens=24,
                 temperature=0
             )
-            answer = response.choices[0].message.content
             keywords = [k.strip() for k in answer.replace('키워드:', '').replace('\n', '').split(',') if len(k.strip()) > 1]
             return keywords
         except Exception as e:
-            print(f"[GPT 키워드 추출 오류] {e}")
+            self._logger.error("GPT 키워드 추출 오류: %s", e)
+            if strict:
+                raise
             return []
 
-    def _is_positive(self, kw, text):
+    @timed('llm.polarity')
+    def _is_positive(self, kw, text, strict=False):
         prompt = (
             f'In the following Korean sentence, is "{kw}" mentioned as a positive preference keyword? '
             f'If yes, answer only "예". If not, answer only "아니요". Provide your answer only in Korean, without any explanation.\n\n'
             f'Sentence: "{text}"'
         )
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
+            result = self.llm.complete(
+                'polarity',
+                [
                     {"role": "system", "content": "긍정 취향 키워드만 판별하는 한국어 전문가입니다."},
                     {"role": "user", "content": prompt}
                 ],
+                model=self.model,
                 max_tokens=3,
                 temperature=0
-            )
-            result = response.choices[0].message.content.strip().replace('.', '')
+            ).strip().replace('.', '')
             return '예' in result
         except Exception as e:
-            print(f"[GPT 감성분석 오류] {kw}: {e}")
+            self._logger.error("GPT 감성분석 오류 (%s): %s", kw, e)
+            if strict:
+                raise
             return False
\ No newline at end of file
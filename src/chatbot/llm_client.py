@@ -0,0 +1,226 @@
+## OpenAI 호출 공용 클라이언트
+## - 호출마다 데드라인: 엔드포인트 지연 예산에서 이미 쓴 시간을 뺀 만큼만 기다림 (호출별 상한과 비교해 작은 값)
+## - 헤징: 첫 요청이 최근 p95 지연을 넘기면 같은 요청을 한 번 더 보내 먼저 끝난 응답을 사용
+## - 서킷 브레이커: 연속 실패가 쌓이면 일정 시간 호출 없이 바로 실패시켜 호출부가 대체 응답을 즉시 반환하도록 함
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional
+
+import openai
+
+from config.settings import LLM_SETTINGS, OPENAI_API_KEY, OPENAI_BASE_URL
+from monitoring import REGISTRY, current_request
+
+LLM_CALLS = REGISTRY.counter(
+    'forest_llm_calls_total', 'LLM 호출 결과 (ok, error, timeout, short_circuit)', ['call', 'outcome'])
+LLM_HEDGES = REGISTRY.counter(
+    'forest_llm_hedges_total', '헤징 요청 수 (winner: 먼저 끝난 요청 primary/hedge, none: 둘 다 실패)', ['call', 'winner'])
+LLM_BREAKER_TRIPS = REGISTRY.counter(
+    'forest_llm_breaker_trips_total', '서킷 브레이커가 열린 횟수')
+
+
+class LLMUnavailableError(Exception):
+    """데드라인 초과, 서킷 브레이커 열림 등으로 LLM 응답을 받지 못한 경우 (호출부에서 대체 응답 사용)"""
+    pass
+
+
+class CircuitBreaker:
+    """
+    closed: 정상 호출 / open: reset_timeout 동안 호출 차단 / half_open: 시험 호출 하나만 허용
+    연속 실패가 failure_threshold에 도달하면 open, half_open의 시험 호출이 성공하면 closed로 돌아갑니다.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return 'closed'
+        if time.monotonic() - self._opened_at < self._reset_timeout:
+            return 'open'
+        return 'half_open'
+
+    def allow(self) -> bool:
+        with self._lock:
+            state = self._state()
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                self._logger.info("LLM 서킷 브레이커 닫힘 (시험 호출 성공)")
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            reopen = self._probing
+            self._probing = False
+            if reopen or (self._opened_at is None and self._failures >= self._failure_threshold):
+                self._opened_at = time.monotonic()
+                LLM_BREAKER_TRIPS.inc()
+                self._logger.warning("LLM 서킷 브레이커 열림 (연속 실패: %d회, %.0f초 동안 호출 차단)",
+                                     self._failures, self._reset_timeout)
+
+
+class LLMClient:
+    """
+    Chatbot, KeywordExtractor가 함께 쓰는 OpenAI chat.completions 래퍼
+
+    Args:
+        api_key, base_url: openai.OpenAI 인자
+        settings: LLM_SETTINGS 형식의 설정 (호출별 timeout, 엔드포인트 예산, 헤징, 서킷 브레이커)
+    """
+
+    def __init__(self, api_key: str = OPENAI_API_KEY, base_url: Optional[str] = OPENAI_BASE_URL,
+                 settings: Dict = None):
+        self._settings = {**LLM_SETTINGS, **(settings or {})}
+        # 재시도는 데드라인 안에서 헤징으로만 수행
+        self._client = openai.OpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        self._breaker = CircuitBreaker(self._settings['breaker_failures'], self._settings['breaker_reset_s'])
+        # 헤징 시 두 요청을 동시에 기다려야 하므로 호출은 전용 스레드에서 실행
+        self._executor = ThreadPoolExecutor(max_workers=self._settings['max_concurrency'],
+                                            thread_name_prefix='llm')
+        self._latencies = {}  # 호출 이름 -> 최근 성공 지연 시간(초)
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+
+        REGISTRY.gauge_callback(
+            'forest_llm_breaker_open', 'LLM 서킷 브레이커 상태 (0: closed, 0.5: half_open, 1: open)',
+            lambda: {(): {'closed': 0, 'half_open': 0.5, 'open': 1}[self._breaker.state]}
+        )
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        return self._breaker
+
+    def complete(self, call: str, messages: List[Dict], model: str, timeout: float = None, **params) -> str:
+        """
+        chat.completions 응답 텍스트를 반환합니다.
+
+        Args:
+            call: 호출 이름 (메트릭 라벨, 지연 통계 구분용. 예: next_question, keywords, polarity)
+            timeout: 이 호출의 상한 (None이면 default_timeout). 현재 요청의 남은 예산이 더 작으면 그 값을 사용
+
+        Raises:
+            LLMUnavailableError: 서킷 브레이커가 열려 있거나, 데드라인 안에 응답을 받지 못했거나, API 오류
+        """
+        deadline = time.monotonic() + self._call_timeout(timeout)
+        if deadline - time.monotonic() <= self._settings['min_timeout_s']:
+            LLM_CALLS.inc(call=call, outcome='timeout')
+            raise LLMUnavailableError("요청 지연 예산 소진")
+        if not self._breaker.allow():
+            LLM_CALLS.inc(call=call, outcome='short_circuit')
+            raise LLMUnavailableError("LLM 서킷 브레이커 열림")
+
+        request = dict(model=model, messages=messages, **params)
+        start = time.monotonic()
+        pending = {self._submit(request, deadline): 'primary'}
+        hedge_delay = self._hedge_delay(call)
+        hedge_at = start + hedge_delay if hedge_delay is not None else None
+        hedged = False
+        errors = []
+
+        while pending:
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            timeout = deadline - now if hedge_at is None else min(deadline - now, max(0.0, hedge_at - now))
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                label = pending.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                if hedged:
+                    LLM_HEDGES.inc(call=call, winner=label)
+                self._record_latency(call, time.monotonic() - start)
+                self._breaker.record_success()
+                LLM_CALLS.inc(call=call, outcome='ok')
+                return response.choices[0].message.content
+
+            # p95를 넘겼는데 첫 요청이 아직 진행 중이면 같은 요청을 한 번 더 보냄 (남은 시간이 충분할 때만)
+            if hedge_at is not None and pending and time.monotonic() >= hedge_at:
+                hedge_at = None
+                if deadline - time.monotonic() > self._settings['min_timeout_s']:
+                    pending[self._submit(request, deadline)] = 'hedge'
+                    hedged = True
+
+        if hedged:
+            LLM_HEDGES.inc(call=call, winner='none')
+        self._breaker.record_failure()
+        if pending or not errors:
+            LLM_CALLS.inc(call=call, outcome='timeout')
+            raise LLMUnavailableError(f"LLM 응답 시간 초과 ({time.monotonic() - start:.2f}초)")
+        LLM_CALLS.inc(call=call, outcome='error')
+        raise LLMUnavailableError(f"LLM 호출 실패: {errors[-1]}")
+
+    def _submit(self, request: Dict, deadline: float):
+        # 남은 시간을 HTTP timeout으로 넘겨, 버려진 요청도 데드라인이 지나면 스레드를 반납하도록 함
+        timeout = max(self._settings['min_timeout_s'], deadline - time.monotonic())
+        client = self._client.with_options(timeout=timeout)
+        return self._executor.submit(client.chat.completions.create, **request)
+
+    def _call_timeout(self, timeout: Optional[float]) -> float:
+        """호출 상한과 현재 요청의 남은 지연 예산 중 작은 값"""
+        timeout = self._settings['default_timeout_s'] if timeout is None else timeout
+        req_log = current_request()
+        if req_log is not None:
+            budget = self._settings['endpoint_budgets_s'].get(req_log.endpoint)
+            if budget is not None:
+                timeout = min(timeout, budget - req_log.elapsed())
+        return timeout
+
+    def _hedge_delay(self, call: str) -> Optional[float]:
+        """최근 성공 지연의 p95 (표본이 부족하면 hedge_initial_delay_s). 헤징을 끄면 None"""
+        if not self._settings['hedge_enabled']:
+            return None
+        with self._lock:
+            samples = list(self._latencies.get(call, ()))
+        if len(samples) < self._settings['hedge_min_samples']:
+            return self._settings['hedge_initial_delay_s']
+        samples.sort()
+        quantile = samples[int(self._settings['hedge_quantile'] * (len(samples) - 1))]
+        return max(self._settings['hedge_min_delay_s'], quantile)
+
+    def _record_latency(self, call: str, seconds: float) -> None:
+        with self._lock:
+            self._latencies.setdefault(call, deque(maxlen=self._settings['latency_window'])).append(seconds)
+
+
+_shared_client = None
+_shared_lock = threading.Lock()
+
+
+def shared_llm_client() -> LLMClient:
+    """프로세스(워커)당 하나의 LLMClient (서킷 브레이커/지연 통계를 모든 호출부가 공유)"""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_lock:
+            if _shared_client is None:
+                _shared_client = LLMClient()
+    return _shared_client
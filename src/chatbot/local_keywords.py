@@ -0,0 +1,178 @@
+## LLM 없이 처리하는 로컬 키워드 추출
+## 카탈로그 장르/키워드 어휘와 PREFERENCE_KEYWORD_EXAMPLES로 만든 트라이에서 발화 속 어휘를 찾고,
+## 절(clause) 단위 긍정/부정 규칙("좋아해요" / "안 좋아해요", "별로")으로 선호 여부를 판단합니다.
+## 명사 대부분이 어휘로 설명되고 극성이 분명할 때만 로컬 결과를 쓰고, 아니면 GPT 경로로 넘깁니다.
+## 질문/유보 표현("좋은지 모르겠어요", "글쎄요", "?")이 있으면 긍정으로 정하지 않고 GPT로 넘깁니다.
+import re
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+
+# 절 구분: 문장 부호와 역접/나열 연결 표현 (구분자는 질문 여부 확인용으로 함께 반환)
+_CLAUSE_SPLIT = re.compile(r"([.,!?;\n]+|\s(?:그리고|그런데|하지만|그렇지만|그래도|근데)\s|(?<=지만|는데|은데)\s)")
+
+# 질문/유보 표현 ("좋은지 모르겠어요", "재밌을까요", "글쎄요")은 긍정 단어가 있어도 선호로 보지 않음
+_HEDGE = re.compile(r"모르겠|모르지|글쎄|애매|[은는인던]지(?=\s|$|도\s|는\s)|까요|궁금")
+
+# 부정 표현을 먼저 확인 ("안 좋아해요", "좋아하지 않아요"는 '좋아'를 포함하지만 부정)
+_NEGATIVE = re.compile(
+    r"안\s*좋|좋아하지\s*않|좋아하진\s*않|좋지\s*않|별로|싫|안\s*봐|안\s*봅|안\s*본|"
+    r"관심\s*없|재미\s*없|재미없|지루|취향이\s*아니|취향\s*아니|못\s*보겠|질색|최악"
+)
+_POSITIVE = re.compile(
+    r"좋아|좋았|좋더|좋은|좋네|좋고|재밌|재미있|즐겨|즐기|최고|감동|사랑|선호|빠져|관심\s*있|인상\s*깊|"
+    r"기억에\s*남|추천|챙겨\s*보|자주\s*보|많이\s*보"
+)
+
+_LATIN = re.compile(r"[a-z0-9]")
+
+# 취향 정보가 없는 일반 명사 (어휘 적용 비율 계산에서 제외)
+_GENERIC_NOUNS = {'영화', '공연', '전시', '전시회', '작품', '장르', '최근', '요즘', '주로', '보통', '느낌', '종류', '이번', '주말'}
+
+
+class KeywordTrie:
+    """문자 단위 트라이. 발화의 각 위치에서 가장 긴 어휘를 찾아 겹치지 않게 반환합니다."""
+
+    _END = '\0'
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self._root = {}
+        self.size = 0
+        for term in terms:
+            self.add(term)
+
+    def add(self, term: str) -> None:
+        node = self._root
+        for char in term:
+            node = node.setdefault(char, {})
+        if self._END not in node:
+            node[self._END] = term
+            self.size += 1
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        """(시작, 끝, 어휘) 목록. 영문/숫자 어휘는 단어 경계에서만 일치"""
+        matches = []
+        pos = 0
+        while pos < len(text):
+            node, best = self._root, None
+            for end in range(pos, len(text)):
+                node = node.get(text[end])
+                if node is None:
+                    break
+                term = node.get(self._END)
+                if term is not None and self._at_boundary(text, pos, end + 1, term):
+                    best = (pos, end + 1, term)
+            if best:
+                matches.append(best)
+                pos = best[1]
+            else:
+                pos += 1
+        return matches
+
+    @staticmethod
+    def _at_boundary(text: str, start: int, end: int, term: str) -> bool:
+        if not _LATIN.match(term[0]) and not _LATIN.match(term[-1]):
+            return True
+        before = text[start - 1] if start > 0 else ' '
+        after = text[end] if end < len(text) else ' '
+        return not (before.isalnum() and before.isascii()) and not (after.isalnum() and after.isascii())
+
+
+@dataclass
+class LocalExtraction:
+    """로컬 추출 결과. confident가 False면 GPT 경로로 넘깁니다."""
+    keywords: List[str]
+    confident: bool
+    reason: str
+    # 어휘 -> 'positive' / 'negative' / 'neutral' (GPT 경로에서도 극성이 분명한 어휘는 판별 호출 생략)
+    polarity: Dict[str, str] = field(default_factory=dict)
+
+
+def clause_polarity(clause: str, terminator: str = '') -> str:
+    """
+    절의 극성 ('positive' / 'negative' / 'neutral').
+    질문('?'로 끝나는 절)이나 유보 표현이 있으면 'neutral'이므로 호출 쪽에서 GPT로 넘깁니다.
+
+    Args:
+        clause: 찾은 어휘를 공백으로 가린 절 ('감동', '사랑' 같은 어휘가 스스로 긍정 표현으로 잡히지 않도록)
+        terminator: 절 뒤의 구분자
+    """
+    if '?' in terminator or _HEDGE.search(clause):
+        return 'neutral'
+    if _NEGATIVE.search(clause):
+        return 'negative'
+    if _POSITIVE.search(clause):
+        return 'positive'
+    return 'neutral'
+
+
+class LocalKeywordExtractor:
+    """
+    Args:
+        base_terms: 항상 포함할 어휘 (PREFERENCE_KEYWORD_EXAMPLES)
+        min_coverage: 어휘로 설명되는 명사 비율이 이보다 낮으면 GPT로 넘김 (작품 제목 등 모르는 명사가 많은 경우)
+    """
+
+    def __init__(self, base_terms: Iterable[str] = (), min_coverage: float = 0.6):
+        self._base_terms = [term.lower() for term in base_terms]
+        self._min_coverage = min_coverage
+        self._trie = KeywordTrie(self._base_terms)
+        self.vocabulary_version = None
+
+    @property
+    def vocabulary_size(self) -> int:
+        return self._trie.size
+
+    def set_vocabulary(self, terms: Iterable[str], version) -> None:
+        """카탈로그 어휘로 트라이를 다시 만듭니다. (새 트라이를 만든 뒤 참조만 교체)"""
+        trie = KeywordTrie(self._base_terms)
+        for term in terms:
+            term = term.strip().lower()
+            if len(term) >= 2:
+                trie.add(term)
+        self._trie = trie
+        self.vocabulary_version = version
+
+    def extract(self, text: str, nouns: Iterable[str]) -> LocalExtraction:
+        """
+        Args:
+            text: 원문 발화 (문장 부호로 절을 나누고 질문 여부를 판단하므로 특수문자를 지우지 않은 것)
+            nouns: Okt 명사 (불용어/한 글자 제외)
+        """
+        trie = self._trie
+        lowered = text.lower()
+        polarity = {}
+        covered = set()
+        parts = _CLAUSE_SPLIT.split(lowered)
+        for clause, terminator in zip(parts[::2], parts[1::2] + ['']):
+            if not clause.strip():
+                continue
+            matches = trie.find(clause)
+            if not matches:
+                continue
+            masked = list(clause)
+            for start, end, _ in matches:
+                masked[start:end] = ' ' * (end - start)
+            clause_sign = clause_polarity(''.join(masked), terminator)
+            for _, _, term in matches:
+                covered.add(term)
+                # 같은 어휘가 여러 절에 나오면 부정 > 긍정 > 중립 순으로 우선
+                previous = polarity.get(term)
+                if previous != 'negative' and (previous is None or clause_sign != 'neutral'):
+                    polarity[term] = clause_sign
+
+        # 유보 표현이 어휘 없는 절에만 있어도 ("글쎄요, 로맨스 좋아하긴 하는데") 긍정 판단은 GPT에 맡김
+        hedged = bool(_HEDGE.search(lowered))
+        if hedged:
+            polarity = {term: 'negative' if sign == 'negative' else 'neutral' for term, sign in polarity.items()}
+        positive = [term for term, sign in polarity.items() if sign == 'positive']
+        nouns = set(nouns) - _GENERIC_NOUNS
+        unexplained = {noun for noun in nouns if not any(noun in term or term in noun for term in covered)}
+        coverage = 1.0 - len(unexplained) / len(nouns) if nouns else 1.0
+
+        if not polarity:
+            return LocalExtraction([], False, 'no_match', polarity)
+        if hedged or any(sign == 'neutral' for sign in polarity.values()):
+            return LocalExtraction(positive, False, 'uncertain_polarity', polarity)
+        if coverage < self._min_coverage:
+            return LocalExtraction(positive, False, 'low_coverage', polarity)
+        return LocalExtraction(positive, True, 'confident', polarity)
@@ -0,0 +1,180 @@
+## 챗봇 대화 세션
+## /chatbot/answer 턴마다 사용자 발화의 키워드를 백그라운드에서 추출해 근거(턴 번호)와 함께 모아두고,
+## /chatbot/save는 모아둔 키워드를 합쳐 저장만 합니다. (대화 전체를 마지막에 다시 추출하지 않음)
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+@dataclass
+class KeywordEvidence:
+    """키워드가 추출된 턴 번호 목록"""
+    turns: List[int] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.turns)
+
+
+class ChatSession:
+    """
+    한 사용자의 진행 중인 대화.
+    dialogue는 기존과 같은 [(사용자 발화, 챗봇 질문), ...] 형식이고, keywords는 턴별 추출 결과를 누적한 값입니다.
+    """
+
+    def __init__(self, user_id):
+        self.user_id = user_id
+        self.dialogue: List[Tuple[str, str]] = []
+        self.keywords: Dict[str, KeywordEvidence] = {}
+        self._pending: Dict[int, Future] = {}  # 턴 번호 -> 추출 중인 작업
+        self._failed: List[int] = []           # 추출에 실패한 턴 (저장 시 다시 추출)
+        self._generation = 0                   # finalize마다 증가. 이전 세대 작업의 늦은 결과는 버림
+        self._lock = threading.Lock()
+        self.updated_at = time.monotonic()
+
+    def add_turn(self, message: str) -> int:
+        with self._lock:
+            self.dialogue.append((message, ""))
+            self.updated_at = time.monotonic()
+            return len(self.dialogue) - 1
+
+    def set_reply(self, turn: int, question: str) -> None:
+        with self._lock:
+            self.dialogue[turn] = (self.dialogue[turn][0], question)
+
+    def track(self, turn: int, future: Future) -> None:
+        """턴의 키워드 추출 작업을 등록하고, 끝나면 결과를 누적합니다."""
+        with self._lock:
+            self._pending[turn] = future
+            generation = self._generation
+        future.add_done_callback(lambda done: self._collect(turn, done, generation))
+
+    def _collect(self, turn: int, future: Future, generation: int) -> None:
+        try:
+            keywords = future.result()
+        except Exception:
+            keywords = None
+        with self._lock:
+            if generation != self._generation:
+                # finalize가 이미 이 턴을 다시 추출했음
+                return
+            self._pending.pop(turn, None)
+            if keywords is None:
+                self._failed.append(turn)
+                return
+            self._merge(turn, keywords)
+
+    def _merge(self, turn: int, keywords: List[str]) -> None:
+        for keyword in keywords:
+            evidence = self.keywords.setdefault(keyword, KeywordEvidence())
+            if turn not in evidence.turns:
+                evidence.turns.append(turn)
+
+    def keywords_so_far(self) -> List[str]:
+        """지금까지 추출된 키워드 (등장 턴 수 많은 순, 같으면 먼저 나온 순)"""
+        with self._lock:
+            items = list(self.keywords.items())
+        items.sort(key=lambda item: (-item[1].count, item[1].turns[0]))
+        return [keyword for keyword, _ in items]
+
+    def finalize(self, extract: Callable[[str], List[str]], timeout: float) -> List[str]:
+        """
+        진행 중인 추출을 timeout까지 기다리고, 실패했거나 끝나지 않은 턴만 동기로 다시 추출한 뒤
+        누적 키워드를 반환합니다.
+        """
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            pending = dict(self._pending)
+        for future in pending.values():
+            try:
+                future.result(timeout=max(0.0, deadline - time.monotonic()))
+            except Exception:
+                pass
+
+        with self._lock:
+            retry = sorted(set(self._failed) | set(self._pending))
+            self._failed = []
+            # 끝나지 않은 작업의 결과는 이후 도착해도 무시 (아래에서 다시 추출, _collect가 세대로 확인)
+            self._pending = {}
+            self._generation += 1
+            messages = [(turn, self.dialogue[turn][0]) for turn in retry]
+        for turn, message in messages:
+            keywords = extract(message)
+            with self._lock:
+                self._merge(turn, keywords)
+        return self.keywords_so_far()
+
+    @property
+    def pending_turns(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+
+class SessionStore:
+    """
+    user_id -> ChatSession. 턴별 키워드 추출은 작은 스레드 풀에서 실행합니다.
+    (키워드 추출은 대부분 OpenAI 응답 대기라 스레드로 충분)
+    마지막 발화(updated_at) 이후 ttl_s가 지난 세션은 만료로 보고 제거합니다.
+    """
+
+    def __init__(self, workers: int = 4, ttl_s: float = 1800.0):
+        self._sessions: Dict[str, ChatSession] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='turn-keywords')
+        self._logger = logging.getLogger(__name__)
+        self._ttl = ttl_s
+        # 만료 세션 정리는 요청 경로에서 하되, 전체 순회는 ttl의 1/10 간격으로만
+        self._sweep_interval = ttl_s / 10
+        self._last_sweep = time.monotonic()
+
+    def reset(self, user_id) -> ChatSession:
+        with self._lock:
+            self._evict_expired()
+            session = self._sessions[user_id] = ChatSession(user_id)
+            return session
+
+    def get_or_create(self, user_id) -> ChatSession:
+        with self._lock:
+            self._evict_expired()
+            session = self._sessions.get(user_id)
+            if session is None or self._expired(session, time.monotonic()):
+                session = self._sessions[user_id] = ChatSession(user_id)
+            return session
+
+    def get(self, user_id) -> Optional[ChatSession]:
+        session = self._sessions.get(user_id)
+        if session is None or self._expired(session, time.monotonic()):
+            return None
+        return session
+
+    def _expired(self, session: ChatSession, now: float) -> bool:
+        return now - session.updated_at > self._ttl
+
+    def _evict_expired(self) -> None:
+        """(self._lock 안에서 호출) 만료된 세션 제거"""
+        now = time.monotonic()
+        if now - self._last_sweep < self._sweep_interval:
+            return
+        self._last_sweep = now
+        expired = [user_id for user_id, session in self._sessions.items() if self._expired(session, now)]
+        for user_id in expired:
+            del self._sessions[user_id]
+        if expired:
+            self._logger.info("만료된 대화 세션 정리: %d개 (남은 세션: %d개)", len(expired), len(self._sessions))
+
+    def extract_in_background(self, session: ChatSession, turn: int, message: str,
+                              extract: Callable[[str], List[str]]) -> None:
+        session.track(turn, self._executor.submit(self._extract, extract, message))
+
+    def _extract(self, extract: Callable[[str], List[str]], message: str) -> List[str]:
+        try:
+            return extract(message)
+        except Exception as e:
+            self._logger.error("턴 키워드 추출 실패 (저장 시 다시 추출): %s", e)
+            raise
+
+    def __len__(self) -> int:
+        return len(self._sessions)
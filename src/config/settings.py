@@ -10,12 +10,109 @@ DB_CONFIG = {
     'database': os.getenv('DB_DATABASE')
 }
 
+# DB 백엔드: mysql(기본) 또는 sqlite(로컬 테스트/벤치마크용)
+DB_BACKEND = os.getenv('DB_BACKEND', 'mysql')
+SQLITE_PATH = os.getenv('SQLITE_PATH', 'forest_local.db')
+
 # 추가 설정들
 RECOMMENDATION_SETTINGS = {
     'update_interval': 3600,  # 1시간
     'min_ratings': 10,
-    'similarity_threshold': 0.5
+    'similarity_threshold': 0.5,
+    'top_k': 50,                  # 최종 추천 개수
+    'candidate_pool': 300,        # 재정렬 대상 후보 수
+    # /recommendations 페이지네이션 (cursor, limit): 첫 페이지에서 ranked_list_size 길이 목록을 계산해 캐시
+    'page_size': 20,              # limit이 없을 때 페이지 크기
+    'max_page_size': 100,
+    'ranked_list_size': int(os.getenv('RANKED_LIST_SIZE', '500')),
+    'ranked_cache_size': 10000,   # 캐시할 순위 목록 수 (사용자 x 카탈로그 지문 x 필터)
+    'use_mmr': True,              # MMR 다양성 재정렬 사용 여부
+    'mmr_lambda': 0.7,            # 관련도 가중치 (1.0이면 유사도 순 정렬과 동일)
+    'neighbor_top_m': 20,         # 아이템별 저장할 유사 아이템 수
+    'neighbor_block_size': 1024,  # 이웃 테이블 계산 시 한 번에 처리할 행 수
+    'user_vector_cache_size': 10000,  # 사용자 벡터 LRU 캐시 크기
+    'text_workers': int(os.getenv('TEXT_WORKERS', '0')),  # 카탈로그 텍스트 정규화 프로세스 수 (0/1이면 단일 프로세스)
+    'text_chunk_size': 20000,     # 병렬 정규화 청크 크기 (정규화할 아이템이 2청크 이상일 때만 병렬 처리)
+    # TF-IDF 토큰화: word(정규식 단어, 기본) / okt(Okt 형태소 정규화, JVM 필요) / rules(조사/어미 제거, JVM 없음)
+    'text_analyzer': os.getenv('TEXT_ANALYZER', 'word'),
+    'token_cache_path': os.getenv('TOKEN_CACHE_PATH', ''),  # 어절 -> 형태소 토큰 캐시 파일 (비우면 메모리에만 유지)
+    # 아이템/사용자 벡터화: tfidf(어휘 학습, 기본) / hashing(학습 없는 feature hashing, 카탈로그 갱신 시 재학습 없음)
+    'vectorizer_mode': os.getenv('VECTORIZER_MODE', 'tfidf'),
+    'hashing_features': 2 ** 18,  # hashing 모드 해시 차원 수
+    'hashing_idf': True,          # hashing 모드에서 아이템 벡터에 IDF(문서 빈도 점진 유지) 적용 여부
+    # 점수 계산 방식: inline(요청 스레드에서 계산) 또는 process(공유 메모리 + 프로세스 풀, 동시 요청 마이크로 배치)
+    'scoring_backend': os.getenv('SCORING_BACKEND', 'inline'),
+    'scoring_workers': int(os.getenv('SCORING_WORKERS', '0')),  # 0이면 CPU 코어 수 / 웹 워커 수
+    'web_workers': int(os.getenv('WEB_CONCURRENCY', '1')),  # 호스트의 웹 워커 프로세스 수 (gunicorn_conf.py가 설정)
+    'scoring_max_batch': 32,      # 한 번의 행렬 곱으로 묶을 최대 요청 수
+    'scoring_batch_wait_ms': 2.0, # 첫 요청 이후 추가 요청을 기다리는 시간
+    # 카탈로그 스냅샷 공유: off(노드마다 MySQL에서 생성, 기본) / publish(생성 후 공유 디렉터리에 배포) /
+    # follow(공유 디렉터리의 최신 스냅샷을 불러와 사용, MySQL에서 카탈로그를 만들지 않음)
+    'snapshot_mode': os.getenv('CATALOG_SNAPSHOT_MODE', 'off'),
+    'snapshot_dir': os.getenv('CATALOG_SNAPSHOT_DIR', ''),
+    'snapshot_poll_s': float(os.getenv('CATALOG_SNAPSHOT_POLL_S', '10')),  # follow 모드 manifest 확인 주기
+    'snapshot_keep': 3,           # publish 모드에서 남겨둘 최근 스냅샷 수
+    'search_default_k': 20,       # /search 결과 수 (k가 없을 때)
+    'search_max_k': 100,
+    'live_keyword_weight': 1.0,   # /recommendations/live에서 대화 키워드 벡터 가중치 (저장된 선호 벡터 = 1.0)
+    # /recommendations/live가 메모리에 보관한 선호 벡터를 다시 읽기 전까지 쓰는 시간 (같은 워커의 저장은 즉시 무효화)
+    'user_vector_ttl_s': float(os.getenv('USER_VECTOR_TTL_S', '300')),
+    'cold_start_prior_count': 5,  # 인기 목록 베이지안 평균의 사전 리뷰 수
+    # 콜드 스타트 목록 맨 앞에 노출할 activity_id (쉼표 구분)
+    'cold_start_editorial_ids': [int(x) for x in os.getenv('COLD_START_EDITORIAL_IDS', '').split(',') if x.strip()]
+}
+
+# 로깅 설정
+LOGGING_SETTINGS = {
+    'level': os.getenv('LOG_LEVEL', 'INFO'),
+    # 요청 페이로드(프로필, 대화 내역, 추천 목록 등)를 INFO로 남길 요청 비율 (0.0 ~ 1.0)
+    'payload_sample_rate': float(os.getenv('LOG_PAYLOAD_SAMPLE_RATE', '0'))
+}
+
+# 지연 시간/카운터 수집 (/metrics 엔드포인트)
+METRICS_SETTINGS = {
+    'enabled': os.getenv('METRICS_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+}
+
+# OpenAI 호출 데드라인/헤징/서킷 브레이커 (chatbot.llm_client)
+LLM_SETTINGS = {
+    'default_timeout_s': float(os.getenv('LLM_TIMEOUT_S', '10')),  # 호출별 상한 (timeout 인자가 없을 때)
+    # 엔드포인트 지연 예산: 호출 데드라인 = min(호출 상한, 예산 - 요청 시작 후 지난 시간)
+    'endpoint_budgets_s': {
+        '/chatbot/answer': float(os.getenv('LLM_BUDGET_ANSWER_S', '6')),
+        '/chatbot/save': float(os.getenv('LLM_BUDGET_SAVE_S', '20')),
+    },
+    'min_timeout_s': 0.05,        # 남은 시간이 이보다 짧으면 호출하지 않음
+    'hedge_enabled': os.getenv('LLM_HEDGE', 'true').lower() in ('1', 'true', 'yes'),
+    'hedge_quantile': 0.95,       # 첫 요청이 최근 지연의 이 분위수를 넘기면 헤징 요청
+    'hedge_min_samples': 20,      # 지연 표본이 이보다 적으면 hedge_initial_delay_s 사용
+    'hedge_initial_delay_s': 2.0,
+    'hedge_min_delay_s': 0.2,
+    'latency_window': 200,        # 호출별로 보관할 최근 지연 표본 수
+    'breaker_failures': 5,        # 연속 실패가 이만큼 쌓이면 서킷 브레이커 열림
+    'breaker_reset_s': 30.0,      # 열린 뒤 시험 호출을 허용할 때까지의 시간
+    'max_concurrency': 64,        # 동시 LLM 요청 스레드 수 (헤징 포함)
+}
+
+# 키워드 추출: 로컬(트라이 + 긍정/부정 규칙)로 충분하면 GPT 호출 생략
+KEYWORD_SETTINGS = {
+    'local_enabled': os.getenv('KEYWORD_LOCAL', 'true').lower() in ('1', 'true', 'yes'),
+    'local_min_coverage': 0.6,    # 어휘로 설명되는 명사 비율이 이보다 낮으면 GPT 사용
+    # /chatbot/answer 턴마다 백그라운드에서 추출해 세션에 누적 (false면 /chatbot/save에서 대화 전체를 한 번에 추출)
+    'per_turn': os.getenv('KEYWORD_PER_TURN', 'true').lower() in ('1', 'true', 'yes'),
+    'turn_workers': 4,            # 턴별 추출 스레드 수 (워커당)
+    'save_wait_s': 10.0,          # /chatbot/save에서 진행 중인 턴 추출을 기다리는 최대 시간
+    'session_ttl_s': float(os.getenv('CHAT_SESSION_TTL_S', '1800')),  # 마지막 발화 이후 대화 세션을 보관하는 시간
+    # 발화별 키워드 추출 결과를 기록할 파일 (디버깅용, 비우면 기록하지 않고 DEBUG 로그만 남김)
+    'result_log_path': os.getenv('KEYWORD_RESULT_LOG', ''),
+}
+
+# 서버 역할: all(기본) / recommendations(추천 API만, konlpy/openai 미로딩) / chatbot(챗봇 API만)
+SERVING_SETTINGS = {
+    'role': os.getenv('SERVICE_ROLE', 'all')
 }
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
\ No newline at end of file
+OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-3.5-turbo")
+# OpenAI 호환 서버 주소 (로컬 부하 테스트 시 benchmarks.fake_openai 주소로 지정, 비우면 기본 API)
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
\ No newline at end of file
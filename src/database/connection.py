@@ -1,16 +1,19 @@
 import mysql.connector
 from mysql.connector import Error
 import logging
-from config.settings import DB_CONFIG
+from config.settings import DB_CONFIG, DB_BACKEND, SQLITE_PATH
+from . import sqlite_backend
 
 class DatabaseConnection:
     @staticmethod
     def get_connection():
         try:
+            if DB_BACKEND == 'sqlite':
+                return sqlite_backend.connect(SQLITE_PATH)
             connection = mysql.connector.connect(**DB_CONFIG)
             return connection
         except Error as e:
-            logging.error(f"데이터베이스 연결 실패: {e}")
+            logging.error("데이터베이스 연결 실패: %s", e)
             raise
             
     def __enter__(self):
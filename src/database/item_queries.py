@@ -2,6 +2,7 @@ from .base import BaseDatabase
 import logging
 from typing import List, Dict, Any
 from mysql.connector import Error as DatabaseError
+from monitoring import timed
 
 
 class ItemQueries(BaseDatabase):
@@ -10,6 +11,7 @@ class ItemQueries(BaseDatabase):
         super().__init__()  # BaseDatabase의 __init__ 호출
         self._logger = logging.getLogger(__name__)
 
+    @timed('db.movies')
     def get_movies_data(self, content_type: str) -> List[Dict]:
         """모든 영화 정보를 가져오는 메서드"""
         query = """
@@ -23,11 +25,11 @@ class ItemQueries(BaseDatabase):
             FROM DB_FOREST.MOVIE
         """
         try:
-            self._logger.info(f"영화 데이터 가져오기")
+            self._logger.info("영화 데이터 가져오기")
 
             with self.db as conn:
                 cursor = conn.cursor()
-                self._logger.info(f"쿼리 실행")
+                self._logger.debug("쿼리 실행")
                 cursor.execute(query)
                 
                 # 컬럼명 가져오기
@@ -41,9 +43,10 @@ class ItemQueries(BaseDatabase):
                 return result
                 
         except DatabaseError as e:
-            self._logger.error(f"영화 정보 조회 중 오류 발생: {str(e)}")
+            self._logger.error("영화 정보 조회 중 오류 발생: %s", e)
             return []
 
+    @timed('db.performances')
     def get_performances_data(self):
         """모든 공연 정보를 가져오는 메서드"""
         query = """
@@ -71,9 +74,10 @@ class ItemQueries(BaseDatabase):
                 return result
                 
         except DatabaseError as e:
-            logging.error(f"공연 정보 조회 중 오류 발생: {str(e)}")
+            logging.error("공연 정보 조회 중 오류 발생: %s", e)
             return []
 
+    @timed('db.exhibitions')
     def get_exhibitions_data(self):
         """모든 전시 정보를 가져오는 메서드"""
         query = """
@@ -99,5 +103,5 @@ class ItemQueries(BaseDatabase):
                 return result
                 
         except DatabaseError as e:
-            logging.error(f"전시 정보 조회 중 오류 발생: {str(e)}")
+            logging.error("전시 정보 조회 중 오류 발생: %s", e)
             return []
\ No newline at end of file
@@ -3,6 +3,7 @@ import logging
 from typing import List, Dict, Any
 from mysql.connector import Error as DatabaseError
 import json
+from monitoring import timed
 
 class RatingQueries(BaseDatabase):
 
@@ -10,7 +11,9 @@ class RatingQueries(BaseDatabase):
         super().__init__()  # BaseDatabase의 __init__ 호출
         self._logger = logging.getLogger(__name__)
 
+    @timed('db.ratings')
     def get_ratings_data(self)-> List[Dict[str, Any]]:
+        """전체 사용자-아이템-평점 데이터를 조회합니다. (SVD 학습, 오프라인 평가용)"""
         query = """
         SELECT 
             user_id,
@@ -24,17 +27,63 @@ class RatingQueries(BaseDatabase):
             
             with self.db as conn:
                 cursor = conn.cursor(dictionary=True)
-                cursor.execute(query, (user_id,))
-                result = cursor.fetchone()
+                cursor.execute(query)
+                results = cursor.fetchall()
                 
-                if not result:
+                if not results:
                     self._logger.error("Surprise SVD 모델 학습용 평점 데이터가 없습니다.")
                     return None
                 
-                self._logger.info(f"{len(results)}개의 Surprise 학습용 평점 데이터를 성공적으로 조회했습니다.")
+                self._logger.info("%d개의 Surprise 학습용 평점 데이터를 성공적으로 조회했습니다.", len(results))
                 return results
                 
         except Exception as e:
-            self._logger.error(f"사용자-아이템-평점 데이터 조회 중 오류 발생: {str(e)}")
+            self._logger.error("사용자-아이템-평점 데이터 조회 중 오류 발생: %s", e)
             return None
 
+    @timed('db.popularity')
+    def get_popularity_data(self) -> List[Dict[str, Any]]:
+        """아이템별 리뷰 수와 평균 평점을 조회합니다. (콜드 스타트 인기 목록용)"""
+        query = """
+        SELECT 
+            activity_id,
+            COUNT(*) AS review_count,
+            AVG(rate) AS avg_rate
+        FROM DB_FOREST.REVIEW
+        GROUP BY activity_id
+        """
+
+        try:
+            self._logger.info("아이템별 리뷰 집계 데이터를 조회합니다.")
+
+            with self.db as conn:
+                cursor = conn.cursor(dictionary=True)
+                cursor.execute(query)
+                results = cursor.fetchall()
+
+                self._logger.info("%d개 아이템의 리뷰 집계 데이터를 조회했습니다.", len(results))
+                return results
+
+        except Exception as e:
+            self._logger.error("아이템별 리뷰 집계 조회 중 오류 발생: %s", e)
+            return []
+
+    @timed('db.reviewed')
+    def get_reviewed_activity_ids(self, user_id) -> List[int]:
+        """사용자가 리뷰를 남긴 activity_id 목록 (이미 본 아이템을 추천에서 제외할 때 사용)"""
+        query = """
+        SELECT DISTINCT activity_id
+        FROM DB_FOREST.REVIEW
+        WHERE user_id = %s
+        """
+
+        try:
+            with self.db as conn:
+                cursor = conn.cursor(dictionary=True)
+                cursor.execute(query, (user_id,))
+                results = cursor.fetchall()
+                return [row['activity_id'] for row in results]
+
+        except Exception as e:
+            self._logger.error("사용자 %s의 리뷰 아이템 조회 중 오류 발생: %s", user_id, e)
+            return []
@@ -3,18 +3,20 @@ from .base import BaseDatabase
 import logging
 from typing import List
 from mysql.connector import Error as DatabaseError
+from monitoring import timed
 
 class PreferenceQueries(BaseDatabase):
     def __init__(self):
         super().__init__()
         self._logger = logging.getLogger(__name__)
 
+    @timed('db.save_like_words')
     def save_like_words(self, user_id: str, new_keywords: List[str]):
         """
         user_id에 맞춰 like_words(JSON) 컬럼에 키워드를 중복 없이 추가/업데이트합니다.
         """
         if not new_keywords:
-            self._logger.info("추가할 키워드가 없습니다.")
+            self._logger.debug("추가할 키워드가 없습니다.")
             return
 
         try:
@@ -47,7 +49,7 @@ class PreferenceQueries(BaseDatabase):
                         WHERE user_id = %s
                     """
                     cursor.execute(update_query, (final_like_words, user_id))
-                    self._logger.info(f"user_id={user_id}의 like_words가 성공적으로 업데이트되었습니다.")
+                    self._logger.debug("user_id=%s의 like_words가 성공적으로 업데이트되었습니다.", user_id)
                 else:
                     # 기존 정보가 없으면 새로 INSERT
                     final_list = list(set(new_keywords))
@@ -57,10 +59,10 @@ class PreferenceQueries(BaseDatabase):
                         VALUES (%s, %s)
                     """
                     cursor.execute(insert_query, (user_id, final_like_words))
-                    self._logger.info(f"user_id={user_id}의 like_words가 신규로 저장되었습니다.")
+                    self._logger.debug("user_id=%s의 like_words가 신규로 저장되었습니다.", user_id)
 
                 conn.commit()
         except DatabaseError as e:
-            self._logger.error(f"like_words 저장 중 데이터베이스 오류 발생: {str(e)}")
+            self._logger.error("like_words 저장 중 데이터베이스 오류 발생: %s", e)
         except Exception as ex:
-            self._logger.error(f"like_words 저장 중 예외 발생: {str(ex)}")
\ No newline at end of file
+            self._logger.error("like_words 저장 중 예외 발생: %s", ex)
\ No newline at end of file
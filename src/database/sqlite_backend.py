@@ -0,0 +1,88 @@
+## 로컬 테스트/벤치마크용 SQLite 백엔드
+## mysql-connector 커넥션과 같은 방식(cursor(dictionary=True), %s 파라미터, DB_FOREST.테이블)으로 사용할 수 있습니다.
+import re
+import sqlite3
+from mysql.connector import Error
+
+SCHEMA_NAME = 'DB_FOREST'
+
+# MySQL에서는 컬럼명으로 쓸 수 있지만 SQLite에서는 예약어인 식별자 (함수 호출 형태는 제외)
+_RESERVED_COLUMNS = re.compile(r'(?<![\w"])(cast)(?!\s*\()(?![\w"])', re.IGNORECASE)
+
+
+def _to_sqlite(query: str) -> str:
+    """MySQL 쿼리를 SQLite에서 실행 가능한 형태로 변환 (%s -> ?, 예약어 컬럼 따옴표 처리)"""
+    return _RESERVED_COLUMNS.sub(r'"\1"', query.replace('%s', '?'))
+
+
+class SQLiteCursor:
+    def __init__(self, cursor: sqlite3.Cursor, dictionary: bool = False):
+        self._cursor = cursor
+        self._dictionary = dictionary
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def execute(self, query, params=None):
+        try:
+            self._cursor.execute(_to_sqlite(query), tuple(params or ()))
+        except sqlite3.Error as e:
+            raise Error(msg=str(e))
+        return self
+
+    def executemany(self, query, seq_of_params):
+        try:
+            self._cursor.executemany(_to_sqlite(query), seq_of_params)
+        except sqlite3.Error as e:
+            raise Error(msg=str(e))
+        return self
+
+    def _convert(self, row):
+        if row is None or not self._dictionary:
+            return row
+        columns = [desc[0] for desc in self._cursor.description]
+        return dict(zip(columns, row))
+
+    def fetchone(self):
+        return self._convert(self._cursor.fetchone())
+
+    def fetchall(self):
+        return [self._convert(row) for row in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+
+class SQLiteConnection:
+    def __init__(self, path: str):
+        # 메모리 DB에 파일을 DB_FOREST 스키마로 붙여서 'DB_FOREST.MOVIE' 같은 쿼리를 그대로 사용
+        self._conn = sqlite3.connect(':memory:', check_same_thread=False)
+        self._conn.execute(f"ATTACH DATABASE ? AS {SCHEMA_NAME}", (path,))
+
+    def cursor(self, dictionary: bool = False) -> SQLiteCursor:
+        return SQLiteCursor(self._conn.cursor(), dictionary=dictionary)
+
+    def commit(self):
+        self._conn.commit()
+
+    def rollback(self):
+        self._conn.rollback()
+
+    def close(self):
+        self._conn.close()
+
+
+def connect(path: str) -> SQLiteConnection:
+    try:
+        return SQLiteConnection(path)
+    except sqlite3.Error as e:
+        raise Error(msg=str(e))
@@ -3,6 +3,7 @@ import logging
 from typing import List, Dict, Any
 from mysql.connector import Error as DatabaseError
 import json
+from monitoring import timed
 
 class UserQueries(BaseDatabase):
 
@@ -10,6 +11,7 @@ class UserQueries(BaseDatabase):
         super().__init__()  # BaseDatabase의 __init__ 호출
         self._logger = logging.getLogger(__name__)
 
+    @timed('db.user_preferences')
     def get_user_preferences(self, user_id):
         query = """
         SELECT 
@@ -27,7 +29,7 @@ class UserQueries(BaseDatabase):
         """
         
         try:
-            self._logger.info(f"사용자 {user_id}의 선호도 조회를 시작합니다.")
+            self._logger.debug("사용자 %s의 선호도 조회를 시작합니다.", user_id)
             
             with self.db as conn:
                 cursor = conn.cursor(dictionary=True)
@@ -35,7 +37,8 @@ class UserQueries(BaseDatabase):
                 result = cursor.fetchone()
                 
                 if not result:
-                    self._logger.error(f"사용자 {user_id}의 선호도 데이터가 없습니다.")
+                    # 선호도를 아직 저장하지 않은 신규 사용자 (콜드 스타트 대상, 오류 아님)
+                    self._logger.debug("사용자 %s의 선호도 데이터가 없습니다.", user_id)
                     return None
                 
                 # JSON 문자열을 파이썬 객체로 변환
@@ -64,11 +67,11 @@ class UserQueries(BaseDatabase):
                     'vector': vector
                 }
                 
-                self._logger.info(f"사용자 {user_id}의 선호도 데이터 조회 완료")
+                self._logger.debug("사용자 %s의 선호도 데이터 조회 완료", user_id)
                 return user_profile
                 
         except Exception as e:
-            self._logger.error(f"사용자 선호도 조회 중 오류 발생: {str(e)}")
+            self._logger.error("사용자 선호도 조회 중 오류 발생: %s", e)
             return None
 
     def _parse_json(self, data_str):
@@ -78,5 +81,5 @@ class UserQueries(BaseDatabase):
                 return json.loads(data_str)
             return [] if data_str is None else data_str
         except json.JSONDecodeError as e:
-            self._logger.error(f"JSON 파싱 오류: {str(e)}")
+            self._logger.error("JSON 파싱 오류: %s", e)
             return []
\ No newline at end of file
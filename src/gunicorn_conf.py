@@ -0,0 +1,50 @@
+## gunicorn 설정 (운영 서버 실행)
+## gunicorn -c gunicorn_conf.py wsgi:app
+##
+## - preload_app: master에서 앱을 한 번 import하고 카탈로그 스냅샷/vectorizer를 만든 뒤 fork
+##   -> 워커들이 카탈로그 메모리를 copy-on-write로 공유 (워커 N개여도 메모리 N배가 아님)
+## - Okt(JVM)는 fork 후 안전하지 않으므로 워커마다 post_fork에서 초기화
+## - /health/ready는 카탈로그와 Okt가 모두 준비된 뒤에만 200
+##
+## - SCORING_BACKEND=process: 점수 계산 프로세스 풀과 공유 메모리 카탈로그는 웹 워커마다 하나씩 생김
+##   -> WEB_CONCURRENCY를 지정하지 않으면 워커 1개(스레드로 동시 요청 처리)로 실행해 카탈로그 사본을 하나로 유지하고,
+##      풀 크기(SCORING_WORKERS=0)는 CPU 코어 수 / 워커 수로 정해 호스트 전체 점수 계산 프로세스가 코어 수를 넘지 않음
+##
+## 주의: 챗봇 대화 세션(AppComponents.sessions)은 워커 프로세스 메모리에 있으므로 workers > 1이면
+##       같은 user_id 요청이 같은 워커로 가도록(sticky) 라우팅해야 합니다.
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', f"0.0.0.0:{os.getenv('PORT', '5000')}")
+_process_scoring = os.getenv('SCORING_BACKEND', 'inline') == 'process'
+workers = int(os.getenv('WEB_CONCURRENCY', 1 if _process_scoring else multiprocessing.cpu_count()))
+# 앱 설정(RECOMMENDATION_SETTINGS['web_workers'])이 실제 워커 수로 점수 계산 풀 크기를 나누도록 전달
+os.environ['WEB_CONCURRENCY'] = str(workers)
+# 점수 계산은 numpy(GIL 해제), 챗봇은 OpenAI 응답 대기가 대부분이므로 스레드 워커 사용
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+preload_app = True
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+accesslog = os.getenv('GUNICORN_ACCESS_LOG') or None
+errorlog = '-'
+loglevel = os.getenv('LOG_LEVEL', 'info').lower()
+
+
+def when_ready(server):
+    """preload된 앱으로 master에서 카탈로그를 만든 뒤, 이후 GC가 공유 페이지를 건드리지 않도록 고정"""
+    import app as app_module
+    if app_module.preload_models():
+        server.log.info("카탈로그 미리 불러오기 완료 (워커 fork 전)")
+    else:
+        server.log.warning("카탈로그 미리 불러오기 실패 - 워커에서 다시 시도합니다.")
+    # 지금까지 만든 객체를 GC 추적 대상에서 제외해 fork 후 refcount/GC로 인한 페이지 복사를 줄임
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    import app as app_module
+    app_module.warm_up_worker()
+    server.log.info("워커 %s 초기화 완료", worker.pid)
@@ -0,0 +1,5 @@
+## 요청 로그 요약, 단계별 소요 시간 측정 및 메트릭 수집
+from .request_log import RequestLog, request_scope, current_request, stage, timed, log_payload, payload_logging_enabled
+from .metrics import REGISTRY
+__all__ = ['RequestLog', 'request_scope', 'current_request', 'stage', 'timed', 'log_payload',
+           'payload_logging_enabled', 'REGISTRY']
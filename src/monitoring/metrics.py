@@ -0,0 +1,158 @@
+## 지연 시간 히스토그램/카운터 수집 및 Prometheus 텍스트 포맷 출력
+## 비활성화(METRICS_ENABLED=false) 시 기록 함수는 플래그 확인 후 바로 반환합니다.
+import threading
+from typing import Callable, Dict, Iterable, Tuple
+from config.settings import METRICS_SETTINGS
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _format_labels(labelnames: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+class Counter:
+    """단조 증가 카운터"""
+
+    def __init__(self, registry, name: str, help_text: str, labelnames: Iterable[str] = ()):
+        self._registry = registry
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        if not self._registry.enabled:
+            return
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        return self._values.get(key, 0)
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return '\n'.join(lines)
+
+
+class Histogram:
+    """고정 버킷 히스토그램 (초 단위 지연 시간용)"""
+
+    def __init__(self, registry, name: str, help_text: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self._registry = registry
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # labels -> [버킷별 개수, 합계, 개수]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        if not self._registry.enabled:
+            return
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for idx, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][idx] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (bucket_counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                inf_labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{inf_labels} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return '\n'.join(lines)
+
+
+class CallbackGauge:
+    """출력 시점에 콜백을 호출해 값을 읽는 게이지 (캐시 크기, 적중률 등)"""
+
+    def __init__(self, name: str, help_text: str, callback: Callable[[], Dict[Tuple[str, ...], float]],
+                 labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = tuple(labelnames)
+        self._callback = callback
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        try:
+            values = self._callback() or {}
+        except Exception:
+            values = {}
+        for key, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value}")
+        return '\n'.join(lines)
+
+
+class MetricsRegistry:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, name: str, factory):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = factory()
+            return self._metrics[name]
+
+    def counter(self, name: str, help_text: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(name, lambda: Counter(self, name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Iterable[str] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(name, lambda: Histogram(self, name, help_text, labelnames, buckets))
+
+    def gauge_callback(self, name: str, help_text: str, callback, labelnames: Iterable[str] = ()) -> CallbackGauge:
+        """같은 이름으로 다시 등록하면 콜백을 교체합니다. (인스턴스 재생성 대비)"""
+        gauge = CallbackGauge(name, help_text, callback, labelnames)
+        with self._lock:
+            self._metrics[name] = gauge
+        return gauge
+
+    def render(self) -> str:
+        """Prometheus 텍스트 포맷 (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+REGISTRY = MetricsRegistry(enabled=METRICS_SETTINGS['enabled'])
+
+STAGE_SECONDS = REGISTRY.histogram(
+    'forest_stage_duration_seconds', '단계별 소요 시간 (DB 조회, 전처리, 점수 계산, LLM 호출 등)', ['stage'])
+STAGE_ERRORS = REGISTRY.counter(
+    'forest_stage_errors_total', '예외로 끝난 단계 수', ['stage'])
+REQUEST_SECONDS = REGISTRY.histogram(
+    'forest_request_duration_seconds', '엔드포인트별 요청 처리 시간', ['endpoint'])
+REQUESTS_TOTAL = REGISTRY.counter(
+    'forest_requests_total', '엔드포인트/상태 코드별 요청 수', ['endpoint', 'status'])
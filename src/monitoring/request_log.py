@@ -0,0 +1,123 @@
+## 요청 단위 로그 요약
+## 요청마다 단계별 소요 시간을 모아 두었다가 요청 종료 시 한 줄로 기록합니다.
+## 프로필/대화 내역/추천 목록 같은 큰 로그는 DEBUG 레벨이거나 샘플링된 요청에서만 남깁니다.
+## 단계별 소요 시간은 metrics 모듈의 히스토그램에도 함께 기록됩니다.
+import functools
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from config.settings import LOGGING_SETTINGS
+from .metrics import STAGE_SECONDS, STAGE_ERRORS, REQUEST_SECONDS, REQUESTS_TOTAL
+
+_logger = logging.getLogger('forest.request')
+_current_request = ContextVar('forest_request_log', default=None)
+
+
+class RequestLog:
+    """한 요청의 요약 정보(필드, 단계별 소요 시간)를 모으는 객체"""
+
+    def __init__(self, endpoint: str, payload_sample_rate: float = None):
+        if payload_sample_rate is None:
+            payload_sample_rate = LOGGING_SETTINGS['payload_sample_rate']
+        self.endpoint = endpoint
+        self.sampled = payload_sample_rate > 0 and random.random() < payload_sample_rate
+        self.fields = {}
+        self.stages = {}
+        self._start = time.perf_counter()
+
+    def set(self, **fields) -> None:
+        """요약 줄에 포함할 필드 추가 (user_id, 결과 개수 등)"""
+        self.fields.update(fields)
+
+    def elapsed(self) -> float:
+        """요청 시작 후 지난 시간 (초)"""
+        return time.perf_counter() - self._start
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def finish(self, status) -> None:
+        """요청 요약을 한 줄로 기록합니다."""
+        elapsed = time.perf_counter() - self._start
+        REQUEST_SECONDS.observe(elapsed, endpoint=self.endpoint)
+        REQUESTS_TOTAL.inc(endpoint=self.endpoint, status=status)
+
+        total_ms = elapsed * 1000
+        stages = ' '.join(f"{name}_ms={seconds * 1000:.1f}" for name, seconds in self.stages.items())
+        fields = ' '.join(f"{key}={value}" for key, value in self.fields.items())
+        _logger.info("endpoint=%s status=%s total_ms=%.1f %s %s",
+                     self.endpoint, status, total_ms, fields, stages)
+
+
+@contextmanager
+def request_scope(endpoint: str):
+    """
+    with 블록 동안 현재 요청의 RequestLog를 설정하고, 종료 시 요약 줄을 남깁니다.
+    상태값은 블록 안에서 log.set(status=...)으로 지정할 수 있습니다.
+    """
+    log = RequestLog(endpoint)
+    token = _current_request.set(log)
+    status = 'error'
+    try:
+        yield log
+        status = log.fields.pop('status', 'ok')
+    finally:
+        _current_request.reset(token)
+        log.finish(status)
+
+
+def current_request() -> Optional[RequestLog]:
+    """현재 처리 중인 요청의 RequestLog (요청 밖이면 None)"""
+    return _current_request.get()
+
+
+@contextmanager
+def stage(name: str):
+    """블록의 소요 시간을 현재 요청의 단계별 시간과 단계별 히스토그램에 더합니다."""
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=name)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=name)
+        log = _current_request.get()
+        if log is not None:
+            log.add_stage(name, elapsed)
+
+
+def timed(name: str):
+    """함수 전체를 stage(name)으로 감싸는 데코레이터"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def payload_logging_enabled(logger: logging.Logger) -> bool:
+    """큰 페이로드 로그를 남길지 여부 (DEBUG 레벨이거나 샘플링된 요청)"""
+    if logger.isEnabledFor(logging.DEBUG):
+        return True
+    log = _current_request.get()
+    return log is not None and log.sampled
+
+
+def log_payload(logger: logging.Logger, msg: str, *args) -> None:
+    """
+    페이로드 로그 기록. DEBUG 레벨에서는 DEBUG로, 샘플링된 요청에서는 INFO로 남기고
+    그 외에는 메시지 포맷팅 없이 버립니다.
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(msg, *args)
+        return
+    log = _current_request.get()
+    if log is not None and log.sampled:
+        logger.info(msg, *args)
@@ -1,3 +1,13 @@
 ## 추천 알고리즘 패키지 초기화
-from .recommendation import RecommendationAlgorithm, ContentType
-__all__ = ['RecommendationAlgorithm', 'ContentType']
\ No newline at end of file
+## 하위 모듈(scoring_pool 등)만 필요한 프로세스가 sklearn/DB 모듈까지 불러오지 않도록 지연 import
+__all__ = ['RecommendationAlgorithm', 'ContentType']
+
+
+def __getattr__(name):
+    if name == 'RecommendationAlgorithm':
+        from .recommendation import RecommendationAlgorithm
+        return RecommendationAlgorithm
+    if name == 'ContentType':
+        from .preprocessor import ContentType
+        return ContentType
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,161 @@
+## TF-IDF용 한국어 형태소 정규화 analyzer
+## '감동적인', '감동적' 같은 활용/조사 붙은 형태를 같은 토큰으로 묶어 1000개 특성 한도 안의 중복 어휘를 줄입니다.
+## 형태소 분석은 어절(surface) 단위로 한 번만 하고 결과를 캐시하므로 카탈로그를 다시 만들어도 새 어절만 분석합니다.
+import json
+import logging
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+_WORD_PATTERN = re.compile(r"(?u)\b\w+\b")
+_HANGUL = re.compile(r"[가-힣]")
+
+# Okt 품사 중 토큰으로 남길 품사 (조사, 어미, 접미사, 구두점 등은 제외)
+_KEEP_POS = {'Noun', 'Verb', 'Adjective', 'Adverb', 'Alpha', 'Number', 'Foreign', 'Hashtag'}
+
+# rules 방식에서 떼어낼 조사/어미/접미사 (긴 것부터 확인)
+_SUFFIXES = sorted([
+    '에서는', '에게서', '으로서', '으로써', '이라는', '스러운', '스럽게', '적으로', '했던', '하는', '하고',
+    '에서', '에게', '으로', '부터', '까지', '처럼', '보다', '이랑', '라는', '적인', '적임', '스런', '했다', '한다',
+    '은', '는', '이', '가', '을', '를', '의', '에', '와', '과', '도', '만', '로', '인', '한', '적',
+], key=len, reverse=True)
+
+
+def _strip_suffix(word: str) -> str:
+    """한글 어절 끝의 조사/어미를 한 번 떼어냅니다. (어간이 한글 2자 이상 남을 때만)"""
+    if not _HANGUL.search(word):
+        return word
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 2:
+            return word[:-len(suffix)]
+    return word
+
+
+class KoreanAnalyzer:
+    """
+    TfidfVectorizer(analyzer=...)에 넣는 callable. 텍스트 -> 정규화된 토큰의 1~ngram_max-gram 목록
+
+    Args:
+        backend: 'okt'(KoNLPy Okt 형태소 분석, 처음 사용할 때 JVM 시작) 또는 'rules'(조사/어미 접미사 제거, JVM 없음)
+        ngram_max: 최대 n-gram 길이 (기존 ngram_range=(1, 2)와 동일하게 2)
+        cache_path: 어절 -> 토큰 캐시를 저장/로드할 JSON 파일 경로 (비우면 메모리에만 유지)
+        cache_maxsize: 캐시할 최대 어절 수
+    """
+
+    def __init__(self, backend: str = 'okt', ngram_max: int = 2, cache_path: str = '',
+                 cache_maxsize: int = 200000):
+        if backend not in ('okt', 'rules'):
+            raise ValueError(f"알 수 없는 analyzer backend: {backend}")
+        self.backend = backend
+        self.ngram_max = ngram_max
+        self.cache_path = cache_path
+        self.cache_maxsize = cache_maxsize
+        self._logger = logging.getLogger(__name__)
+        self._cache: Dict[str, Tuple[str, ...]] = {}
+        self._dirty = False
+        self._okt = None
+        self._okt_failed = False
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if cache_path:
+            self._load()
+
+    # vectorizer와 함께 pickle될 때 Okt(JVM 객체)와 lock은 제외
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_okt'] = None
+        state['_lock'] = None
+        state['_logger'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+
+    def __call__(self, text: str) -> List[str]:
+        tokens = []
+        for word in _WORD_PATTERN.findall(text.lower()):
+            tokens.extend(self._normalize_word(word))
+        features = list(tokens)
+        for n in range(2, self.ngram_max + 1):
+            features.extend(' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1))
+        return features
+
+    def _normalize_word(self, word: str) -> Tuple[str, ...]:
+        cached = self._cache.get(word)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+        tokens = self._analyze(word)
+        if len(self._cache) < self.cache_maxsize:
+            self._cache[word] = tokens
+            self._dirty = True
+        return tokens
+
+    def _analyze(self, word: str) -> Tuple[str, ...]:
+        if not _HANGUL.search(word):
+            return (word,)
+        if self.backend == 'okt':
+            okt = self._get_okt()
+            if okt is not None:
+                with self._lock:
+                    pos = okt.pos(word, norm=True, stem=True)
+                tokens = tuple(token.lower() for token, tag in pos if tag in _KEEP_POS)
+                return tokens or (word,)
+        return (_strip_suffix(word),)
+
+    def _get_okt(self):
+        """KeywordExtractor와 같은 방식으로 처음 사용할 때 Okt 생성. konlpy가 없으면 rules 방식으로 대체"""
+        if self._okt is None and not self._okt_failed:
+            with self._lock:
+                if self._okt is None and not self._okt_failed:
+                    try:
+                        from konlpy.tag import Okt
+                        self._okt = Okt()
+                    except Exception as e:
+                        self._okt_failed = True
+                        self._logger.error("Okt 초기화 실패 - 접미사 제거 방식으로 대체합니다: %s", e)
+        return self._okt
+
+    def stats(self) -> Dict[str, float]:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._cache),
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def _load(self) -> None:
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('backend') != self.backend:
+                self._logger.info("토큰 캐시 backend가 달라 사용하지 않습니다. (%s != %s)", data.get('backend'), self.backend)
+                return
+            self._cache = {word: tuple(tokens) for word, tokens in data.get('tokens', {}).items()}
+            self._logger.info("토큰 캐시 로드: %d개 어절", len(self._cache))
+        except (OSError, ValueError) as e:
+            self._logger.error("토큰 캐시 로드 실패: %s", e)
+
+    def save(self) -> Optional[str]:
+        """새로 분석한 어절이 있으면 캐시 파일에 저장 (임시 파일에 쓴 뒤 교체)"""
+        if not self.cache_path or not self._dirty:
+            return None
+        try:
+            tmp_path = f"{self.cache_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'backend': self.backend, 'tokens': self._cache}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+            self._dirty = False
+            self._logger.info("토큰 캐시 저장: %d개 어절", len(self._cache))
+            return self.cache_path
+        except OSError as e:
+            self._logger.error("토큰 캐시 저장 실패: %s", e)
+            return None
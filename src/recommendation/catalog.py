@@ -0,0 +1,174 @@
+## 컬럼형 카탈로그 스냅샷
+## 아이템별 딕셔너리 대신 activity_id/컨텐츠 타입/장르를 병렬 NumPy 배열로, 벡터는 하나의 CSR 행렬로 보관합니다.
+## 점수 계산 결과(행 인덱스)는 activity_ids 배열에서 한 번에 꺼내 ID로 바꿉니다.
+import hashlib
+import json
+import sys
+from datetime import datetime
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from recommendation.filters import AttributeBitsets
+from recommendation.preprocessor import ContentType
+from recommendation.search import SearchIndex
+from recommendation.text_normalizer import split_list
+
+
+class Catalog:
+    """
+    추천에 사용하는 아이템 카탈로그 (update_interval마다 새로 만들어 참조를 교체하는 불변 스냅샷)
+
+    Attributes:
+        activity_ids: (N,) int64, 행 -> activity_id
+        content_types: (N,) int8, 행 -> type_names 인덱스
+        type_names: 컨텐츠 타입 문자열 목록 (ContentType 값 순서)
+        genre_codes: (N,) int32, 행 -> genres 인덱스 (장르 문자열은 한 번만 저장)
+        genres: 장르 문자열 목록 (0번은 빈 문자열)
+        titles: 행 -> 제목 (로그/디버깅용)
+        vector: (N, 특성 수) CSR 행렬
+        vocabulary: 장르/키워드 어휘 (중복 제거, 챗봇 로컬 키워드 추출용)
+        bitsets: 컨텐츠 타입/장르별 행 비트셋 (추천 필터)
+        search_index: 제목/장르/키워드 역색인 (검색)
+    """
+
+    def __init__(self, activity_ids: np.ndarray, content_types: np.ndarray, genre_codes: np.ndarray,
+                 genres: List[str], titles: List[str], vector: sp.csr_matrix, vectorizer,
+                 vectorizer_version: int, version: int = 0):
+        self.activity_ids = activity_ids
+        self.content_types = content_types
+        self.type_names = tuple(ContentType.get_valid_types())
+        self.genre_codes = genre_codes
+        self.genres = genres
+        self.titles = titles
+        self.vector = vector
+        self.vectorizer = vectorizer
+        self.vectorizer_version = vectorizer_version
+        self.version = version
+        self.last_updated = datetime.now()
+
+        # 카탈로그 갱신 시 채워지는 값
+        self.neighbor_rows = None
+        self.neighbor_sims = None
+        self.popularity = {}
+        self.vocabulary = ()
+        self.search_index = None
+        self.snapshot_id = None  # 공유 디렉터리 스냅샷에서 불러왔거나 배포한 경우 그 ID (노드 간 같은 카탈로그 식별)
+        self._fingerprint = None
+
+        # activity_id -> 행 조회용 (정렬된 ID 배열 + 이진 탐색, dict보다 메모리가 작음)
+        self._id_order = np.argsort(activity_ids, kind='stable')
+        self._sorted_ids = activity_ids[self._id_order]
+
+        # 컨텐츠 타입/장르 필터용 비트셋 (스냅샷에서 불러올 때도 배열로부터 다시 만듦)
+        self.bitsets = AttributeBitsets(content_types, self.type_names, genre_codes, genres)
+
+    @classmethod
+    def from_rows(cls, items: Sequence[Dict[str, Any]], rows: Sequence[int], vector: sp.csr_matrix,
+                  vectorizer, vectorizer_version: int, version: int = 0) -> 'Catalog':
+        """
+        DB 조회 결과와 전처리 결과로 카탈로그를 만듭니다.
+
+        Args:
+            items: DB 조회 결과 (activity_id, title, content_type, genre_nm/genre 포함)
+            rows: vector의 각 행에 해당하는 items 인덱스 (텍스트가 없어 제외된 아이템은 빠져 있음)
+            vector: 전처리 결과 벡터 행렬 (len(rows) x 특성 수)
+        """
+        type_index = {name: code for code, name in enumerate(ContentType.get_valid_types())}
+        genre_index = {'': 0}
+        n_rows = len(rows)
+        activity_ids = np.empty(n_rows, dtype=np.int64)
+        content_types = np.empty(n_rows, dtype=np.int8)
+        genre_codes = np.empty(n_rows, dtype=np.int32)
+        titles = []
+        vocabulary = set()
+        row_genres, row_keywords = [], []
+        for row, item_idx in enumerate(rows):
+            item = items[item_idx]
+            activity_ids[row] = item['activity_id']
+            content_types[row] = type_index.get(item.get('content_type'), -1)
+            genre = item.get('genre_nm') or item.get('genre') or ''
+            genre_codes[row] = genre_index.setdefault(sys.intern(str(genre)), len(genre_index))
+            titles.append(item.get('title') or '')
+            genre_terms, keyword_terms = split_list(genre), split_list(item.get('keywords'))
+            row_genres.append(genre_terms)
+            row_keywords.append(keyword_terms)
+            for term in genre_terms + keyword_terms:
+                term = term.strip().lower()
+                if 2 <= len(term) <= 20:
+                    vocabulary.add(term)
+        catalog = cls(activity_ids, content_types, genre_codes, list(genre_index), titles,
+                      sp.csr_matrix(vector), vectorizer, vectorizer_version, version)
+        catalog.vocabulary = tuple(sorted(vocabulary))
+        catalog.search_index = SearchIndex.build(titles, row_genres, row_keywords)
+        return catalog
+
+    def __len__(self) -> int:
+        return self.activity_ids.size
+
+    def ids_for(self, rows) -> List[int]:
+        """행 인덱스 배열 -> activity_id 리스트"""
+        return self.activity_ids[np.asarray(rows, dtype=np.int64)].tolist()
+
+    def rows_for(self, activity_ids) -> np.ndarray:
+        """activity_id 배열 -> 행 인덱스 배열 (카탈로그에 없는 ID는 -1)"""
+        activity_ids = np.asarray(activity_ids, dtype=np.int64)
+        if self._sorted_ids.size == 0:
+            return np.full(activity_ids.shape, -1, dtype=np.int64)
+        pos = np.searchsorted(self._sorted_ids, activity_ids)
+        pos = np.minimum(pos, self._sorted_ids.size - 1)
+        found = self._sorted_ids[pos] == activity_ids
+        return np.where(found, self._id_order[pos], -1)
+
+    def row_for(self, activity_id: int) -> int:
+        return int(self.rows_for([activity_id])[0])
+
+    def neighbors(self, row: int) -> Tuple[np.ndarray, np.ndarray]:
+        """행의 유사 아이템 (이웃 행 인덱스, 유사도). 이웃 테이블 한 줄을 자르기만 하므로 O(M), 유사도 내림차순"""
+        if self.neighbor_rows is None:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        rows = self.neighbor_rows[row]
+        filled = int(np.count_nonzero(rows >= 0))  # 빈 칸(-1)은 항상 뒤쪽
+        return rows[:filled], self.neighbor_sims[row, :filled]
+
+    def content_type(self, row: int) -> str:
+        code = int(self.content_types[row])
+        return self.type_names[code] if code >= 0 else ''
+
+    def genre(self, row: int) -> str:
+        return self.genres[self.genre_codes[row]]
+
+    def type_counts(self) -> Dict[str, int]:
+        counts = np.bincount(self.content_types[self.content_types >= 0], minlength=len(self.type_names))
+        return {name: int(count) for name, count in zip(self.type_names, counts)}
+
+    def fingerprint(self) -> str:
+        """
+        카탈로그 내용(아이템, 벡터, 인기 목록)의 지문. version은 프로세스마다 0부터 세는 값이라 워커/노드 간에
+        다른 카탈로그를 같은 번호로 가리킬 수 있으므로, 프로세스 밖으로 나가는 값(페이지 커서)에는 이 값을 씁니다.
+        같은 내용이면 어느 워커/노드(스냅샷을 불러온 노드 포함)에서 계산해도 같은 값입니다.
+        (인기 목록까지 채운 뒤 처음 호출해야 하며, 결과는 보관)
+        """
+        if self._fingerprint is None:
+            digest = hashlib.sha1()
+            for array in (self.activity_ids, self.content_types, self.genre_codes,
+                          self.vector.indptr, self.vector.indices, self.vector.data):
+                digest.update(np.ascontiguousarray(array).tobytes())
+            digest.update(json.dumps(self.popularity, sort_keys=True, default=str).encode('utf-8'))
+            self._fingerprint = digest.hexdigest()[:16]
+        return self._fingerprint
+
+    def nbytes(self) -> int:
+        """배열/행렬과 제목/장르 문자열이 차지하는 대략적인 메모리 (byte)"""
+        arrays = [self.activity_ids, self.content_types, self.genre_codes, self._id_order, self._sorted_ids,
+                  self.vector.data, self.vector.indices, self.vector.indptr]
+        if self.neighbor_rows is not None:
+            arrays += [self.neighbor_rows, self.neighbor_sims]
+        total = sum(array.nbytes for array in arrays) + self.bitsets.nbytes()
+        if self.search_index is not None:
+            total += self.search_index.nbytes()
+        total += sum(sys.getsizeof(title) for title in self.titles) + sys.getsizeof(self.titles)
+        total += sum(sys.getsizeof(genre) for genre in self.genres)
+        total += sum(sys.getsizeof(term) for term in self.vocabulary)
+        return total
@@ -0,0 +1,121 @@
+## 추천 대상 필터 (컨텐츠 타입, 장르, 이미 리뷰한 아이템)
+## 카탈로그를 만들 때 속성값별 비트셋(행 수 / 8 byte)을 만들어 두고, 요청 시 필터 조건의 비트셋을 OR/AND로 합친
+## 불리언 마스크를 점수 배열에 적용한 뒤 상위 K를 고릅니다. (점수 계산 후 Python에서 걸러내지 않음)
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from recommendation.text_normalizer import split_list
+
+
+@dataclass(frozen=True)
+class ItemFilter:
+    """
+    추천 대상 제한 조건. 같은 종류 안에서는 OR, 종류끼리는 AND
+    (해시 가능하므로 single-flight/순위 목록 캐시 키에 그대로 사용)
+    """
+    content_types: Tuple[str, ...] = ()
+    genres: Tuple[str, ...] = ()
+    exclude_reviewed: bool = False
+
+    @classmethod
+    def create(cls, content_types=None, genres=None, exclude_reviewed: bool = False,
+               valid_types: Sequence[str] = ()) -> 'ItemFilter':
+        """
+        요청 값(문자열 또는 리스트)을 정규화합니다.
+
+        Raises:
+            ValueError: valid_types에 없는 컨텐츠 타입
+        """
+        content_types = tuple(sorted({value.strip().lower() for value in _as_list(content_types) if value.strip()}))
+        unknown = [value for value in content_types if valid_types and value not in valid_types]
+        if unknown:
+            raise ValueError(f"알 수 없는 content_type: {', '.join(unknown)}")
+        genres = tuple(sorted({value.strip().lower() for value in _as_list(genres) if value.strip()}))
+        return cls(content_types, genres, bool(exclude_reviewed))
+
+    def __bool__(self) -> bool:
+        return bool(self.content_types or self.genres or self.exclude_reviewed)
+
+    def __str__(self) -> str:
+        # 요청 요약 로그용 (공백 없이 한 필드로)
+        parts = []
+        if self.content_types:
+            parts.append('type:' + '|'.join(self.content_types))
+        if self.genres:
+            parts.append('genre:' + '|'.join(self.genres))
+        if self.exclude_reviewed:
+            parts.append('exclude_reviewed')
+        return ','.join(parts) or '-'
+
+
+NO_FILTER = ItemFilter()
+
+
+class AttributeBitsets:
+    """
+    카탈로그 행에 대한 속성값별 비트셋 (np.packbits, 행 순서)
+
+    Args:
+        content_types: (N,) 행 -> 컨텐츠 타입 코드
+        type_names: 코드 -> 컨텐츠 타입 이름
+        genre_codes: (N,) 행 -> genres 인덱스
+        genres: 장르 문자열 목록 ('드라마, 코미디'처럼 여러 장르가 한 문자열에 있을 수 있음)
+    """
+
+    def __init__(self, content_types: np.ndarray, type_names: Sequence[str],
+                 genre_codes: np.ndarray, genres: Sequence[str]):
+        self.n_rows = int(content_types.size)
+        self.types: Dict[str, np.ndarray] = {
+            name: np.packbits(content_types == code) for code, name in enumerate(type_names)
+        }
+
+        # 장르 문자열(코드)마다 포함된 장르 -> 장르별 (코드 수,) 불리언 표를 만든 뒤 genre_codes로 한 번에 펼침
+        code_terms = [{term.strip().lower() for term in split_list(genre) if term.strip()} for genre in genres]
+        self.genres: Dict[str, np.ndarray] = {}
+        for term in sorted(set().union(*code_terms)) if code_terms else ():
+            has_term = np.fromiter((term in terms for terms in code_terms), dtype=bool, count=len(code_terms))
+            self.genres[term] = np.packbits(has_term[genre_codes])
+
+    def mask(self, item_filter: ItemFilter, exclude_rows: Iterable[int] = ()) -> Optional[np.ndarray]:
+        """
+        조건에 맞는 행의 불리언 마스크 (N,). 조건이 없으면 None
+        알 수 없는 장르는 어떤 행과도 일치하지 않습니다.
+        """
+        exclude_rows = np.asarray(list(exclude_rows), dtype=np.int64)
+        exclude_rows = exclude_rows[exclude_rows >= 0]
+        if not item_filter.content_types and not item_filter.genres and exclude_rows.size == 0:
+            return None
+
+        bits = np.full((self.n_rows + 7) // 8, 0xFF, dtype=np.uint8)
+        if item_filter.content_types:
+            bits &= self._union(self.types.get(name) for name in item_filter.content_types)
+        if item_filter.genres:
+            bits &= self._union(self.genres.get(term) for term in self._genre_terms(item_filter.genres))
+        allowed = np.unpackbits(bits, count=self.n_rows).astype(bool)
+        allowed[exclude_rows] = False
+        return allowed
+
+    def _genre_terms(self, genres: Sequence[str]) -> List[str]:
+        """'로맨스'가 '멜로/로맨스'에도 일치하도록 '/'로 나뉜 이름도 비교"""
+        return [term for term in self.genres if any(genre == term or genre in term.split('/') for genre in genres)]
+
+    def _union(self, bitsets) -> np.ndarray:
+        result = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for bitset in bitsets:
+            if bitset is not None:
+                result |= bitset
+        return result
+
+    def nbytes(self) -> int:
+        return sum(bitset.nbytes for bitset in self.types.values()) + \
+            sum(bitset.nbytes for bitset in self.genres.values())
+
+
+def _as_list(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return split_list(value)
+    return [str(v) for v in value]
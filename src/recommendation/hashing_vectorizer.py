@@ -0,0 +1,103 @@
+## 학습(fit) 없는 feature hashing 벡터화
+## 어휘 사전 대신 토큰 해시로 고정 차원(n_features)에 매핑하므로 새 키워드가 들어와도 전체 재학습이 필요 없고,
+## 아이템/사용자를 서로 독립적으로(여러 스레드에서 동시에, 들어오는 순서대로) 벡터화할 수 있습니다.
+## IDF는 문서 빈도(df) 배열을 아이템이 들어올 때마다(partial_fit) 더해 유지하고 아이템 쪽에만 적용합니다.
+## (사용자 벡터는 IDF와 무관하므로 카탈로그가 바뀌어도 사용자 벡터 캐시가 그대로 유효합니다)
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+
+
+class HashingTextVectorizer:
+    """
+    부호 있는 feature hashing + 점진적으로 유지하는 IDF
+
+    Args:
+        n_features: 해시 차원 수 (충돌 확률과 메모리의 절충)
+        analyzer: 토큰화 callable (None이면 TfidfVectorizer 모드와 같은 정규식 단어 + (1, 2)-gram)
+        use_idf: False이면 아이템 벡터도 단순 빈도(L2 정규화)만 사용
+    """
+
+    def __init__(self, n_features: int = 2 ** 18, analyzer=None, use_idf: bool = True):
+        self.n_features = n_features
+        self.use_idf = use_idf
+        if analyzer is not None:
+            self._hasher = HashingVectorizer(n_features=n_features, analyzer=analyzer,
+                                             alternate_sign=True, norm=None)
+        else:
+            self._hasher = HashingVectorizer(n_features=n_features, lowercase=True, ngram_range=(1, 2),
+                                             token_pattern=r"(?u)\b\w+\b", alternate_sign=True, norm=None)
+        self.df = np.zeros(n_features, dtype=np.int64)
+        self.n_docs = 0
+
+    def hash(self, texts: Iterable[str]) -> sp.csr_matrix:
+        """텍스트 -> 해시 특성 빈도 행렬 (상태를 바꾸지 않으므로 여러 스레드/프로세스에서 동시에 호출 가능)"""
+        return self._hasher.transform(texts).tocsr()
+
+    def transform(self, texts: Iterable[str]) -> sp.csr_matrix:
+        """사용자 쪽 변환: 해시 빈도를 L2 정규화 (IDF 미적용)"""
+        return _l2_normalize(self.hash(texts))
+
+    def partial_fit(self, counts: sp.csr_matrix) -> None:
+        """새로 들어온 아이템들의 해시 빈도 행렬을 문서 빈도에 더합니다."""
+        self.set_document_frequency(*self.updated_document_frequency(added=counts))
+
+    def partial_unfit(self, counts: sp.csr_matrix) -> None:
+        """삭제되었거나 내용이 바뀐 아이템들의 (이전) 해시 빈도 행렬을 문서 빈도에서 뺍니다."""
+        self.set_document_frequency(*self.updated_document_frequency(removed=counts))
+
+    def updated_document_frequency(self, added: Optional[sp.csr_matrix] = None,
+                                   removed: Optional[sp.csr_matrix] = None) -> Tuple[np.ndarray, int]:
+        """
+        추가/제거 아이템을 반영한 (문서 빈도, 문서 수)를 새 배열로 계산합니다. 현재 상태는 바꾸지 않으므로
+        호출 쪽에서 다른 계산까지 모두 성공한 뒤 set_document_frequency로 한 번에 반영합니다.
+        """
+        df, n_docs = self.df.copy(), self.n_docs
+        if added is not None and added.shape[0]:
+            df += self._document_frequency(added)
+            n_docs += added.shape[0]
+        if removed is not None and removed.shape[0]:
+            df -= self._document_frequency(removed)
+            n_docs -= removed.shape[0]
+        return df, n_docs
+
+    def set_document_frequency(self, df: np.ndarray, n_docs: int) -> None:
+        self.df = df
+        self.n_docs = n_docs
+
+    def reset(self) -> None:
+        self.df[:] = 0
+        self.n_docs = 0
+
+    def _document_frequency(self, counts: sp.csr_matrix) -> np.ndarray:
+        # 행마다 열 인덱스가 한 번씩만 나오므로 (CSR, 중복 합산된 상태) 열별 등장 행 수 = bincount
+        counts = sp.csr_matrix(counts)
+        counts.sum_duplicates()
+        nonzero = counts.indices[counts.data != 0]
+        return np.bincount(nonzero, minlength=self.n_features)
+
+    def idf(self, df: Optional[np.ndarray] = None, n_docs: Optional[int] = None) -> np.ndarray:
+        """TfidfVectorizer(smooth_idf=True)와 같은 식: ln((1 + n) / (1 + df)) + 1 (인자가 없으면 현재 문서 빈도 기준)"""
+        if df is None:
+            df, n_docs = self.df, self.n_docs
+        return np.log((1 + n_docs) / (1 + df)) + 1.0
+
+    def weight(self, counts: sp.csr_matrix, idf: Optional[np.ndarray] = None) -> sp.csr_matrix:
+        """아이템 쪽 변환: 해시 빈도 x IDF 후 L2 정규화"""
+        counts = sp.csr_matrix(counts, dtype=np.float64, copy=True)
+        if self.use_idf:
+            if idf is None:
+                idf = self.idf()
+            counts.data *= idf[counts.indices]
+        return _l2_normalize(counts)
+
+
+def _l2_normalize(matrix: sp.csr_matrix) -> sp.csr_matrix:
+    matrix = sp.csr_matrix(matrix, dtype=np.float64)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    matrix.data /= np.repeat(norms, np.diff(matrix.indptr))
+    return matrix
+
@@ -0,0 +1,55 @@
+## 추천 목록 페이지네이션
+## 첫 페이지에서 긴 순위 목록(ranked_list_size)을 한 번 계산해 (user_id, 선호도 지문, 카탈로그 지문) 키로 캐시하고,
+## 다음 페이지는 커서에 담긴 키로 캐시된 목록을 자르기만 합니다. (무한 스크롤에서 점수 계산은 첫 페이지 한 번)
+import base64
+import hashlib
+import json
+from typing import Any, Dict
+
+from recommendation.filters import ItemFilter, NO_FILTER
+
+
+def user_fingerprint(raw_user_data: Dict[str, Any]) -> str:
+    """선호도 조회 결과의 지문 (선호도가 바뀌면 다른 값 -> 캐시된 목록을 쓰지 않음)"""
+    payload = json.dumps(raw_user_data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def encode_cursor(user_id, fingerprint: str, catalog_id: str, offset: int,
+                  item_filter: ItemFilter = NO_FILTER) -> str:
+    """
+    다음 페이지 커서 (클라이언트는 내용을 해석하지 않고 그대로 돌려보냄, 필터 조건도 커서에 포함)
+    catalog_id는 Catalog.fingerprint() (다른 워커/노드에서도 같은 카탈로그만 같은 값)
+    """
+    position = {'u': str(user_id), 'f': fingerprint, 'c': catalog_id, 'o': offset}
+    if item_filter:
+        position['q'] = [list(item_filter.content_types), list(item_filter.genres), item_filter.exclude_reviewed]
+    payload = json.dumps(position, ensure_ascii=False, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, user_id) -> Dict[str, Any]:
+    """
+    커서 -> {'fingerprint', 'catalog_id', 'offset', 'item_filter'}
+
+    Raises:
+        ValueError: 형식이 잘못되었거나 다른 사용자의 커서
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        position = {
+            'fingerprint': str(payload['f']),
+            'catalog_id': str(payload['c']),
+            'offset': int(payload['o']),
+            'item_filter': NO_FILTER
+        }
+        if 'q' in payload:
+            content_types, genres, exclude_reviewed = payload['q']
+            position['item_filter'] = ItemFilter(tuple(content_types), tuple(genres), bool(exclude_reviewed))
+        owner = str(payload['u'])
+    except Exception:
+        raise ValueError("유효하지 않은 cursor입니다.")
+    if owner != str(user_id) or position['offset'] < 0:
+        raise ValueError("유효하지 않은 cursor입니다.")
+    return position
@@ -0,0 +1,70 @@
+## 콜드 스타트용 인기 목록
+## 선호도 데이터가 없는 사용자에게 카탈로그 갱신 시 미리 계산해둔 목록을 그대로 반환합니다.
+from typing import Dict, List, Any, Iterable, Sequence
+from recommendation.preprocessor import ContentType
+
+
+def build_popularity_lists(activity_ids: Sequence[int],
+                           content_types: Sequence[str],
+                           review_stats: Iterable[Dict[str, Any]],
+                           prior_count: int = 5,
+                           editorial_ids: List[int] = None) -> Dict[str, List[int]]:
+    """
+    리뷰 수/평균 평점으로 컨텐츠 타입별 인기 목록을 생성합니다.
+
+    리뷰 수가 적은 아이템의 평점이 과대평가되지 않도록 베이지안 평균을 사용합니다.
+        score = (v * R + m * C) / (v + m)
+        (v: 리뷰 수, R: 아이템 평균 평점, C: 전체 평균 평점, m: prior_count)
+
+    Args:
+        activity_ids: 카탈로그 행별 activity_id
+        content_types: 카탈로그 행별 컨텐츠 타입 (activity_ids와 같은 순서)
+        review_stats: activity_id, review_count, avg_rate를 가진 집계 결과
+        prior_count: 베이지안 평균의 사전 리뷰 수 (m)
+        editorial_ids: 운영자가 지정한 우선 노출 activity_id (전체 목록 맨 앞에 배치)
+
+    Returns:
+        Dict[str, List[int]]: 컨텐츠 타입별 activity_id 목록과, 타입을 번갈아 섞은 전체 목록('all')
+    """
+    stats = {}
+    for row in review_stats:
+        count = int(row.get('review_count') or 0)
+        if count > 0 and row.get('avg_rate') is not None:
+            stats[row['activity_id']] = (count, float(row['avg_rate']))
+
+    total_count = sum(count for count, _ in stats.values())
+    global_mean = (
+        sum(count * rate for count, rate in stats.values()) / total_count
+        if total_count else 0.0
+    )
+
+    scored_by_type = {}
+    for activity_id, content_type in zip(activity_ids, content_types):
+        activity_id = int(activity_id)
+        count, rate = stats.get(activity_id, (0, global_mean))
+        score = (count * rate + prior_count * global_mean) / (count + prior_count) if (count + prior_count) else 0.0
+        scored_by_type.setdefault(content_type, []).append((score, count, activity_id))
+
+    popularity = {}
+    for content_type, scored in scored_by_type.items():
+        # 점수 내림차순 -> 리뷰 수 내림차순 -> activity_id 오름차순
+        scored.sort(key=lambda x: (-x[0], -x[1], x[2]))
+        popularity[content_type] = [activity_id for _, _, activity_id in scored]
+
+    # 전체 목록: 운영자 지정 목록 + 컨텐츠 타입별 목록을 번갈아 배치
+    catalog_ids = {int(activity_id) for activity_id in activity_ids}
+    merged = [activity_id for activity_id in dict.fromkeys(editorial_ids or []) if activity_id in catalog_ids]
+    seen = set(merged)
+    type_order = ContentType.get_valid_types()
+    ranked_lists = [
+        popularity[content_type]
+        for content_type in sorted(popularity, key=lambda t: type_order.index(t) if t in type_order else len(type_order))
+    ]
+    for rank in range(max((len(ranked) for ranked in ranked_lists), default=0)):
+        for ranked in ranked_lists:
+            if rank < len(ranked) and ranked[rank] not in seen:
+                seen.add(ranked[rank])
+                merged.append(ranked[rank])
+    popularity['all'] = merged
+
+    return popularity
@@ -1,9 +1,17 @@
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 import numpy as np
+import scipy.sparse as sp
 from enum import Enum
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
 from sklearn.feature_extraction.text import TfidfVectorizer
+from recommendation.cache import LRUCache
+from recommendation.analyzer import KoreanAnalyzer
+from recommendation.hashing_vectorizer import HashingTextVectorizer
+from recommendation.text_normalizer import content_digest, extract_fields, normalize_rows
+from monitoring import log_payload, timed, stage
 
 class ContentTypeError(Exception):
     """컨텐츠 타입 관련 예외"""
@@ -26,63 +34,149 @@ class UserProfile:
     genre_preferences: Dict[ContentType, List[str]]  # 각 타입별 선호 장르
 
 class DataPreprocessor:
-    def __init__(self):
+    def __init__(self, user_vector_cache_size: int = 10000, text_workers: int = 0, text_chunk_size: int = 20000,
+                 text_analyzer: str = 'word', token_cache_path: str = '', vectorizer_mode: str = 'tfidf',
+                 hashing_features: int = 2 ** 18, hashing_idf: bool = True):
         self._logger = logging.getLogger(__name__)
-        self._vectorizer = TfidfVectorizer(
+        # word: 기존 정규식 토큰, okt/rules: 한국어 형태소 정규화 (어절별 분석 결과를 카탈로그 갱신 간에도 재사용)
+        self._analyzer = None
+        if text_analyzer != 'word':
+            self._analyzer = KoreanAnalyzer(backend=text_analyzer, ngram_max=2, cache_path=token_cache_path)
+        # hashing: 학습 없이 고정 차원으로 해시 (vectorizer가 바뀌지 않으므로 버전도 고정)
+        self._hashing = None
+        if vectorizer_mode == 'hashing':
+            self._hashing = HashingTextVectorizer(n_features=hashing_features, analyzer=self._analyzer,
+                                                  use_idf=hashing_idf)
+        elif vectorizer_mode != 'tfidf':
+            raise ValueError(f"알 수 없는 vectorizer_mode: {vectorizer_mode}")
+        # (vectorizer, 버전): 버전은 fit 할 때마다 증가. 요청 스레드가 둘을 따로 읽다가 중간에 교체되지 않도록
+        # 하나의 튜플로 보관하고 한 번의 대입으로 바꿉니다.
+        self._current = (self._hashing or self._create_vectorizer(), 1 if self._hashing is not None else 0)
+        self._is_fitted = self._hashing is not None  # vectorizer의 학습 여부 체크
+        # (vectorizer 버전, 정규화된 선호 토큰) -> 사용자 희소 벡터
+        self._user_vector_cache = LRUCache(user_vector_cache_size)
+        # (컨텐츠 타입, activity_id) -> (텍스트 컬럼 지문, 정규화된 텍스트). 바뀌지 않은 아이템은 다시 정규화하지 않음
+        self._text_cache = {}
+        # hashing 모드: (컨텐츠 타입, activity_id) -> (텍스트 지문, 문서 빈도에 반영된 해시 버킷 인덱스)
+        # 카탈로그 갱신 시 추가/변경/삭제된 아이템만 문서 빈도에 더하고 빼기 위해 보관
+        self._hashed_items = {}
+        self._text_workers = text_workers
+        self._text_chunk_size = text_chunk_size
+
+    def _create_vectorizer(self) -> TfidfVectorizer:
+        if self._analyzer is not None:
+            # callable analyzer가 소문자 변환과 (1, 2)-gram 생성까지 처리
+            return TfidfVectorizer(max_features=1000, analyzer=self._analyzer)
+        return TfidfVectorizer(
             max_features=1000,  # 차원 수 제한
             lowercase=True,     # 소문자 변환
             ngram_range=(1, 2),  # 단일 단어와 두 단어 조합 모두 사용
             token_pattern=r"(?u)\b\w+\b"
         )
-        self._is_fitted = False  # vectorizer의 학습 여부 체크
+
+    @property
+    def vectorizer_version(self) -> int:
+        return self._current[1]
+
+    def adopt_vectorizer(self, vectorizer) -> int:
+        """
+        다른 노드가 학습한 vectorizer(카탈로그 스냅샷)를 현재 vectorizer로 사용합니다.
+        tfidf는 버전을 올려 사용자 벡터 캐시를 무효화하고, 같은 차원의 hashing은 사용자 벡터가 같으므로 버전을 유지합니다.
+
+        Returns:
+            이 프로세스 기준 vectorizer 버전
+        """
+        same_hashing = (
+            self._hashing is not None
+            and isinstance(vectorizer, HashingTextVectorizer)
+            and vectorizer.n_features == self._hashing.n_features
+        )
+        version = self._current[1] if same_hashing else self._current[1] + 1
+        self._current = (vectorizer, version)
+        self._is_fitted = True
+        if not same_hashing:
+            self._logger.info("스냅샷 vectorizer 적용 (버전: %d)", version)
+        return version
+
+    def user_vector_cache_stats(self) -> Dict[str, Any]:
+        """사용자 벡터 캐시 적중률 통계"""
+        return self._user_vector_cache.stats()
+
+    def token_cache_stats(self) -> Optional[Dict[str, Any]]:
+        """형태소 토큰 캐시 통계 (word analyzer면 None)"""
+        return self._analyzer.stats() if self._analyzer is not None else None
         
-    def preprocess_items(self, items: List[Dict]) -> Optional[Dict]:
+    @timed('preprocess.items')
+    def preprocess_items(self, items: List[Dict], refit: bool = False) -> Optional[Dict]:
         """
         아이템 데이터 전처리
 
         Args:
             items: 전처리할 아이템 리스트
+            refit: True이면 새 vectorizer를 학습 (기존 vectorizer를 쓰는 요청에 영향 없음)
+
+        Returns:
+            rows(벡터 행마다 대응하는 items 인덱스, 텍스트가 없는 아이템은 제외), vector, vectorizer,
+            vectorizer_version(vector를 만든 vectorizer의 버전)을 담은 딕셔너리.
+            아이템별 텍스트/원본 복사본은 남기지 않습니다.
         """
         try:
-            processed_items = []
+            rows = []
             texts = []
 
-            for item in items:
-                processed_text = self._preprocess_text(item)
-                if processed_text:
-                    texts.append(processed_text)
-                    processed_items.append({
-                        'activity_id': item.get('activity_id'),
-                        'title': item.get('title'),
-                        'genre_nm':item.get('genre'),
-                        'keywords':item.get('keywords'),
-                        'text': processed_text,
-                        'content_type': item.get('content_type'),  # 필수!
-                        'original': item
-                    })
-
-            if not processed_items:
+            with stage('preprocess.text'):
+                for idx, processed_text in enumerate(self._preprocess_texts(items)):
+                    if processed_text:
+                        texts.append(processed_text)
+                        rows.append(idx)
+
+            if not rows:
                 return None
 
+            if self._hashing is not None:
+                keys = [(items[idx].get('content_type'), items[idx].get('activity_id')) for idx in rows]
+                return {'rows': rows, 'vector': self._hash_items(keys, texts), 'vectorizer': self._hashing,
+                        'vectorizer_version': self._current[1]}
+
             # vectorizer 학습 및 변환
-            if not self._is_fitted:
-                self._vectorizer.fit(texts)
+            if not self._is_fitted or refit:
+                with stage('preprocess.fit'):
+                    vectorizer = self._create_vectorizer()
+                    vectorizer.fit(texts)
+                self._current = (vectorizer, self._current[1] + 1)
                 self._is_fitted = True
+                self._logger.info("vectorizer 학습 완료 (버전: %d)", self._current[1])
+                if self._analyzer is not None:
+                    self._logger.info("형태소 토큰 캐시: %s", self._analyzer.stats())
+                    self._analyzer.save()
 
-            vector = self._vectorizer.transform(texts)
+            vectorizer, version = self._current
+            with stage('preprocess.transform'):
+                vector = vectorizer.transform(texts)
             
             return {
-                'items': processed_items,
+                'rows': rows,
                 'vector': vector,
-                'vectorizer': self._vectorizer
+                'vectorizer': vectorizer,
+                'vectorizer_version': version
             }
 
         except Exception as e:
-            self._logger.error(f"아이템 전처리 중 오류 발생: {str(e)}")
+            self._logger.error("아이템 전처리 중 오류 발생: %s", e)
             return None
             
+    @timed('preprocess.user')
     def preprocess_user_data(self, user_profile: UserProfile, vectorizer: TfidfVectorizer = None) -> Optional[np.ndarray]:
+        """
+        사용자 선호 장르/키워드를 벡터화합니다.
+        같은 선호 토큰 조합은 vectorizer 버전별로 LRU 캐시에서 바로 반환합니다.
+
+        Returns:
+            사용자 프로필 복사본에 희소 벡터(1 x 특성 수)를 'vector'로, 그 벡터를 만든 vectorizer 버전을
+            'vectorizer_version'으로 추가한 딕셔너리 (현재 vectorizer가 아니면 버전은 None)
+        """
         try:
+
             # 모든 장르와 키워드를 하나의 리스트로 결합
             all_preferences = (
                 user_profile['movie_genre_preference'] +
@@ -90,64 +184,155 @@ class DataPreprocessor:
                 user_profile['exhibition_genre_preference'] +
                 user_profile['like_words']
             )
-            
 
-            # 리스트를 문자열로 변환
-            text_to_vectorize = ' '.join(all_preferences)
-            
-            self._logger.info(f"user_profile: {user_profile}")
-            self._logger.info(f"all_preferences: {all_preferences}")
-            self._logger.info(f"text_to_vectorize: '{text_to_vectorize}'")
-            # vectorizer로 변환
-            vector = vectorizer.transform([text_to_vectorize])
-                
-            # 희소 행렬을 밀집 배열로 변환
-            vector = vector.toarray().squeeze()
-                
-            self._logger.info(f"생성된 사용자 벡터 shape: {vector.shape}")
-            self._logger.info(f"벡터 통계 - 평균: {vector.mean():.4f}, 표준편차: {vector.std():.4f}")
-                
+            log_payload(self._logger, "user_profile: %s", user_profile)
+            vector, version = self._vectorize(all_preferences, vectorizer)
+
             # 원본 데이터 복사 후 vector 항목 추가
             processed_user_data = user_profile.copy()
             processed_user_data['vector'] = vector  
+            processed_user_data['vectorizer_version'] = version
             return processed_user_data
 
         except Exception as e:
-            self._logger.error(f"사용자 데이터 전처리 중 오류 발생: {str(e)}")
+            self._logger.error("사용자 데이터 전처리 중 오류 발생: %s", e)
             raise
 
-    def _preprocess_text(self, item: Dict) -> str:
-        """아이템 텍스트 전처리"""
+    def vectorize_keywords(self, keywords: List[str], vectorizer=None):
+        """
+        선호 장르/키워드 목록 -> 희소 벡터(1 x 특성 수).
+        같은 토큰 조합은 vectorizer 버전별로 LRU 캐시에서 바로 반환합니다.
+        """
+        return self._vectorize(keywords, vectorizer)[0]
+
+    def _vectorize(self, keywords: List[str], vectorizer=None) -> Tuple[Any, Optional[int]]:
+        """(희소 벡터, vectorizer 버전). 주어진 vectorizer가 현재 vectorizer가 아니면 버전은 None (캐시 미사용)"""
+        # 교체와 경쟁하지 않도록 (vectorizer, 버전)을 한 번만 읽어 캐시 키를 만듦
+        current_vectorizer, current_version = self._current
+        if vectorizer is None:
+            vectorizer = current_vectorizer
+
+        # 소문자/공백 정규화 (vectorizer 결과에 영향 없는 범위)
+        tokens = tuple(
+            str(keyword).strip().lower()
+            for keyword in keywords
+            if keyword is not None and str(keyword).strip()
+        )
+
+        # 현재 학습된 vectorizer일 때만 캐시 사용 (버전이 바뀌면 자연히 무효화)
+        version = current_version if vectorizer is current_vectorizer else None
+        cache_key = (version, tokens) if version is not None else None
+        vector = self._user_vector_cache.get(cache_key) if cache_key else None
+
+        if vector is None:
+            # 리스트를 문자열로 변환
+            text_to_vectorize = ' '.join(tokens)
+            log_payload(self._logger, "text_to_vectorize: '%s'", text_to_vectorize)
+            # vectorizer로 변환
+            vector = vectorizer.transform([text_to_vectorize]).tocsr()
+            if cache_key:
+                self._user_vector_cache.put(cache_key, vector)
+
+            self._logger.debug("생성된 사용자 벡터 shape: %s, 0이 아닌 값: %d개", vector.shape, vector.nnz)
+        return vector, version
+
+    def _preprocess_texts(self, items: List[Dict]) -> List[str]:
+        """
+        아이템 텍스트 일괄 정규화.
+        (컨텐츠 타입, activity_id)별로 텍스트 컬럼 지문(sha1)이 같으면 이전 결과를 재사용하고,
+        나머지만 컬럼 단위로 정규화합니다. 정규화할 아이템이 많으면 청크로 나눠 여러 프로세스에서 처리합니다.
+        """
+        texts = [None] * len(items)
+        keys, hashes = [], []
+        miss_indices, miss_rows = [], []
+        for idx, item in enumerate(items):
+            fields = extract_fields(item)
+            key = (item.get('content_type'), item.get('activity_id'))
+            row_hash = content_digest(fields)
+            keys.append(key)
+            hashes.append(row_hash)
+            cached = self._text_cache.get(key)
+            if cached is not None and cached[0] == row_hash:
+                texts[idx] = cached[1]
+            else:
+                miss_indices.append(idx)
+                miss_rows.append(fields)
+
+        for idx, text in zip(miss_indices, self._normalize(miss_rows)):
+            texts[idx] = text
+
+        # 이번 카탈로그에 있는 아이템만 남겨 삭제된 아이템이 캐시에 쌓이지 않도록 교체
+        self._text_cache = {key: (row_hash, text) for key, row_hash, text in zip(keys, hashes, texts)}
+        self._logger.info("텍스트 정규화 완료 (전체: %d개, 재사용: %d개, 새로 정규화: %d개)",
+                          len(items), len(items) - len(miss_rows), len(miss_rows))
+        return texts
+
+    def _normalize(self, rows: List[tuple]) -> List[str]:
+        if self._text_workers <= 1 or len(rows) < self._text_chunk_size * 2:
+            return normalize_rows(rows)
+
+        chunks = [rows[start:start + self._text_chunk_size] for start in range(0, len(rows), self._text_chunk_size)]
         try:
-            text_parts = []
-            
-            # 제목 처리 (가중치 부여 예시)
-            if 'title' in item and item['title']:
-                text_parts.extend([item['title'].lower()] * 2)
+            # text_normalizer는 표준 라이브러리만 쓰므로 spawn 프로세스 시작 비용이 작음
+            with ProcessPoolExecutor(max_workers=min(self._text_workers, len(chunks)),
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                return [text for chunk_texts in executor.map(normalize_rows, chunks) for text in chunk_texts]
+        except Exception as e:
+            self._logger.error("병렬 텍스트 정규화 실패 - 단일 프로세스로 처리: %s", e)
+            return normalize_rows(rows)
 
-            # 설명 처리
-            if 'description' in item and item['description']:
-                text_parts.append(item['description'].lower())
-                
-            # 장르 처리
-            if 'genre' in item and item['genre']:
-                genres = item['genre'].split(',') if isinstance(item['genre'], str) else item['genre']
-                text_parts.extend([genre.lower().strip() for genre in genres if genre.strip()])
-                
-            # 배우/참여자 처리
-            if 'actors' in item and item['actors']:
-                actors = item['actors'].split(',') if isinstance(item['actors'], str) else item['actors']
-                text_parts.extend([actor.lower().strip() for actor in actors if actor.strip()])
+    def _hash_items(self, keys: List[tuple], texts: List[str]):
+        """
+        hashing 모드 아이템 벡터화. 해시는 아이템마다 독립적이라 학습 단계가 없고,
+        문서 빈도는 이전 카탈로그 대비 추가/변경된 아이템만 더하고 삭제/변경 전 아이템만 빼서 갱신한 뒤 IDF를 곱합니다.
+        (사용자 벡터 캐시는 그대로 유효)
+        """
+        with stage('preprocess.hash'):
+            counts = self._hashing.hash(texts)
+            counts.sum_duplicates()
 
-            # 키워드 처리
-            if 'keywords' in item and item['keywords']:
-                keywords = item['keywords'].split(',') if isinstance(item['keywords'], str) else item['keywords']
-                text_parts.extend([keyword.lower().strip() for keyword in keywords if keyword.strip()])
+        with stage('preprocess.transform'):
+            # 보관 내용/문서 빈도는 복사본으로 새로 계산하고 모든 행이 성공한 뒤에 함께 교체
+            # (중간에 실패해도 이전 카탈로그 기준의 보관 내용과 문서 빈도가 서로 어긋나지 않도록)
+            previous = dict(self._hashed_items)
+            current = {}
+            added_rows, removed = [], []
+            for row, (key, text) in enumerate(zip(keys, texts)):
+                if key in current:
+                    # 같은 키가 두 번 나오면 행 번호를 붙여 각각 반영 (문서 빈도와 보관 내용이 항상 일치하도록)
+                    key = key + (row,)
+                text_hash = content_digest(text)
+                old = previous.pop(key, None)
+                if old is not None and old[0] == text_hash:
+                    current[key] = old
+                    continue
+                if old is not None:
+                    removed.append(old[1])
+                added_rows.append(row)
+                lo, hi = counts.indptr[row], counts.indptr[row + 1]
+                current[key] = (text_hash, counts.indices[lo:hi][counts.data[lo:hi] != 0].copy())
+            # 이번 카탈로그에 없는 아이템
+            removed.extend(buckets for _, buckets in previous.values())
 
-            return ' '.join(text_parts)
+            df, n_docs = self._hashing.updated_document_frequency(
+                added=counts[added_rows],
+                removed=_bucket_matrix(removed, self._hashing.n_features)
+            )
+            vector = self._hashing.weight(counts, idf=self._hashing.idf(df, n_docs))
+            self._hashing.set_document_frequency(df, n_docs)
+            self._hashed_items = current
+        self._logger.info("해시 벡터화 완료 (아이템: %d개, 문서 빈도 반영 - 추가/변경: %d개, 제거: %d개, "
+                          "특성 수: %d, 사용 중인 해시 버킷: %d개)",
+                          vector.shape[0], len(added_rows), len(removed), self._hashing.n_features,
+                          int((self._hashing.df > 0).sum()))
+        return vector
 
+    def _preprocess_text(self, item: Dict) -> str:
+        """아이템 텍스트 전처리 (아이템 하나)"""
+        try:
+            return normalize_rows([extract_fields(item)])[0]
         except Exception as e:
-            self._logger.error(f"텍스트 전처리 중 오류 발생: {str(e)}")
+            self._logger.error("텍스트 전처리 중 오류 발생: %s", e)
             return ''
 
     def _get_content_type(self, item_data: Dict[str, Any]) -> ContentType:
@@ -186,8 +371,16 @@ class DataPreprocessor:
                 return ContentType(type_str)
 
             except ContentTypeError as e:
-                self._logger.error(f"컨텐츠 타입 오류: {str(e)}")
+                self._logger.error("컨텐츠 타입 오류: %s", e)
                 raise
             except Exception as e:
-                self._logger.error(f"예상치 못한 오류 발생: {str(e)}")
+                self._logger.error("예상치 못한 오류 발생: %s", e)
                 raise ContentTypeError(f"컨텐츠 타입 처리 중 오류 발생: {str(e)}")
+
+
+def _bucket_matrix(buckets: List[np.ndarray], n_features: int) -> sp.csr_matrix:
+    """아이템별 해시 버킷 인덱스 목록 -> (아이템 수 x n_features) 0/1 행렬"""
+    indptr = np.zeros(len(buckets) + 1, dtype=np.int64)
+    np.cumsum([b.size for b in buckets], out=indptr[1:])
+    indices = np.concatenate(buckets) if buckets else np.empty(0, dtype=np.int32)
+    return sp.csr_matrix((np.ones(indices.size), indices, indptr), shape=(len(buckets), n_features))
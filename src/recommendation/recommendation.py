@@ -1,18 +1,26 @@
 ## 추천 알고리즘 메인 코드
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import numpy as np
 from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.feature_extraction.text import TfidfVectorizer
 import logging
-import json
-from enum import Enum
-from dataclasses import dataclass
-import re
-import sys
-sys.path.append('/home/ubuntu/FOREST_AI')
+import os
+import threading
+import time
 from database.user_queries import UserQueries
 from database.item_queries import ItemQueries
+from database.rating_queries import RatingQueries
 from recommendation.preprocessor import DataPreprocessor, ContentType, UserProfile
+from recommendation.similarity import build_item_neighbors
+from recommendation.reranker import mmr_rerank
+from recommendation.popularity import build_popularity_lists
+from recommendation.scoring_pool import ScoringPool
+from recommendation.cache import LRUCache, SingleFlight
+from recommendation.catalog import Catalog
+from recommendation.filters import ItemFilter, NO_FILTER
+from recommendation.pagination import decode_cursor, encode_cursor, user_fingerprint
+from recommendation.snapshot import load_snapshot, publish_snapshot, read_manifest
+from config.settings import RECOMMENDATION_SETTINGS, LOGGING_SETTINGS
+from monitoring import stage, timed, log_payload, payload_logging_enabled, current_request, REGISTRY
 import scipy.sparse as sp
 from mysql.connector import Error as DatabaseError
 from datetime import datetime
@@ -21,27 +29,107 @@ from datetime import datetime
 # from surprise import Dataset, Reader, SVD
 # from surprise.model_selection import train_test_split
 # import pandas as pd
-# from database.rating_queries import RatingQueries
+
+RECOMMENDATION_PATHS = REGISTRY.counter(
+    'forest_recommendations_total', '추천 응답 경로별 횟수 (scored: 점수 계산, cold_start: 인기 목록, live: 대화 중 추천, similar: 유사 아이템, page: 캐시된 페이지, page_expired: 선호도/카탈로그가 바뀐 커서, search: 검색)', ['path'])
+RECOMMENDATION_COALESCED = REGISTRY.counter(
+    'forest_recommendations_coalesced_total', '같은 사용자의 진행 중인 추천 계산 결과를 공유한 요청 수')
 
 
 class RecommendationAlgorithm:
-    def __init__(self):
+    def __init__(self, settings: Dict[str, Any] = None):
+
+        # 기본 설정(RECOMMENDATION_SETTINGS)에 인스턴스별 설정 덮어쓰기
+        self._settings = {**RECOMMENDATION_SETTINGS, **(settings or {})}
 
         self._item_queries = ItemQueries()
         self._user_queries = UserQueries()
-        # self._rating_queries = RatingQueries()
-        self.preprocessor = DataPreprocessor()
+        self._rating_queries = RatingQueries()
+        self.preprocessor = DataPreprocessor(
+            user_vector_cache_size=self._settings['user_vector_cache_size'],
+            text_workers=self._settings['text_workers'],
+            text_chunk_size=self._settings['text_chunk_size'],
+            text_analyzer=self._settings['text_analyzer'],
+            token_cache_path=self._settings['token_cache_path'],
+            vectorizer_mode=self._settings['vectorizer_mode'],
+            hashing_features=self._settings['hashing_features'],
+            hashing_idf=self._settings['hashing_idf']
+        )
 
         self.item_data = {}
         self.user_data = {}
+
+        # 카탈로그 스냅샷 (update_interval 마다 갱신)
+        self._catalog = None
+        self._catalog_version = 0
+        self._catalog_lock = threading.Lock()
+
+        # 카탈로그 스냅샷 공유 (off / publish / follow)
+        self._snapshot_mode = self._settings['snapshot_mode']
+        if self._snapshot_mode not in ('off', 'publish', 'follow'):
+            raise ValueError(f"알 수 없는 snapshot_mode: {self._snapshot_mode}")
+        if self._snapshot_mode != 'off' and not self._settings['snapshot_dir']:
+            raise ValueError("snapshot_mode를 사용하려면 snapshot_dir(CATALOG_SNAPSHOT_DIR)가 필요합니다.")
+        self._watcher_pid = None  # follow 모드 manifest 감시 스레드를 시작한 프로세스 (fork 후 워커마다 다시 시작)
+
+        # 같은 (user_id, K, 카탈로그 버전)의 동시 요청은 한 번만 계산
+        self._inflight = SingleFlight()
+
+        # 페이지네이션용 긴 순위 목록: (user_id, 선호도 지문, 카탈로그 지문, 필터) -> activity_id 리스트
+        self._ranked_lists = LRUCache(self._settings['ranked_cache_size'])
+
+        # 점수 계산 프로세스 풀 (scoring_backend=process일 때만, 첫 요청 시 프로세스 시작)
+        self._scoring_pool = None
+        if self._settings['scoring_backend'] == 'process':
+            self._scoring_pool = ScoringPool(
+                n_workers=self._settings['scoring_workers'],
+                max_batch=self._settings['scoring_max_batch'],
+                batch_wait_ms=self._settings['scoring_batch_wait_ms'],
+                web_workers=self._settings['web_workers']
+            )
         
         self._logger = logging.getLogger(__name__)
         self._setup_logger()
+        self._register_metrics()
+
+    def _register_metrics(self) -> None:
+        """캐시/카탈로그 상태를 /metrics 출력 시점에 읽어가는 게이지 등록"""
+        REGISTRY.gauge_callback(
+            'forest_user_vector_cache', '사용자 벡터 LRU 캐시 통계 (hits, misses, size, hit_rate)',
+            lambda: {(key,): value for key, value in self.preprocessor.user_vector_cache_stats().items()},
+            ['stat']
+        )
+        REGISTRY.gauge_callback(
+            'forest_ranked_list_cache', '페이지네이션 순위 목록 LRU 캐시 통계 (hits, misses, size, hit_rate)',
+            lambda: {(key,): value for key, value in self._ranked_lists.stats().items()},
+            ['stat']
+        )
+        REGISTRY.gauge_callback(
+            'forest_token_cache', '형태소 토큰 캐시 통계 (hits, misses, size, hit_rate, TEXT_ANALYZER=word면 비어 있음)',
+            lambda: {(key,): value for key, value in (self.preprocessor.token_cache_stats() or {}).items()},
+            ['stat']
+        )
+        REGISTRY.gauge_callback(
+            'forest_catalog', '현재 카탈로그 상태 (version, items, bytes, age_seconds)',
+            self._catalog_gauges,
+            ['field']
+        )
+
+    def _catalog_gauges(self) -> Dict[tuple, float]:
+        catalog = self._catalog
+        if catalog is None:
+            return {}
+        return {
+            ('version',): catalog.version,
+            ('items',): len(catalog),
+            ('bytes',): catalog.nbytes(),
+            ('age_seconds',): (datetime.now() - catalog.last_updated).total_seconds()
+        }
 
     def _setup_logger(self) -> None:
         logging.basicConfig(
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            level=logging.INFO
+            level=LOGGING_SETTINGS['level']
         )
 
 
@@ -53,7 +141,7 @@ class RecommendationAlgorithm:
             Tuple[List[Dict], TfidfVectorizer]: 전처리된 모든 아이템 리스트와 vectorizer
         """
         try:
-            self._logger.info(f"아이템 데이터 가져오기")
+            self._logger.info("아이템 데이터 가져오기")
             # 1. ItemQueries를 통해 모든 데이터 가져오기
             movies = self._item_queries.get_movies_data(ContentType.MOVIE)
             performances = self._item_queries.get_performances_data()
@@ -61,7 +149,7 @@ class RecommendationAlgorithm:
 
             # 데이터 검증
             item_count = len(movies) + len(performances) + len(exhibitions)
-            self._logger.info(f"[DB 조회 성공] 총 {item_count}개 아이템 조회됨")
+            self._logger.info("[DB 조회 성공] 총 %d개 아이템 조회됨", item_count)
             
             # 2. ItemPreprocessor를 통해 각각 전처리
             preprocessed_movies = self.preprocessor.preprocess_items(movies)
@@ -90,7 +178,8 @@ class RecommendationAlgorithm:
                 'last_updated': datetime.now()
             }
 
-            self._logger.info(f"전체 아이템 준비 완료 (영화: {len(movies)}개, 공연: {len(performances)}개, 전시: {len(exhibitions)}개)")
+            self._logger.info("전체 아이템 준비 완료 (영화: %d개, 공연: %d개, 전시: %d개)",
+                              len(movies), len(performances), len(exhibitions))
             
             # 모든 아이템을 하나의 리스트로 통합
             all_items = []
@@ -110,13 +199,17 @@ class RecommendationAlgorithm:
             return all_items, self.item_data[ContentType.MOVIE]['vectorizer']
         
         except DatabaseError as db_err:
-            self._logger.error(f"데이터베이스 오류 발생: {str(db_err)}")
+            self._logger.error("데이터베이스 오류 발생: %s", db_err)
             return False
         except Exception as e:
-            self._logger.error(f"아이템 데이터 준비 중 오류 발생: {str(e)}")
+            self._logger.error("아이템 데이터 준비 중 오류 발생: %s", e)
             raise
     
-    def prepare_item_data(self):
+    def prepare_item_data(self, refit: bool = False) -> Catalog:
+        """
+        영화, 공연, 전시 데이터를 모두 가져와 전처리하고 컬럼형 카탈로그를 만듭니다.
+        (neighbor 테이블, 인기 목록, 버전은 refresh_catalog에서 채움)
+        """
         try:
             self._logger.info("아이템 데이터 가져오기")
             movies = self._item_queries.get_movies_data(ContentType.MOVIE)
@@ -134,46 +227,271 @@ class RecommendationAlgorithm:
                 item['content_type'] = ContentType.EXHIBITION.value
                 all_items.append(item)
             
-            self._logger.info(f"[DB 조회 성공] 총 {len(all_items)}개 아이템 통합")
+            self._logger.info("[DB 조회 성공] 총 %d개 아이템 통합", len(all_items))
 
             # 전처리
-            processed = self.preprocessor.preprocess_items(all_items)
+            processed = self.preprocessor.preprocess_items(all_items, refit=refit)
             if not processed:
                 self._logger.error("전처리 결과 없음")
                 raise ValueError("전처리 실패")
-            
-            processed_items = processed['items']
-            vectors = processed['vector']
-            vectorizer = processed['vectorizer']
-            
-            if len(all_items) != len(processed_items):
-                self._logger.error(
-                    f"전처리 결과 길이 불일치: all_items({len(all_items)}) vs processed_items({len(processed_items)})"
-                )
-                raise ValueError("전처리 결과와 아이템 개수가 일치하지 않습니다.")
-            
-            # 기존 all_items 대신 processed_items를 사용하거나,
-            # 기존 동작과 맞추려면 vectors를 all_items의 해당 인덱스에 붙이기
-            for idx, item in enumerate(processed_items):
-                item['vector'] = vectors[idx]
-            
+
+            skipped = len(all_items) - len(processed['rows'])
+            if skipped:
+                self._logger.warning("텍스트가 없어 카탈로그에서 제외된 아이템: %d개", skipped)
+
+            # DB 조회 결과(dict 리스트)는 여기서 버리고 필요한 컬럼만 배열로 보관
+            catalog = Catalog.from_rows(
+                all_items,
+                processed['rows'],
+                processed['vector'],
+                processed['vectorizer'],
+                processed['vectorizer_version']
+            )
             self._logger.info("전체 아이템 준비 및 벡터라이징 완료")
-            return processed_items, vectorizer
+            return catalog
 
         except Exception as e:
-            self._logger.error(f"아이템 데이터 준비 중 오류 발생: {str(e)}")
+            self._logger.error("아이템 데이터 준비 중 오류 발생: %s", e)
             raise
 
-    def prepare_user_data(self, user_id: int,vectorizer) -> bool:
+    @timed('catalog.refresh')
+    def refresh_catalog(self) -> Catalog:
+        """
+        아이템 데이터를 다시 불러와 카탈로그 스냅샷을 만들고 교체합니다.
+        아이템-아이템 이웃 테이블과 콜드 스타트 인기 목록도 이 시점에 함께 계산합니다.
+        """
+        # 카탈로그가 바뀌었으므로 vectorizer도 새로 학습 (사용자 벡터 캐시는 버전으로 무효화)
+        # hashing 모드는 학습 단계가 없어 vectorizer 버전과 사용자 벡터 캐시가 유지됨
+        catalog = self.prepare_item_data(refit=True)
+
+        self._logger.info("아이템 이웃 테이블 계산 (top_m=%d)", self._settings['neighbor_top_m'])
+        with stage('catalog.neighbors'):
+            catalog.neighbor_rows, catalog.neighbor_sims = build_item_neighbors(
+                catalog.vector,
+                top_m=self._settings['neighbor_top_m'],
+                block_size=self._settings['neighbor_block_size']
+            )
+
+        # 콜드 스타트용 인기 목록
+        catalog.popularity = build_popularity_lists(
+            catalog.activity_ids,
+            [catalog.content_type(row) for row in range(len(catalog))],
+            self._rating_queries.get_popularity_data(),
+            prior_count=self._settings['cold_start_prior_count'],
+            editorial_ids=self._settings['cold_start_editorial_ids']
+        )
+
+        self._catalog_version += 1
+        catalog.version = self._catalog_version
+        catalog.fingerprint()  # 페이지 커서용 내용 지문 (첫 요청에서 계산하지 않도록 미리)
+        # 참조 교체만으로 갱신되므로 진행 중인 요청은 이전 카탈로그를 계속 사용
+        self._catalog = catalog
+        self._logger.info("카탈로그 갱신 완료 (버전: %d, 지문: %s, 아이템: %d개, 타입별: %s, 메모리: %.1fMB)",
+                          catalog.version, catalog.fingerprint(), len(catalog), catalog.type_counts(),
+                          catalog.nbytes() / 1024 / 1024)
+        self._logger.info("사용자 벡터 캐시 통계: %s", self.preprocessor.user_vector_cache_stats())
+
+        if self._snapshot_mode == 'publish':
+            # 배포에 실패해도 이 노드는 새 카탈로그로 계속 서비스 (다음 갱신 때 다시 배포)
+            try:
+                with stage('catalog.publish'):
+                    manifest = publish_snapshot(catalog, self._settings['snapshot_dir'],
+                                                keep=self._settings['snapshot_keep'])
+                catalog.snapshot_id = manifest['snapshot_id']
+            except Exception as e:
+                self._logger.error("카탈로그 스냅샷 배포 실패: %s", e)
+        return catalog
+
+    def load_catalog_snapshot(self) -> Optional[Catalog]:
+        """
+        공유 디렉터리의 manifest가 현재 카탈로그와 다른 스냅샷을 가리키면 불러와 교체합니다.
+        새 카탈로그를 완전히 만든 뒤 참조만 바꾸므로 진행 중인 요청은 이전 카탈로그로 끝까지 처리됩니다.
+
+        Returns:
+            교체한 카탈로그 (배포된 스냅샷이 없거나 이미 최신이면 None)
+        """
+        directory = self._settings['snapshot_dir']
+        manifest = read_manifest(directory)
+        current = self._catalog
+        if manifest is None or (current is not None and current.snapshot_id == manifest['snapshot_id']):
+            return None
+
+        with stage('catalog.load_snapshot'):
+            catalog = load_snapshot(directory, manifest)
+        # 버전은 이 프로세스 기준으로 다시 매김 (점수 계산 풀, single-flight 키, 저장된 사용자 벡터가 이 값을 사용)
+        catalog.vectorizer_version = self.preprocessor.adopt_vectorizer(catalog.vectorizer)
+        self._catalog_version += 1
+        catalog.version = self._catalog_version
+        catalog.fingerprint()
+        self._catalog = catalog
+        self._logger.info("카탈로그 스냅샷 적용 (%s, 버전: %d, 아이템: %d개, 메모리: %.1fMB)",
+                          catalog.snapshot_id, catalog.version, len(catalog), catalog.nbytes() / 1024 / 1024)
+        return catalog
+
+    def start_snapshot_watcher(self) -> None:
+        """
+        follow 모드에서 manifest를 snapshot_poll_s마다 확인하는 데몬 스레드를 시작합니다.
+        스레드는 fork로 복사되지 않으므로 gunicorn 워커마다(post_fork 이후) 호출해야 합니다.
+        """
+        if self._snapshot_mode != 'follow' or self._watcher_pid == os.getpid():
+            return
+        self._watcher_pid = os.getpid()
+        threading.Thread(target=self._watch_snapshots, name='catalog-snapshot-watcher', daemon=True).start()
+        self._logger.info("카탈로그 스냅샷 감시 시작 (%s, %.0f초 주기)",
+                          self._settings['snapshot_dir'], self._settings['snapshot_poll_s'])
+
+    def _watch_snapshots(self) -> None:
+        while True:
+            time.sleep(self._settings['snapshot_poll_s'])
+            try:
+                with self._catalog_lock:
+                    self.load_catalog_snapshot()
+            except Exception as e:
+                self._logger.error("카탈로그 스냅샷 불러오기 실패 (이전 카탈로그 유지): %s", e)
+
+    def _get_catalog(self) -> Catalog:
+        """현재 카탈로그를 반환하고, 없거나 update_interval이 지났으면 갱신합니다."""
+        if self._snapshot_mode == 'follow':
+            return self._get_followed_catalog()
+
+        catalog = self._catalog
+        if catalog and not self._is_catalog_expired(catalog):
+            return catalog
+
+        with self._catalog_lock:
+            # 대기하는 동안 다른 요청이 이미 갱신했을 수 있음
+            catalog = self._catalog
+            if catalog and not self._is_catalog_expired(catalog):
+                return catalog
+            return self.refresh_catalog()
+
+    def _get_followed_catalog(self) -> Catalog:
+        """follow 모드: 갱신 주기는 배포하는 노드가 정하므로 만료 검사 없이, 카탈로그가 없을 때만 스냅샷을 불러옵니다."""
+        catalog = self._catalog
+        if catalog is not None:
+            return catalog
+
+        with self._catalog_lock:
+            if self._catalog is None:
+                self.load_catalog_snapshot()
+            if self._catalog is None:
+                raise RuntimeError(f"배포된 카탈로그 스냅샷이 없습니다: {self._settings['snapshot_dir']}")
+            return self._catalog
+
+    @property
+    def current_catalog(self) -> Optional[Catalog]:
+        """현재 카탈로그 (없으면 None, 갱신하지 않음)"""
+        return self._catalog
+
+    @property
+    def is_warm(self) -> bool:
+        """카탈로그(아이템 벡터, vectorizer, 이웃 테이블)가 준비되어 있는지 여부"""
+        return self._catalog is not None
+
+    def warm_up(self) -> bool:
+        """
+        요청을 받기 전에 카탈로그를 미리 만들어 둡니다.
+        gunicorn preload 시 master에서 호출하면 워커들이 fork 후 카탈로그 메모리를 copy-on-write로 공유합니다.
+        """
+        try:
+            self._get_catalog()
+            return True
+        except Exception as e:
+            self._logger.error("카탈로그 미리 불러오기 실패: %s", e)
+            return False
+
+    def _is_catalog_expired(self, catalog: Catalog) -> bool:
+        elapsed = (datetime.now() - catalog.last_updated).total_seconds()
+        return elapsed > self._settings['update_interval']
+
+    def get_cold_start_recommendations(self, content_type: str = None, k: int = None) -> List[int]:
+        """
+        선호도 데이터가 없는 사용자를 위한 인기 목록을 반환합니다.
+        카탈로그 갱신 시 미리 정렬해둔 목록을 자르기만 하므로 O(K) 입니다.
+
+        Args:
+            content_type: 특정 컨텐츠 타입만 반환할 경우 ContentType 값 (None이면 전체)
+            k: 반환할 개수 (None이면 top_k 설정값)
+        """
+        k = k or self._settings['top_k']
+        popularity = self._get_catalog().popularity
+        return popularity.get(content_type or 'all', [])[:k]
+
+    def get_similar_items(self, activity_id: int, k: int = None,
+                          content_type: str = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        activity_id와 비슷한 아이템 목록 (상세 페이지용).
+        카탈로그 갱신 시 만든 이웃 테이블을 조회만 하므로 요청마다 유사도를 계산하지 않습니다.
+
+        Args:
+            k: 반환할 개수 (최대 neighbor_top_m)
+            content_type: 특정 컨텐츠 타입만 반환할 경우 ContentType 값 (None이면 전체)
+
+        Returns:
+            activity_id, content_type, similarity를 담은 딕셔너리 목록 (유사도 내림차순).
+            카탈로그에 없는 activity_id면 None
+
+        Raises:
+            ValueError: 알 수 없는 content_type
+        """
+        if content_type and content_type not in ContentType.get_valid_types():
+            raise ValueError(f"알 수 없는 content_type: {content_type}")
+        k = min(k or self._settings['neighbor_top_m'], self._settings['neighbor_top_m'])
+        catalog = self._get_catalog()
+        row = catalog.row_for(activity_id)
+        if row < 0:
+            return None
+
+        rows, sims = catalog.neighbors(row)
+        if content_type:
+            same_type = catalog.content_types[rows] == catalog.type_names.index(content_type)
+            rows, sims = rows[same_type], sims[same_type]
+        rows, sims = rows[:k], sims[:k]
+        self._record_path('similar', catalog_version=catalog.version)
+        return [
+            {'activity_id': activity_id, 'content_type': catalog.content_type(neighbor), 'similarity': round(float(sim), 4)}
+            for activity_id, neighbor, sim in zip(catalog.ids_for(rows), rows.tolist(), sims)
+        ]
+
+    def search_items(self, query: str, k: int = None, item_filter: ItemFilter = NO_FILTER) -> List[Dict[str, Any]]:
+        """
+        제목/장르/키워드 검색 (카탈로그 갱신 시 만든 역색인 조회, DB 조회 없음)
+
+        Args:
+            query: 검색어 (단어가 일치하지 않으면 제목 부분 일치로 보완)
+            k: 반환할 개수 (None이면 search_default_k, 최대 search_max_k)
+            item_filter: 컨텐츠 타입/장르 조건 (exclude_reviewed는 사용하지 않음)
+
+        Returns:
+            activity_id, title, content_type, score를 담은 딕셔너리 목록 (점수 내림차순)
+        """
+        k = min(k or self._settings['search_default_k'], self._settings['search_max_k'])
+        catalog = self._get_catalog()
+        if catalog.search_index is None or not query.strip():
+            return []
+
+        with stage('search.lookup'):
+            allowed = catalog.bitsets.mask(item_filter) if item_filter else None
+            rows, scores = catalog.search_index.search(query, k, allowed)
+        self._record_path('search', catalog_version=catalog.version)
+        return [
+            {'activity_id': activity_id, 'title': catalog.titles[row], 'content_type': catalog.content_type(row),
+             'score': round(float(score), 4)}
+            for activity_id, row, score in zip(catalog.ids_for(rows), rows.tolist(), scores)
+        ]
+
+    def prepare_user_data(self, user_id: int,vectorizer, raw_user_data: Dict[str, Any] = None) -> bool:
         """
         데이터베이스에서 사용자 데이터를 가져와서 전처리
+        (raw_user_data가 주어지면 DB 조회를 생략)
         """
         try:
             # 1. 데이터베이스에서 사용자 데이터 가져오기
-            self._logger.info(f"사용자 ID {user_id}의 데이터 DB에서 가져오기")
-            raw_user_data = self._user_queries.get_user_preferences(user_id)
+            if raw_user_data is None:
+                self._logger.debug("사용자 ID %s의 데이터 DB에서 가져오기", user_id)
+                raw_user_data = self._user_queries.get_user_preferences(user_id)
             if not raw_user_data:
-                self._logger.warning(f"사용자 ID {user_id}에 대한 데이터를 찾을 수 없습니다.")
+                self._logger.warning("사용자 ID %s에 대한 데이터를 찾을 수 없습니다.", user_id)
                 return False
 
             # 2. 사용자 데이터 전처리
@@ -186,14 +504,15 @@ class RecommendationAlgorithm:
             self.user_data[user_id] = {
                 #'profile': processed_user_data['profile'],
                 'vector': processed_user_data['vector'],
+                'vectorizer_version': processed_user_data['vectorizer_version'],
                 'last_updated': datetime.now()
             }
 
-            self._logger.info(f"사용자 ID {user_id}의 데이터 준비 완료")
+            self._logger.debug("사용자 ID %s의 데이터 준비 완료", user_id)
             return self.user_data
 
         except Exception as e:
-            self._logger.error(f"사용자 데이터 준비 중 오류 발생: {str(e)}")
+            self._logger.error("사용자 데이터 준비 중 오류 발생: %s", e)
             return False
 
     # def get_ratings_data(self):
@@ -230,8 +549,8 @@ class RecommendationAlgorithm:
         try:
             # 입력 데이터 로깅
             self._logger.debug("=== 입력 데이터 정보 ===")
-            self._logger.debug(f"user_vector 타입: {type(user_vector)}")
-            self._logger.debug(f"item_vectors 타입: {type(item_vectors)}")
+            self._logger.debug("user_vector 타입: %s", type(user_vector))
+            self._logger.debug("item_vectors 타입: %s", type(item_vectors))
 
             # Sparse matrix 처리
             if sp.issparse(user_vector):
@@ -246,13 +565,13 @@ class RecommendationAlgorithm:
                 user_vector = np.array(user_vector, dtype=np.float32)
                 item_vectors = np.array(item_vectors, dtype=np.float32)
             except Exception as e:
-                self._logger.error(f"벡터 변환 중 오류: {str(e)}")
+                self._logger.error("벡터 변환 중 오류: %s", e)
                 raise ValueError(f"벡터 변환 실패: {str(e)}")
 
             # 변환 후 데이터 확인
             self._logger.debug("=== 변환 후 데이터 정보 ===")
-            self._logger.debug(f"user_vector shape: {user_vector.shape}")
-            self._logger.debug(f"item_vectors shape: {item_vectors.shape}")
+            self._logger.debug("user_vector shape: %s", user_vector.shape)
+            self._logger.debug("item_vectors shape: %s", item_vectors.shape)
 
             # 1차원 벡터의 경우 2D로 reshape
             if len(user_vector.shape) == 1:
@@ -273,8 +592,8 @@ class RecommendationAlgorithm:
             # 코사인 유사도 계산
             similarities = cosine_similarity(user_vector, item_vectors)
             
-            self._logger.debug(f"계산된 유사도 shape: {similarities.shape}")
-            self._logger.info("유사도 계산 완료")
+            self._logger.debug("계산된 유사도 shape: %s", similarities.shape)
+            self._logger.debug("유사도 계산 완료")
             
             return similarities.ravel()
             
@@ -315,39 +634,132 @@ class RecommendationAlgorithm:
             return final_scores
             
         except Exception as e:
-            self._logger.error(f"최종 점수 계산 중 오류 발생: {str(e)}")
+            self._logger.error("최종 점수 계산 중 오류 발생: %s", e)
             return np.zeros_like(similarities)
 
-    def get_recommendations(self, user_id: int) -> Dict[str, List[Dict]]:
+    def get_recommendations(self, user_id: int, item_filter: ItemFilter = NO_FILTER) -> List[int]:
         """
         사용자에게 추천 아이템을 반환하는 함수
+        같은 사용자의 요청이 동시에 여러 개 들어오면(여러 화면에서 동시 호출) 진행 중인 계산 결과를 함께 사용합니다.
+
+        Args:
+            item_filter: 컨텐츠 타입/장르/리뷰한 아이템 제외 조건 (상위 K 선택 전에 마스크로 적용)
+        """
+        catalog = self._catalog
+        key = (user_id, self._settings['top_k'], catalog.version if catalog is not None else 0, item_filter)
+        result, shared = self._inflight.do(
+            key, lambda: self._compute_recommendations(user_id, item_filter=item_filter))
+        if shared:
+            RECOMMENDATION_COALESCED.inc()
+            req_log = current_request()
+            if req_log is not None:
+                req_log.set(path='coalesced')
+        # 호출한 쪽에서 목록을 수정해도 서로 영향이 없도록 복사본 반환
+        return list(result)
+
+    def get_recommendation_page(self, user_id: int, cursor: str = None, limit: int = None,
+                                item_filter: ItemFilter = NO_FILTER) -> Dict[str, Any]:
+        """
+        추천 목록의 한 페이지를 반환합니다. (무한 스크롤)
+        첫 페이지에서 ranked_list_size 길이의 순위 목록을 계산해 캐시하고, 다음 페이지는 커서가 가리키는
+        (선호도 지문, 카탈로그 지문)의 캐시된 목록을 자르기만 하므로 DB 조회와 점수 계산이 없습니다.
+        스크롤 도중 카탈로그가 바뀌어도 캐시에 남아 있는 동안은 처음 목록을 계속 사용해 중복/누락이 없습니다.
+
+        Args:
+            cursor: 이전 응답의 next_cursor (None이면 첫 페이지)
+            limit: 페이지 크기 (None이면 page_size, 최대 max_page_size)
+            item_filter: 첫 페이지의 필터 조건 (다음 페이지는 커서에 담긴 조건을 사용)
+
+        Returns:
+            {'recommendations': activity_id 리스트, 'next_cursor': 다음 페이지 커서 (마지막 페이지면 None)}
+
+        Raises:
+            ValueError: 유효하지 않은 cursor, 또는 캐시에 없고 현재와 다른 선호도/카탈로그에서 만든 cursor
+        """
+        limit = min(limit or self._settings['page_size'], self._settings['max_page_size'])
+        offset = 0
+        if cursor:
+            position = decode_cursor(cursor, user_id)
+            offset = position['offset']
+            item_filter = position['item_filter']
+            key = (str(user_id), position['fingerprint'], position['catalog_id'], item_filter)
+            ranked = self._ranked_lists.get(key)
+            if ranked is not None:
+                self._record_path('page', catalog_id=key[2], offset=offset)
+                return self._slice_page(ranked, key, offset, limit)
+            # 다른 워커/노드에서 받은 커서이거나 캐시에서 밀려난 경우: 같은 선호도/같은 내용의 카탈로그면 같은 목록이
+            # 나오므로 다시 계산해 같은 위치부터 반환. 스크롤 도중 선호도나 카탈로그 내용이 바뀌었으면 이어 붙일 수
+            # 없으므로(중복/누락) 오류
+
+        raw_user_data = self._user_queries.get_user_preferences(user_id)
+        catalog = self._get_catalog()
+        fingerprint = user_fingerprint(raw_user_data) if raw_user_data else 'cold'
+        if cursor and (position['catalog_id'] != catalog.fingerprint() or position['fingerprint'] != fingerprint):
+            self._record_path('page_expired', catalog_id=position['catalog_id'])
+            raise ValueError("만료된 cursor입니다. 첫 페이지부터 다시 요청하세요.")
+        key = (str(user_id), fingerprint, catalog.fingerprint(), item_filter)
+        ranked = self._ranked_lists.get(key)
+        if ranked is None:
+            length = self._settings['ranked_list_size']
+            ranked, _ = self._inflight.do(
+                ('ranked',) + key,
+                lambda: self._compute_recommendations(user_id, length=length, raw_user_data=raw_user_data or {},
+                                                      item_filter=item_filter)
+            )
+            if ranked:
+                self._ranked_lists.put(key, ranked)
+        return self._slice_page(ranked, key, offset, limit)
+
+    @staticmethod
+    def _slice_page(ranked: List[int], key: tuple, offset: int, limit: int) -> Dict[str, Any]:
+        page = ranked[offset:offset + limit]
+        next_offset = offset + len(page)
+        next_cursor = (encode_cursor(key[0], key[1], key[2], next_offset, key[3])
+                       if page and next_offset < len(ranked) else None)
+        return {'recommendations': list(page), 'next_cursor': next_cursor}
+
+    def _compute_recommendations(self, user_id: int, length: int = None, raw_user_data: Dict[str, Any] = None,
+                                 item_filter: ItemFilter = NO_FILTER) -> List[int]:
+        """
+        추천 파이프라인 실행 (선호도 조회 -> 사용자 벡터 -> 점수 계산 -> 재정렬)
+
+        Args:
+            length: 반환할 목록 길이 (None이면 top_k, 페이지네이션은 ranked_list_size)
+            raw_user_data: 이미 조회한 선호도 (None이면 DB에서 조회)
+            item_filter: 추천 대상 제한 조건
         """
         try:
-            self._logger.info(f"사용자 ID {user_id} 추천 시작")
+            self._logger.debug("사용자 ID %s 추천 시작", user_id)
+            length = length or self._settings['top_k']
+
+            # 선호도 데이터가 없는 신규 사용자는 점수 계산 없이 인기 목록 반환
+            if raw_user_data is None:
+                raw_user_data = self._user_queries.get_user_preferences(user_id)
+            if not raw_user_data:
+                self._logger.info("사용자 ID %s 선호도 없음 - 콜드 스타트 목록 반환", user_id)
+                self._record_path('cold_start')
+                return self._filtered_cold_start(user_id, length, item_filter)
 
             # 아이템 데이터 준비
             # 모든 컨텐츠 타입의 아이템을 하나의 리스트로 통합
-            self._logger.info(f"아이템 데이터 준비")
-            all_items,vectorizer = self.prepare_item_data()
-            all_item_vectors = []
-            if not all_items:
+            catalog = self._get_catalog()
+            vectorizer = catalog.vectorizer
+            if len(catalog) == 0:
                 self._logger.error("추천할 아이템 데이터가 없습니다.")
                 return []
 
-            self._logger.info(f"유저 데이터 전처리")
-            processed_user_data = self.prepare_user_data(user_id, vectorizer)
-            if processed_user_data is None:
-                self._logger.warning("사용자 데이터 전처리 실패")
-                return False
+            processed_user_data = self.prepare_user_data(user_id, vectorizer, raw_user_data)
+            if not processed_user_data:
+                self._logger.warning("사용자 데이터 전처리 실패 - 콜드 스타트 목록 반환")
+                self._record_path('cold_start')
+                return self._filtered_cold_start(user_id, length, item_filter)
 
             self.user_data[user_id] = {
                 'vector': processed_user_data[user_id]['vector'],
+                'vectorizer_version': catalog.vectorizer_version,
                 'last_updated': datetime.now()
             }
 
-            self._logger.info(f"사용자 ID {user_id}의 데이터 준비 완료1")
-
-            self._logger.info(f"\n=== 전체 아이템 데이터 로드 완료 (총 {len(all_items)}개) ===")
 
             ## 협력 필터링 추천 알고리즘 코드
             # # SVD 모델 준비
@@ -372,89 +784,194 @@ class RecommendationAlgorithm:
             # for idx, item in enumerate(all_items[:10]):
             #     self._logger.info(f"샘플 {idx} : {item}")
 
-            # 컨텐츠 타입별 아이템 수 로깅
-            type_counts = {}
-            for item in all_items:
-                if 'content_type' not in item:
-                    self._logger.error(f"content_type이 누락된 아이템 발견: {item.get('activity_id', 'id없음')}")
-                    continue
-                type_counts[item['content_type']] = type_counts.get(item['content_type'], 0) + 1
-            
-            for content_type, count in type_counts.items():
-                self._logger.info(f"{content_type}: {count}개 아이템")
-
             try:
-                self._logger.info(f"전체 아이템 수: {len(all_items)}")
-                recommendations = []
                 user_vector = self.user_data[user_id]['vector']  # 전처리된 사용자 벡터
                 # 사용자 벡터 전처리
-                if sp.issparse(user_vector):
-                    user_vector = user_vector.toarray()
-                if len(user_vector.shape) == 1:
+                if not sp.issparse(user_vector) and len(user_vector.shape) == 1:
                     user_vector = user_vector.reshape(1, -1)
 
-                # 각 아이템별 유사도 계산
-                for idx, item in enumerate(all_items, 1):
-                    try:
-                        item_vector = item['vector']
-                        if sp.issparse(item_vector):
-                            item_vector = item_vector.toarray()
-
-                        # 유사도 계산
-                        similarity = cosine_similarity(user_vector, item_vector)[0][0]
-                        
-                        # # SVD 모델을 사용하여 예측 평점 계산
-                        # activity_id = item['activity_id']
-                        # predicted_rating = svd_model.predict(user_id, activity_id)
-
-                        # 추천 아이템 정보 구성
-                        recommendation = {
-                           'activity_id': item['activity_id'],
-                            'title': item['title'],
-                            'content_type': item['content_type'],
-                            'genre_nm': item.get('genre_nm', ''),
-                            'keywords': item.get('keywords', ''),
-                            'similarity': float(similarity),
-                            # 'predicted_rating': predicted_rating  # 예측 평점
-                        }
-                            
-                        recommendations.append(recommendation)
-                            
-                        if idx % 100 == 0:  # 처리 진행상황 로깅
-                            self._logger.debug(f"진행 중: {idx}/{len(all_items)} 아이템 처리 완료")
-
-                    except Exception as e:
-                        self._logger.error(f"아이템 {idx} 처리 중 오류: {str(e)}")
-                        continue
-
-                # 유사도 기준 내림차순 정렬
-                recommendations.sort(key=lambda x: (-x['similarity'], x['activity_id']))
-        
-                # # 유사도와 예측 평점 기준 내림차순 정렬 - 예측 평점 우선
-                # recommendations.sort(key=lambda x: (-x['predicted_rating'], -x['similarity'], x['activity_id']))
-
-                # 상위 추천 결과 로깅
-                self._logger.info("=== 상위 추천 결과 ===")
-                for idx, item in enumerate(recommendations[:50], 1):
-                    self._logger.info(
-                        f"{idx}. {item['title']} "
-                        f"{item['activity_id']} "
-                        f"(유사도: {item['similarity']:.4f}, "
-                        f"장르: {item['genre_nm']})"
-                    )
+                mask = self._filter_mask(catalog, user_id, item_filter)
+                selected_rows, selected_sims = self._score(catalog, user_vector, top_k=length, mask=mask)
+
+                # 상위 추천 결과 로깅 (DEBUG 또는 샘플링된 요청만)
+                if payload_logging_enabled(self._logger):
+                    lines = []
+                    for idx, (row, similarity) in enumerate(zip(selected_rows, selected_sims), 1):
+                        lines.append(
+                            f"{idx}. {catalog.titles[row]} {catalog.activity_ids[row]} "
+                            f"(유사도: {similarity:.4f}, 장르: {catalog.genre(row)})"
+                        )
+                    log_payload(self._logger, "=== 상위 추천 결과 ===\n%s", '\n'.join(lines))
 
                 # ID만 추출하여 리스트로 반환
-                recommendations.sort(key=lambda x: x['similarity'], reverse=True)
-                recommendation_list = [item['activity_id'] for item in recommendations[:50]]
+                recommendation_list = catalog.ids_for(selected_rows)
+                if item_filter:
+                    self._record_path('scored', catalog_version=catalog.version,
+                                      filtered_items=int(mask.sum()) if mask is not None else len(catalog))
+                else:
+                    self._record_path('scored', catalog_version=catalog.version)
                 return recommendation_list
 
             except Exception as e:
-                self._logger.error(f"추천 계산 중 오류 발생: {str(e)}")
+                self._logger.error("추천 계산 중 오류 발생: %s", e)
                 raise
         except Exception as e:
-            self._logger.error(f"추천 생성 중 오류 발생: {str(e)}")
+            self._logger.error("추천 생성 중 오류 발생: %s", e)
+            return []
+
+    def _filter_mask(self, catalog: Catalog, user_id: int, item_filter: ItemFilter) -> Optional[np.ndarray]:
+        """필터 조건의 카탈로그 행 마스크 (조건이 없으면 None). 리뷰한 아이템 제외 시 REVIEW를 한 번 조회"""
+        if not item_filter:
+            return None
+        exclude_rows = ()
+        if item_filter.exclude_reviewed:
+            exclude_rows = catalog.rows_for(self._rating_queries.get_reviewed_activity_ids(user_id))
+        return catalog.bitsets.mask(item_filter, exclude_rows)
+
+    def _filtered_cold_start(self, user_id: int, length: int, item_filter: ItemFilter) -> List[int]:
+        """필터를 적용한 인기 목록 (전체 인기 순서를 유지한 채 마스크로 거름)"""
+        if not item_filter:
+            return self.get_cold_start_recommendations(k=length)
+        catalog = self._get_catalog()
+        mask = self._filter_mask(catalog, user_id, item_filter)
+        if mask is None:
+            # 리뷰 제외만 요청했는데 리뷰한 아이템이 없는 경우 등 -> 거를 행이 없음
+            return self.get_cold_start_recommendations(k=length)
+        popular_ids = np.asarray(catalog.popularity.get('all', []), dtype=np.int64)
+        rows = catalog.rows_for(popular_ids)
+        keep = (rows >= 0) & mask[np.maximum(rows, 0)]
+        return popular_ids[keep][:length].tolist()
+
+    def get_live_recommendations(self, user_id: int, session_keywords: List[str], k: int = None) -> List[int]:
+        """
+        진행 중인 챗봇 대화의 키워드를 반영한 추천 (DB 쓰기 없음).
+        메모리에 있는 사용자 선호 벡터에 대화 키워드 벡터를 더한 임시 벡터로 현재 카탈로그에서 점수를 계산합니다.
+        선호 벡터가 메모리에 없을 때만 PREFERENCE를 한 번 읽어 보관합니다.
+        """
+        k = min(k or self._settings['top_k'], self._settings['top_k'])
+        catalog = self._get_catalog()
+        if len(catalog) == 0:
             return []
 
+        vectors = []
+        base_vector = self._stored_user_vector(user_id, catalog)
+        if base_vector is not None and base_vector.nnz:
+            vectors.append(base_vector / np.sqrt(base_vector.multiply(base_vector).sum()))
+        if session_keywords:
+            keyword_vector = self.preprocessor.vectorize_keywords(session_keywords, catalog.vectorizer)
+            if keyword_vector.nnz:
+                weight = self._settings['live_keyword_weight']
+                vectors.append(keyword_vector * (weight / np.sqrt(keyword_vector.multiply(keyword_vector).sum())))
+
+        if not vectors:
+            self._record_path('cold_start')
+            return self.get_cold_start_recommendations(k=k)
+
+        # 정규화한 두 벡터의 합 (코사인 유사도 계산 시 다시 정규화됨)
+        user_vector = sp.csr_matrix(vectors[0] if len(vectors) == 1 else vectors[0] + vectors[1])
+        selected_rows, _ = self._score(catalog, user_vector)
+        self._record_path('live', catalog_version=catalog.version, session_keywords=len(session_keywords))
+        return catalog.ids_for(selected_rows[:k])
+
+    def invalidate_user(self, user_id) -> None:
+        """선호도가 바뀐 사용자의 보관된 선호 벡터를 버립니다. (/chatbot/save 저장 후 호출)"""
+        self.user_data.pop(user_id, None)
+
+    def _stored_user_vector(self, user_id: int, catalog: Catalog):
+        """
+        현재 vectorizer로 만든 사용자 선호 벡터 (없으면 PREFERENCE를 읽어 만들고 보관, 선호도가 없으면 None)
+        다른 워커/노드에서 저장한 선호도도 반영되도록 user_vector_ttl_s가 지난 값은 다시 읽습니다.
+        """
+        entry = self.user_data.get(user_id)
+        if (entry and entry.get('vectorizer_version') == catalog.vectorizer_version
+                and (datetime.now() - entry['last_updated']).total_seconds() < self._settings['user_vector_ttl_s']):
+            return entry['vector']
+
+        raw_user_data = self._user_queries.get_user_preferences(user_id)
+        if raw_user_data and self.prepare_user_data(user_id, catalog.vectorizer, raw_user_data):
+            return self.user_data[user_id]['vector']
+        # 선호도가 없는 사용자도 대화 중 매번 조회하지 않도록 빈 값을 보관
+        self.user_data[user_id] = {
+            'vector': None,
+            'vectorizer_version': catalog.vectorizer_version,
+            'last_updated': datetime.now()
+        }
+        return None
+
+    def _score(self, catalog: Catalog, user_vector, top_k: int = None, mask: np.ndarray = None):
+        """
+        점수 계산 풀이 있으면 풀에서, 없거나 실패하면 요청 스레드에서 계산
+        top_k가 후보 풀(candidate_pool)보다 크면 후보 풀도 top_k까지 넓혀 재정렬합니다.
+        mask(카탈로그 행 불리언 배열)가 있으면 False인 행은 후보 풀 선정 전에 제외합니다.
+        """
+        top_k = top_k or self._settings['top_k']
+        pool_size = max(self._settings['candidate_pool'], top_k)
+        selected = None
+        if self._scoring_pool is not None:
+            selected = self._score_in_pool(catalog, user_vector, top_k, pool_size, mask)
+        if selected is None:
+            selected = self._score_inline(catalog, user_vector, top_k, pool_size, mask)
+        return selected
+
+    def _score_inline(self, catalog: Catalog, user_vector, top_k: int, pool_size: int, mask: np.ndarray = None):
+        """요청 스레드에서 유사도 계산 -> 후보 풀 선정 -> 재정렬. (선택된 행, 유사도) 반환"""
+        # 전체 아이템과의 유사도를 한 번에 계산 (희소 행렬 연산)
+        with stage('recommend.scoring'):
+            similarities = cosine_similarity(user_vector, catalog.vector).ravel()
+
+        # 후보 풀 선정: 유사도 내림차순, 동점이면 activity_id 오름차순 (필터에서 제외된 행은 -inf)
+        with stage('recommend.sorting'):
+            pool_size = min(pool_size, len(catalog))
+            if mask is not None:
+                similarities = np.where(mask, similarities, -np.inf)
+                pool_size = min(pool_size, int(np.count_nonzero(mask)))
+            if pool_size <= 0:
+                return np.empty(0, dtype=np.int64), np.empty(0)
+            pool_rows = np.argpartition(-similarities, pool_size - 1)[:pool_size]
+            pool_rows = pool_rows[np.lexsort((catalog.activity_ids[pool_rows], -similarities[pool_rows]))]
+
+        # 다양성 재정렬 (MMR)
+        with stage('recommend.rerank'):
+            if self._settings['use_mmr'] and catalog.neighbor_rows is not None:
+                selected_rows = mmr_rerank(
+                    pool_rows,
+                    similarities[pool_rows],
+                    catalog.neighbor_rows,
+                    catalog.neighbor_sims,
+                    k=top_k,
+                    mmr_lambda=self._settings['mmr_lambda']
+                )
+            else:
+                selected_rows = pool_rows[:top_k]
+        return selected_rows, similarities[selected_rows]
+
+    def _score_in_pool(self, catalog: Catalog, user_vector, top_k: int, pool_size: int, mask: np.ndarray = None):
+        """
+        점수 계산 프로세스 풀에서 계산 (유사도, 후보 풀, MMR 모두 풀에서 처리).
+        풀 오류/시간 초과 시 None을 반환해 요청 스레드 계산으로 대체합니다.
+        """
+        try:
+            with stage('recommend.scoring'):
+                return self._scoring_pool.score(
+                    catalog,
+                    user_vector,
+                    pool_size=pool_size,
+                    top_k=top_k,
+                    use_mmr=self._settings['use_mmr'],
+                    mmr_lambda=self._settings['mmr_lambda'],
+                    mask=mask
+                )
+        except Exception as e:
+            self._logger.error("점수 계산 풀 오류 - 요청 스레드에서 계산: %s", e)
+            return None
+
+    def _record_path(self, path: str, **fields) -> None:
+        """추천 경로 카운터 증가 및 현재 요청 요약 로그에 필드 추가 (요청 밖이면 로그는 생략)"""
+        RECOMMENDATION_PATHS.inc(path=path)
+        req_log = current_request()
+        if req_log is not None:
+            req_log.set(path=path, **fields)
+
     def api_test_recommendation(self, user_id):
         try:
             if user_id == "1":
@@ -0,0 +1,58 @@
+## 다양성 재정렬 (MMR: Maximal Marginal Relevance)
+import numpy as np
+
+
+def mmr_rerank(candidate_rows, relevance, neighbor_rows: np.ndarray, neighbor_sims: np.ndarray,
+               k: int, mmr_lambda: float = 0.7) -> np.ndarray:
+    """
+    후보 아이템을 MMR 점수 기준으로 재정렬합니다.
+
+        MMR = λ * 관련도 - (1 - λ) * (이미 선택된 아이템과의 최대 유사도)
+
+    아이템 간 유사도는 사전 계산된 이웃 테이블에서만 조회합니다 (테이블에 없는 쌍은 0으로 간주).
+    따라서 요청마다 코사인 유사도를 다시 계산하지 않고 O(후보 수 x M) 조회로 처리됩니다.
+
+    Args:
+        candidate_rows: 후보 아이템의 카탈로그 행 인덱스
+        relevance: 후보별 관련도 점수 (candidate_rows와 같은 순서)
+        neighbor_rows: build_item_neighbors로 만든 이웃 행 인덱스 테이블
+        neighbor_sims: build_item_neighbors로 만든 이웃 유사도 테이블
+        k: 선택할 아이템 수
+        mmr_lambda: 관련도 가중치 (1.0이면 관련도 순 정렬과 동일)
+
+    Returns:
+        np.ndarray: 선택된 순서대로 정렬된 카탈로그 행 인덱스
+    """
+    candidate_rows = np.asarray(candidate_rows)
+    relevance = np.asarray(relevance, dtype=np.float64)
+    pool_size = candidate_rows.size
+    k = min(k, pool_size)
+    if k <= 0:
+        return candidate_rows[:0]
+
+    # 후보 풀 안에서만 유효한 이웃 링크 (양방향)
+    position = {int(row): pos for pos, row in enumerate(candidate_rows)}
+    links = [[] for _ in range(pool_size)]
+    for pos, row in enumerate(candidate_rows):
+        for neighbor, sim in zip(neighbor_rows[row], neighbor_sims[row]):
+            if neighbor < 0:
+                break
+            neighbor_pos = position.get(int(neighbor))
+            if neighbor_pos is not None:
+                links[pos].append((neighbor_pos, float(sim)))
+                links[neighbor_pos].append((pos, float(sim)))
+
+    max_sim = np.zeros(pool_size, dtype=np.float64)
+    available = np.ones(pool_size, dtype=bool)
+    selected = []
+    for _ in range(k):
+        scores = mmr_lambda * relevance - (1.0 - mmr_lambda) * max_sim
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        available[best] = False
+        for neighbor_pos, sim in links[best]:
+            if sim > max_sim[neighbor_pos]:
+                max_sim[neighbor_pos] = sim
+
+    return candidate_rows[selected]
@@ -0,0 +1,264 @@
+## 멀티 프로세스 점수 계산 풀
+## 카탈로그 행렬(CSR), activity_id, 이웃 테이블을 공유 메모리(multiprocessing.shared_memory)에 올려두고
+## 별도 프로세스에서 유사도 계산 -> 후보 풀 선정 -> MMR 재정렬까지 수행합니다. (웹 프로세스의 GIL 경합 회피)
+## 동시에 들어온 요청은 짧게 모아(micro-batch) 사용자 벡터를 쌓은 뒤 한 번의 행렬 곱으로 계산합니다.
+import atexit
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import scipy.sparse as sp
+
+from recommendation.reranker import mmr_rerank
+
+
+def _l2_normalize(matrix: sp.csr_matrix) -> sp.csr_matrix:
+    """행 단위 L2 정규화 (영벡터 행은 그대로). 정규화된 벡터끼리의 내적 = 코사인 유사도"""
+    matrix = sp.csr_matrix(matrix, dtype=np.float64, copy=True)
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    matrix.data /= np.repeat(norms, np.diff(matrix.indptr))
+    return matrix
+
+
+class _SharedCatalog:
+    """웹 프로세스 쪽: 한 카탈로그 버전의 공유 메모리 세그먼트 묶음"""
+
+    def __init__(self, catalog):
+        matrix = _l2_normalize(catalog.vector)
+        arrays = {
+            'data': matrix.data,
+            'indices': matrix.indices,
+            'indptr': matrix.indptr,
+            'activity_ids': catalog.activity_ids,
+        }
+        # 이웃 테이블을 아직 만들지 않은 카탈로그는 해당 세그먼트 없이 게시 (점수 계산 쪽은 MMR 생략)
+        if catalog.neighbor_rows is not None:
+            arrays['neighbor_rows'] = np.ascontiguousarray(catalog.neighbor_rows)
+            arrays['neighbor_sims'] = np.ascontiguousarray(catalog.neighbor_sims)
+        self.version = catalog.version
+        self._segments = []
+        self.descriptor = {'version': self.version, 'shape': matrix.shape, 'arrays': {}}
+        for name, array in arrays.items():
+            # 크기 0 세그먼트는 만들 수 없으므로 최소 1바이트
+            segment = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+            self._segments.append(segment)
+            self.descriptor['arrays'][name] = (segment.name, array.shape, array.dtype.str)
+
+    def release(self) -> None:
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments = []
+
+
+# ---- 점수 계산 프로세스 쪽 ----
+# 카탈로그 버전 -> (공유 메모리 세그먼트 목록, 배열 dict). 최근 두 버전만 유지
+_attached = {}
+
+
+def _attach(descriptor: Dict[str, Any]) -> Dict[str, Any]:
+    version = descriptor['version']
+    if version in _attached:
+        return _attached[version][1]
+
+    segments, arrays = [], {}
+    for name, (segment_name, shape, dtype) in descriptor['arrays'].items():
+        segment = shared_memory.SharedMemory(name=segment_name)
+        segments.append(segment)
+        arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+    # 복사 없이 공유 메모리 배열 위에 CSR 행렬 구성
+    matrix = sp.csr_matrix((arrays['data'], arrays['indices'], arrays['indptr']),
+                           shape=descriptor['shape'], copy=False)
+    arrays['matrix'] = matrix
+    _attached[version] = (segments, arrays)
+
+    for old_version in sorted(_attached)[:-2]:
+        old_segments, _ = _attached.pop(old_version)
+        for segment in old_segments:
+            try:
+                segment.close()
+            except BufferError:
+                # 아직 참조 중인 배열이 있으면 프로세스 종료 시 정리
+                pass
+    return arrays
+
+
+def _score_batch(descriptor: Dict[str, Any], user_matrix: sp.csr_matrix, pool_size: int, top_k: int,
+                 use_mmr: bool, mmr_lambda: float, masks: List[Optional[np.ndarray]] = None
+                 ) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    사용자 벡터 배치(b x V)에 대해 사용자별 (선택된 행, 해당 유사도)를 반환
+    masks: 사용자별 필터 비트셋 (np.packbits, None이면 전체 행)
+    """
+    arrays = _attach(descriptor)
+    matrix, activity_ids = arrays['matrix'], arrays['activity_ids']
+    n_items = matrix.shape[0]
+    pool_size = min(pool_size, n_items)
+    if pool_size <= 0:
+        return [(np.empty(0, dtype=np.int64), np.empty(0)) for _ in range(user_matrix.shape[0])]
+
+    # (N x V) @ (V x b) 한 번의 희소 곱으로 배치 전체의 유사도 계산
+    similarities = np.asarray((matrix @ _l2_normalize(user_matrix).T).toarray())
+
+    results = []
+    for col in range(similarities.shape[1]):
+        scores = similarities[:, col]
+        user_pool_size = pool_size
+        if masks is not None and masks[col] is not None:
+            allowed = np.unpackbits(masks[col], count=n_items).astype(bool)
+            scores = np.where(allowed, scores, -np.inf)
+            user_pool_size = min(pool_size, int(np.count_nonzero(allowed)))
+            if user_pool_size <= 0:
+                results.append((np.empty(0, dtype=np.int64), np.empty(0)))
+                continue
+        pool_rows = np.argpartition(-scores, user_pool_size - 1)[:user_pool_size]
+        pool_rows = pool_rows[np.lexsort((activity_ids[pool_rows], -scores[pool_rows]))]
+        if use_mmr and 'neighbor_rows' in arrays:
+            selected_rows = mmr_rerank(pool_rows, scores[pool_rows], arrays['neighbor_rows'],
+                                       arrays['neighbor_sims'], k=top_k, mmr_lambda=mmr_lambda)
+        else:
+            selected_rows = pool_rows[:top_k]
+        results.append((selected_rows, scores[selected_rows]))
+    return results
+
+
+class ScoringPool:
+    """
+    점수 계산 프로세스 풀.
+    score()는 요청 스레드에서 호출되며, 디스패처 스레드가 batch_wait_ms 동안(최대 max_batch개) 요청을 모아
+    카탈로그 버전별로 한 번씩 프로세스에 보냅니다.
+
+    풀과 공유 메모리 카탈로그는 웹 워커 프로세스마다 하나씩 생기므로, n_workers를 지정하지 않으면
+    CPU 코어 수를 웹 워커 수(web_workers)로 나눠 호스트 전체의 점수 계산 프로세스가 코어 수를 넘지 않게 합니다.
+    """
+
+    def __init__(self, n_workers: int = 0, max_batch: int = 32, batch_wait_ms: float = 2.0,
+                 timeout: float = 10.0, web_workers: int = 1):
+        self._n_workers = n_workers or max(1, (os.cpu_count() or 1) // max(1, web_workers))
+        self._max_batch = max_batch
+        self._batch_wait = batch_wait_ms / 1000
+        self._timeout = timeout
+        self._logger = logging.getLogger(__name__)
+
+        self._lock = threading.Lock()
+        self._executor = None
+        self._dispatcher = None
+        self._pending = queue.Queue()
+        self._shared = {}  # 카탈로그 버전 -> _SharedCatalog
+        self._closed = False
+
+    def _start(self) -> None:
+        # fork된 프로세스에 웹 서버 스레드/JVM 상태가 복제되지 않도록 spawn 사용
+        self._executor = ProcessPoolExecutor(max_workers=self._n_workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name='scoring-dispatcher', daemon=True)
+        self._dispatcher.start()
+        atexit.register(self.close)
+        self._logger.info("점수 계산 프로세스 풀 시작 (프로세스: %d, 최대 배치: %d, 대기: %.1fms)",
+                          self._n_workers, self._max_batch, self._batch_wait * 1000)
+
+    def _publish(self, catalog) -> None:
+        """카탈로그를 공유 메모리에 올림. 진행 중인 배치를 위해 직전 버전 하나는 남겨둠"""
+        if catalog.version in self._shared:
+            return
+        self._shared[catalog.version] = _SharedCatalog(catalog)
+        for version in sorted(self._shared)[:-2]:
+            self._shared.pop(version).release()
+        self._logger.info("점수 계산용 카탈로그 공유 메모리 게시 (버전: %d, 아이템: %d개)",
+                          catalog.version, len(catalog))
+
+    def score(self, catalog, user_vector, pool_size: int, top_k: int,
+              use_mmr: bool, mmr_lambda: float, mask: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        사용자 벡터 하나에 대해 (선택된 카탈로그 행, 유사도)를 반환합니다.
+        mask(행 불리언 배열)는 비트셋으로 압축해 보내므로 필터가 있어도 같은 배치로 묶입니다.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("점수 계산 풀이 종료되었습니다.")
+            if self._executor is None:
+                self._start()
+            if catalog.version not in self._shared:
+                self._publish(catalog)
+            descriptor = self._shared[catalog.version].descriptor
+
+        future = Future()
+        params = (pool_size, top_k, use_mmr, mmr_lambda)
+        bits = np.packbits(mask) if mask is not None else None
+        self._pending.put((descriptor, sp.csr_matrix(user_vector), params, bits, future))
+        return future.result(timeout=self._timeout)
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            first = self._pending.get()
+            if first is None:
+                return
+            batch = [first]
+            # 첫 요청 이후 batch_wait 동안 추가 요청을 모음
+            deadline = time.monotonic() + self._batch_wait
+            while len(batch) < self._max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._pending.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._pending.put(None)
+                    break
+                batch.append(item)
+
+            # 카탈로그 버전과 파라미터가 같은 요청끼리 한 번의 행렬 곱으로 처리
+            groups = {}
+            for descriptor, user_vector, params, bits, future in batch:
+                groups.setdefault((descriptor['version'], params), []).append((descriptor, user_vector, bits, future))
+            for (_, params), items in groups.items():
+                self._submit(items, params)
+
+    def _submit(self, items, params) -> None:
+        descriptor = items[0][0]
+        futures = [future for _, _, _, future in items]
+        try:
+            user_matrix = sp.vstack([user_vector for _, user_vector, _, _ in items], format='csr')
+            masks = [bits for _, _, bits, _ in items]
+            if all(bits is None for bits in masks):
+                masks = None
+            result = self._executor.submit(_score_batch, descriptor, user_matrix, *params, masks)
+        except Exception as e:
+            for future in futures:
+                future.set_exception(e)
+            return
+
+        def deliver(done):
+            try:
+                rows = done.result()
+            except Exception as e:
+                for future in futures:
+                    future.set_exception(e)
+                return
+            for future, row in zip(futures, rows):
+                future.set_result(row)
+
+        result.add_done_callback(deliver)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._executor is not None:
+                self._pending.put(None)
+                self._executor.shutdown(wait=True, cancel_futures=True)
+            for shared in self._shared.values():
+                shared.release()
+            self._shared = {}
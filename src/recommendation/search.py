@@ -0,0 +1,172 @@
+## 카탈로그 검색 (제목/장르/키워드)
+## 카탈로그를 만들 때 토큰 -> 행 postings 역색인을 함께 만들고, BM25의 문서 쪽 가중치를 미리 계산해 postings에 저장합니다.
+## 검색은 질의 토큰의 postings 가중치를 더하기만 하므로 MySQL을 조회하지 않고 postings 길이에 비례하는 시간에 끝납니다.
+## 단어가 일치하지 않는 부분 제목("어벤져" -> "어벤져스")은 제목 글자 bigram 색인으로 보완합니다.
+import re
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+_WORD = re.compile(r"\w+")
+_SPACES = re.compile(r"\s+")
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2  # 제목 단어는 장르/키워드보다 두 번 센 것으로 취급
+
+
+def word_tokens(text: str) -> List[str]:
+    return _WORD.findall(str(text).lower())
+
+
+def char_bigrams(text: str) -> List[str]:
+    """공백을 뺀 글자 bigram (한 글자면 그대로)"""
+    compact = _SPACES.sub('', str(text).lower())
+    if len(compact) < 2:
+        return [compact] if compact else []
+    return [compact[i:i + 2] for i in range(len(compact) - 1)]
+
+
+class InvertedIndex:
+    """
+    토큰 -> (행 인덱스, BM25 문서 가중치) postings. 토큰별 postings는 indptr로 나뉜 하나의 배열에 저장합니다.
+
+        가중치 = idf(t) * tf * (k1 + 1) / (tf + k1 * (1 - b + b * 문서 길이 / 평균 문서 길이))
+    """
+
+    def __init__(self, terms: Dict[str, int], indptr: np.ndarray, rows: np.ndarray, weights: np.ndarray):
+        self.terms = terms
+        self.indptr = indptr
+        self.rows = rows
+        self.weights = weights
+
+    @classmethod
+    def build(cls, documents: Sequence[Dict[str, int]], k1: float = BM25_K1, b: float = BM25_B) -> 'InvertedIndex':
+        """
+        Args:
+            documents: 행 순서의 {토큰: 빈도} (빈 문서 가능)
+        """
+        terms: Dict[str, int] = {}
+        term_ids, rows, tfs = [], [], []
+        doc_len = np.zeros(len(documents), dtype=np.float64)
+        for row, counts in enumerate(documents):
+            for term, tf in counts.items():
+                term_ids.append(terms.setdefault(term, len(terms)))
+                rows.append(row)
+                tfs.append(tf)
+                doc_len[row] += tf
+
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        rows = np.asarray(rows, dtype=np.int32)
+        tfs = np.asarray(tfs, dtype=np.float64)
+
+        # 토큰별로 모으기 (같은 토큰 안에서는 행 순서 유지)
+        order = np.argsort(term_ids, kind='stable')
+        term_ids, rows, tfs = term_ids[order], rows[order], tfs[order]
+        df = np.bincount(term_ids, minlength=len(terms))
+        indptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(df, out=indptr[1:])
+
+        n_docs = max(1, int(np.count_nonzero(doc_len)))
+        avg_len = doc_len.sum() / n_docs if n_docs else 1.0
+        idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+        norm = k1 * (1.0 - b + b * doc_len[rows] / max(avg_len, 1e-9))
+        weights = (idf[term_ids] * tfs * (k1 + 1.0) / (tfs + norm)).astype(np.float32)
+        return cls(terms, indptr, rows, weights)
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        term_id = self.terms.get(term)
+        if term_id is None:
+            return self.rows[:0], self.weights[:0]
+        lo, hi = self.indptr[term_id], self.indptr[term_id + 1]
+        return self.rows[lo:hi], self.weights[lo:hi]
+
+    def score(self, tokens: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """질의 토큰의 postings 가중치 합 -> (행, 점수). 일치하는 행만 반환 (순서 없음)"""
+        parts = [self.postings(term) for term in dict.fromkeys(tokens)]
+        parts = [part for part in parts if part[0].size]
+        if not parts:
+            return self.rows[:0], self.weights[:0]
+        if len(parts) == 1:
+            return parts[0]
+        rows = np.concatenate([part[0] for part in parts])
+        weights = np.concatenate([part[1] for part in parts])
+        unique_rows, inverse = np.unique(rows, return_inverse=True)
+        return unique_rows, np.bincount(inverse, weights=weights).astype(np.float32)
+
+    def nbytes(self) -> int:
+        return self.indptr.nbytes + self.rows.nbytes + self.weights.nbytes
+
+
+class SearchIndex:
+    """
+    words: 제목/장르/키워드 단어 색인, title_ngrams: 제목 글자 bigram 색인 (부분 제목 보완용)
+    """
+
+    def __init__(self, words: InvertedIndex, title_ngrams: InvertedIndex):
+        self.words = words
+        self.title_ngrams = title_ngrams
+
+    @classmethod
+    def build(cls, titles: Sequence[str], genres: Sequence[Sequence[str]],
+              keywords: Sequence[Sequence[str]]) -> 'SearchIndex':
+        """카탈로그 행 순서의 제목, 장르 목록, 키워드 목록으로 색인을 만듭니다."""
+        word_docs, ngram_docs = [], []
+        for title, row_genres, row_keywords in zip(titles, genres, keywords):
+            counts = {}
+            for token in word_tokens(title):
+                counts[token] = counts.get(token, 0) + TITLE_WEIGHT
+            for value in list(row_genres) + list(row_keywords):
+                for token in word_tokens(value):
+                    counts[token] = counts.get(token, 0) + 1
+            word_docs.append(counts)
+
+            ngrams = {}
+            for gram in char_bigrams(title):
+                ngrams[gram] = ngrams.get(gram, 0) + 1
+            ngram_docs.append(ngrams)
+        return cls(InvertedIndex.build(word_docs), InvertedIndex.build(ngram_docs))
+
+    def search(self, query: str, k: int, allowed: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        (행, 점수) 상위 k개 (점수 내림차순, 동점이면 행 순서)
+        단어 색인 결과가 k개보다 적으면 제목 bigram 색인 결과로 채웁니다. (bigram 결과는 단어 결과 뒤에 배치)
+
+        Args:
+            allowed: 카탈로그 행 불리언 마스크 (필터, None이면 전체)
+        """
+        rows, scores = self._top(self.words.score(word_tokens(query)), k, allowed)
+        if rows.size < k:
+            grams = char_bigrams(query)
+            ngram_rows, ngram_scores = self.title_ngrams.score(grams)
+            # 질의 bigram의 절반 이상이 제목에 있어야 부분 일치로 인정 (흔한 글자 하나만 겹치는 제목 제외)
+            if len(grams) > 1 and ngram_rows.size:
+                matched = np.zeros(ngram_rows.size, dtype=np.int64)
+                for gram in dict.fromkeys(grams):
+                    gram_rows, _ = self.title_ngrams.postings(gram)
+                    matched += np.isin(ngram_rows, gram_rows)
+                enough = matched * 2 >= len(set(grams))
+                ngram_rows, ngram_scores = ngram_rows[enough], ngram_scores[enough]
+            fresh = ~np.isin(ngram_rows, rows)
+            extra_rows, extra_scores = self._top((ngram_rows[fresh], ngram_scores[fresh]), k - rows.size, allowed)
+            rows = np.concatenate([rows, extra_rows])
+            scores = np.concatenate([scores, extra_scores])
+        return rows, scores
+
+    @staticmethod
+    def _top(result: Tuple[np.ndarray, np.ndarray], k: int, allowed: np.ndarray = None):
+        rows, scores = result
+        if allowed is not None and rows.size:
+            keep = allowed[rows]
+            rows, scores = rows[keep], scores[keep]
+        if k <= 0 or rows.size == 0:
+            return rows[:0].astype(np.int64), scores[:0]
+        if rows.size > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[top], scores[top]
+        order = np.lexsort((rows, -scores))
+        return rows[order].astype(np.int64), scores[order]
+
+    def nbytes(self) -> int:
+        return self.words.nbytes() + self.title_ngrams.nbytes() + \
+            sum(len(term) for term in self.words.terms) + sum(len(term) for term in self.title_ngrams.terms)
@@ -0,0 +1,52 @@
+## 아이템-아이템 유사도 이웃 테이블
+## 카탈로그 갱신 시점에 한 번 계산해두고, 요청 처리 중에는 조회만 합니다.
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+from typing import Tuple
+
+
+def build_item_neighbors(item_matrix, top_m: int = 20, block_size: int = 1024,
+                         min_similarity: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    아이템 벡터 행렬로부터 아이템별 상위 M개 이웃 테이블을 생성합니다.
+    전체 N x N 유사도 행렬을 만들지 않도록 block_size 행씩 희소-희소 곱을 계산합니다.
+
+    Args:
+        item_matrix: (아이템 수, 특성 수) 크기의 아이템 벡터 행렬
+        top_m: 아이템별로 저장할 이웃 수
+        block_size: 한 번에 계산할 행 수 (메모리 사용량 제한)
+        min_similarity: 이 값 이하의 유사도는 이웃으로 저장하지 않음
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (아이템 수, top_m) 크기의 이웃 행 인덱스(int32, 빈 칸은 -1)와
+        유사도(float32). 각 행은 유사도 내림차순으로 정렬되어 있습니다.
+    """
+    matrix = normalize(sp.csr_matrix(item_matrix, dtype=np.float32))
+    n_items = matrix.shape[0]
+    neighbor_rows = np.full((n_items, top_m), -1, dtype=np.int32)
+    neighbor_sims = np.zeros((n_items, top_m), dtype=np.float32)
+    if n_items == 0 or top_m <= 0:
+        return neighbor_rows, neighbor_sims
+
+    matrix_t = matrix.T.tocsr()
+    for start in range(0, n_items, block_size):
+        block = (matrix[start:start + block_size] @ matrix_t).tocsr()
+        for offset in range(block.shape[0]):
+            row = start + offset
+            lo, hi = block.indptr[offset], block.indptr[offset + 1]
+            cols = block.indices[lo:hi]
+            sims = block.data[lo:hi]
+
+            # 자기 자신과 임계값 이하 제외
+            keep = (cols != row) & (sims > min_similarity)
+            cols, sims = cols[keep], sims[keep]
+            if cols.size > top_m:
+                top = np.argpartition(-sims, top_m - 1)[:top_m]
+                cols, sims = cols[top], sims[top]
+
+            order = np.argsort(-sims, kind='stable')
+            neighbor_rows[row, :order.size] = cols[order]
+            neighbor_sims[row, :order.size] = sims[order]
+
+    return neighbor_rows, neighbor_sims
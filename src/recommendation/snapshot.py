@@ -0,0 +1,199 @@
+## 카탈로그 스냅샷 배포
+## 빌더 노드 하나가 MySQL에서 만든 카탈로그(ID/타입/장르 배열, CSR 벡터, vectorizer, 이웃 테이블, 인기 목록, 검색 색인)를
+## 공유 디렉터리에 버전별 파일로 쓰고, manifest.json을 원자적으로 교체해 새 버전을 알립니다.
+## 나머지 노드(CATALOG_SNAPSHOT_MODE=follow)는 manifest를 주기적으로 읽어 바뀐 버전만 불러오므로
+## 카탈로그 갱신마다 MySQL 전체 조회는 노드 수와 관계없이 한 번입니다.
+##
+## 주의: 메타데이터(vectorizer 등)는 pickle이므로 스냅샷 디렉터리는 빌더만 쓸 수 있는 신뢰된 위치여야 합니다.
+##
+## 단독 빌더 실행: python -m recommendation.snapshot  (update_interval마다 카탈로그 갱신 후 배포)
+import hashlib
+import json
+import logging
+import os
+import pickle
+import re
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import scipy.sparse as sp
+
+from config.settings import RECOMMENDATION_SETTINGS
+from recommendation.catalog import Catalog
+
+MANIFEST_NAME = 'manifest.json'
+SNAPSHOT_FORMAT = 1
+_SNAPSHOT_FILE = re.compile(r"^catalog-(?P<id>[\w.-]+)\.(?:npz|pkl)$")
+
+logger = logging.getLogger(__name__)
+
+
+def publish_snapshot(catalog: Catalog, directory: str, keep: int = 3) -> Dict[str, Any]:
+    """
+    카탈로그를 스냅샷 파일로 쓰고 manifest를 교체합니다.
+    데이터 파일을 모두 쓴 뒤 manifest를 os.replace로 바꾸므로, 읽는 쪽은 항상 완성된 버전만 보게 됩니다.
+
+    Args:
+        catalog: 이웃 테이블/인기 목록까지 채워진 카탈로그
+        directory: 공유 디렉터리 (모든 노드가 같은 경로로 접근)
+        keep: 남겨둘 최근 스냅샷 수 (불러오는 중인 노드가 있을 수 있으므로 2 이상 권장)
+
+    Returns:
+        새 manifest 내용
+    """
+    os.makedirs(directory, exist_ok=True)
+    snapshot_id = f"{datetime.now():%Y%m%d%H%M%S}-v{catalog.version}"
+    files = {'arrays': f"catalog-{snapshot_id}.npz", 'meta': f"catalog-{snapshot_id}.pkl"}
+
+    vector = sp.csr_matrix(catalog.vector)
+    arrays = {
+        'activity_ids': catalog.activity_ids,
+        'content_types': catalog.content_types,
+        'genre_codes': catalog.genre_codes,
+        'vector_data': vector.data,
+        'vector_indices': vector.indices,
+        'vector_indptr': vector.indptr,
+        'vector_shape': np.asarray(vector.shape, dtype=np.int64),
+    }
+    if catalog.neighbor_rows is not None:
+        arrays['neighbor_rows'] = catalog.neighbor_rows
+        arrays['neighbor_sims'] = catalog.neighbor_sims
+    meta = {
+        'type_names': catalog.type_names,
+        'genres': catalog.genres,
+        'titles': catalog.titles,
+        'vocabulary': catalog.vocabulary,
+        'popularity': catalog.popularity,
+        'vectorizer': catalog.vectorizer,
+        'search_index': catalog.search_index,
+    }
+
+    checksums = {
+        'arrays': _atomic_write(os.path.join(directory, files['arrays']), lambda f: np.savez(f, **arrays)),
+        'meta': _atomic_write(os.path.join(directory, files['meta']),
+                              lambda f: pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)),
+    }
+    manifest = {
+        'format': SNAPSHOT_FORMAT,
+        'snapshot_id': snapshot_id,
+        'catalog_version': catalog.version,
+        'created_at': catalog.last_updated.isoformat(),
+        'items': len(catalog),
+        'files': files,
+        'sha256': checksums,
+    }
+    _atomic_write(os.path.join(directory, MANIFEST_NAME),
+                  lambda f: f.write(json.dumps(manifest, ensure_ascii=False, indent=2).encode('utf-8')))
+    logger.info("카탈로그 스냅샷 배포 완료 (%s, 아이템: %d개)", snapshot_id, len(catalog))
+
+    _remove_old_snapshots(directory, keep=max(1, keep), current=snapshot_id)
+    return manifest
+
+
+def read_manifest(directory: str) -> Optional[Dict[str, Any]]:
+    """현재 manifest (아직 배포된 스냅샷이 없으면 None)"""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except FileNotFoundError:
+        return None
+    if manifest.get('format') != SNAPSHOT_FORMAT:
+        raise ValueError(f"지원하지 않는 스냅샷 형식: {manifest.get('format')}")
+    return manifest
+
+
+def load_snapshot(directory: str, manifest: Dict[str, Any]) -> Catalog:
+    """
+    manifest가 가리키는 스냅샷으로 카탈로그를 만듭니다. (체크섬이 다르면 ValueError)
+    반환된 카탈로그의 version/vectorizer_version은 배포한 노드의 값이므로, 불러온 쪽에서 자기 값으로 바꿔 씁니다.
+    """
+    paths = {name: os.path.join(directory, filename) for name, filename in manifest['files'].items()}
+    for name, path in paths.items():
+        if _sha256(path) != manifest['sha256'][name]:
+            raise ValueError(f"스냅샷 파일 체크섬 불일치: {path}")
+
+    with open(paths['meta'], 'rb') as f:
+        meta = pickle.load(f)
+    with np.load(paths['arrays'], allow_pickle=False) as arrays:
+        arrays = {key: arrays[key] for key in arrays.files}
+
+    vector = sp.csr_matrix(
+        (arrays['vector_data'], arrays['vector_indices'], arrays['vector_indptr']),
+        shape=tuple(int(n) for n in arrays['vector_shape'])
+    )
+    catalog = Catalog(arrays['activity_ids'], arrays['content_types'], arrays['genre_codes'],
+                      meta['genres'], meta['titles'], vector, meta['vectorizer'],
+                      vectorizer_version=0, version=manifest['catalog_version'])
+    if tuple(meta['type_names']) != catalog.type_names:
+        raise ValueError(f"컨텐츠 타입 구성이 다른 스냅샷: {meta['type_names']}")
+    catalog.neighbor_rows = arrays.get('neighbor_rows')
+    catalog.neighbor_sims = arrays.get('neighbor_sims')
+    catalog.popularity = meta['popularity']
+    catalog.vocabulary = meta['vocabulary']
+    catalog.search_index = meta['search_index']
+    catalog.snapshot_id = manifest['snapshot_id']
+    catalog.last_updated = datetime.fromisoformat(manifest['created_at'])
+    return catalog
+
+
+def _atomic_write(path: str, write: Callable) -> str:
+    """임시 파일에 쓴 뒤 os.replace로 교체하고 sha256을 반환합니다."""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        with open(tmp_path, 'wb') as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        checksum = _sha256(tmp_path)
+        os.replace(tmp_path, path)
+        return checksum
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _remove_old_snapshots(directory: str, keep: int, current: str) -> None:
+    snapshots = {}
+    for filename in os.listdir(directory):
+        match = _SNAPSHOT_FILE.match(filename)
+        if match:
+            path = os.path.join(directory, filename)
+            snapshots.setdefault(match.group('id'), []).append(path)
+    # 스냅샷 ID는 생성 시각으로 시작하므로 문자열 정렬 = 시간 순
+    stale = [snapshot_id for snapshot_id in sorted(snapshots) if snapshot_id != current][:-keep + 1 or None]
+    for snapshot_id in stale:
+        for path in snapshots[snapshot_id]:
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.warning("이전 스냅샷 파일 삭제 실패 (%s): %s", path, e)
+
+
+def main() -> None:
+    """카탈로그 빌더: update_interval마다 MySQL에서 카탈로그를 다시 만들어 배포합니다."""
+    from recommendation.recommendation import RecommendationAlgorithm
+
+    recommender = RecommendationAlgorithm({'snapshot_mode': 'publish'})
+    interval = RECOMMENDATION_SETTINGS['update_interval']
+    while True:
+        started = time.monotonic()
+        try:
+            recommender.refresh_catalog()
+        except Exception as e:
+            logger.error("카탈로그 갱신/배포 실패: %s", e)
+        time.sleep(max(1.0, interval - (time.monotonic() - started)))
+
+
+if __name__ == '__main__':
+    main()
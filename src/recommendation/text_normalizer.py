@@ -0,0 +1,87 @@
+## 아이템 텍스트 일괄 정규화
+## 카탈로그 전체를 컬럼 단위로 정규화하고, 대규모 재구성 시에는 청크로 나눠 여러 프로세스에서 처리합니다.
+## (이 모듈은 표준 라이브러리만 사용하므로 spawn 프로세스에서 가볍게 import됩니다)
+import hashlib
+import json
+from typing import Any, Dict, List, Sequence, Tuple
+
+# 텍스트에 사용하는 컬럼 (값 -> 별칭 컬럼 목록, 앞의 컬럼부터 사용)
+TEXT_FIELDS = {
+    'title': ('title',),
+    'description': ('description',),
+    'genre': ('genre',),
+    'actors': ('actors',),
+    'keywords': ('keywords',),
+}
+
+
+def extract_fields(item: Dict[str, Any]) -> Tuple[Any, ...]:
+    """아이템에서 텍스트 컬럼 값만 꺼낸 튜플 (TEXT_FIELDS 순서). 정규화 캐시에서 변경 여부 확인(content_digest)에도 사용합니다."""
+    values = []
+    for aliases in TEXT_FIELDS.values():
+        value = None
+        for name in aliases:
+            if item.get(name):
+                value = item[name]
+                break
+        values.append(tuple(value) if isinstance(value, list) else value)
+    return tuple(values)
+
+
+def content_digest(value) -> bytes:
+    """
+    텍스트/컬럼 튜플의 내용 지문 (sha1). 내장 hash()와 달리 충돌로 바뀐 아이템을 같은 것으로 볼 가능성이
+    사실상 없고, 원문 대신 20바이트만 보관하면 됩니다.
+    """
+    return hashlib.sha1(repr(value).encode('utf-8')).digest()
+
+
+def split_list(value) -> List[str]:
+    """
+    목록형 컬럼 값을 리스트로 변환합니다.
+    MySQL JSON 컬럼은 '["a", "b, c"]' 형태의 문자열로 오므로 JSON으로 파싱하고, 그 외 문자열은 쉼표로 나눕니다.
+    """
+    if not value:
+        return []
+    if isinstance(value, (list, tuple)):
+        return [str(v) for v in value]
+    value = str(value)
+    stripped = value.lstrip()
+    if stripped.startswith('['):
+        try:
+            parsed = json.loads(stripped)
+            if isinstance(parsed, list):
+                return [str(v) for v in parsed if v is not None]
+        except ValueError:
+            pass
+    return value.split(',')
+
+
+def _clean_list(value) -> List[str]:
+    return [part.lower().strip() for part in split_list(value) if part.strip()]
+
+
+def normalize_rows(rows: Sequence[Tuple[Any, ...]]) -> List[str]:
+    """
+    extract_fields 결과 목록을 컬럼 단위로 정규화해 아이템별 텍스트를 만듭니다.
+    제목은 가중치를 위해 두 번 넣습니다. (제목 x2, 설명, 장르, 배우/출연진, 키워드 순)
+    """
+    if not rows:
+        return []
+    titles, descriptions, genres, actors, keywords = zip(*rows)
+    titles = [title.lower() if title else '' for title in titles]
+    descriptions = [description.lower() if description else '' for description in descriptions]
+    genres = [_clean_list(value) for value in genres]
+    actors = [_clean_list(value) for value in actors]
+    keywords = [_clean_list(value) for value in keywords]
+
+    texts = []
+    for title, description, genre, actor, keyword in zip(titles, descriptions, genres, actors, keywords):
+        parts = [title, title] if title else []
+        if description:
+            parts.append(description)
+        parts.extend(genre)
+        parts.extend(actor)
+        parts.extend(keyword)
+        texts.append(' '.join(parts))
+    return texts
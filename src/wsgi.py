@@ -0,0 +1,6 @@
+## WSGI 진입점
+## gunicorn -c gunicorn_conf.py wsgi:app
+## 모델/카탈로그 미리 불러오기와 워커별 초기화는 gunicorn_conf.py의 훅에서 처리합니다.
+from app import app
+
+application = app
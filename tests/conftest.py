@@ -0,0 +1,46 @@
+## 테스트 공통 설정
+## src를 import 경로에 추가하고, sample_data.sql로 만든 로컬 SQLite DB(benchmarks.local_db)를 사용하도록 환경 변수를 설정합니다.
+## config.settings는 import 시점에 환경 변수를 읽으므로 애플리케이션 모듈보다 먼저 설정해야 합니다.
+import os
+import sys
+import tempfile
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, os.path.abspath(SRC_DIR))
+
+_DB_DIR = tempfile.mkdtemp(prefix='forest-test-')
+os.environ['DB_BACKEND'] = 'sqlite'
+os.environ['SQLITE_PATH'] = os.path.join(_DB_DIR, 'forest_test.db')
+os.environ.setdefault('OPENAI_API_KEY', 'test')
+os.environ['METRICS_ENABLED'] = 'false'
+
+
+@pytest.fixture(scope='session')
+def local_db():
+    """sample_data.sql + 합성 아이템/사용자로 만든 SQLite DB 경로"""
+    from benchmarks.local_db import build_local_db
+    path = os.environ['SQLITE_PATH']
+    if not os.path.exists(path):
+        build_local_db(path, n_items=500, n_users=50, reviews_per_user=5, seed=7)
+    return path
+
+
+@pytest.fixture(scope='session')
+def app(local_db):
+    """추천 API만 등록한 앱 (카탈로그 미리 생성)"""
+    import app as app_module
+    flask_app = app_module.create_app('recommendations')
+    flask_app.extensions['forest'].preload()
+    return flask_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def recommender(app):
+    return app.extensions['forest'].recommender
@@ -0,0 +1,49 @@
+import pickle
+
+import pytest
+
+from recommendation.analyzer import KoreanAnalyzer
+
+
+def test_rules_backend_strips_particles_and_endings():
+    analyzer = KoreanAnalyzer(backend='rules')
+    assert analyzer('감동적인 로맨스는') == ['감동', '로맨스', '감동 로맨스']
+    assert analyzer('감동적 로맨스를') == ['감동', '로맨스', '감동 로맨스']
+    # 어간이 두 글자 미만으로 남으면 그대로, 영문/숫자는 소문자만
+    assert analyzer('차는 SF 2024') == ['차는', 'sf', '2024', '차는 sf', 'sf 2024']
+
+
+def test_each_surface_word_is_analyzed_once():
+    analyzer = KoreanAnalyzer(backend='rules')
+    analyzer('가족 영화 가족')
+    analyzer('가족 영화')
+    assert analyzer.stats()['misses'] == 2
+    assert analyzer.stats()['hits'] == 3
+    assert analyzer.stats()['size'] == 2
+
+
+def test_cache_file_round_trip(tmp_path):
+    path = str(tmp_path / 'tokens.json')
+    analyzer = KoreanAnalyzer(backend='rules', cache_path=path)
+    analyzer('감동적인 드라마')
+    assert analyzer.save() == path
+    assert analyzer.save() is None  # 새로 분석한 어절이 없으면 다시 쓰지 않음
+
+    reloaded = KoreanAnalyzer(backend='rules', cache_path=path)
+    assert reloaded('감동적인 드라마') == ['감동', '드라마', '감동 드라마']
+    assert reloaded.stats()['misses'] == 0
+    # backend가 다른 캐시는 사용하지 않음
+    assert KoreanAnalyzer(backend='okt', cache_path=path).stats()['size'] == 0
+
+
+def test_pickled_analyzer_keeps_cache_without_runtime_state():
+    analyzer = KoreanAnalyzer(backend='rules')
+    analyzer('감동적인 드라마')
+    restored = pickle.loads(pickle.dumps(analyzer))
+    assert restored('감동적인 드라마') == analyzer('감동적인 드라마')
+    assert restored.stats()['size'] == 2
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        KoreanAnalyzer(backend='mecab')
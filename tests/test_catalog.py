@@ -0,0 +1,52 @@
+import numpy as np
+import scipy.sparse as sp
+
+from recommendation.catalog import Catalog
+
+ITEMS = [
+    {'activity_id': 30, 'title': '가족 영화', 'content_type': 'movie', 'genre_nm': '드라마', 'keywords': '["가족"]'},
+    {'activity_id': 10, 'title': '빈 텍스트', 'content_type': 'movie', 'genre_nm': '드라마'},
+    {'activity_id': 20, 'title': '뮤지컬', 'content_type': 'performance', 'genre': '뮤지컬'},
+    {'activity_id': 5, 'title': '사진전', 'content_type': 'exhibition', 'genre_nm': '드라마'},
+]
+ROWS = [0, 2, 3]  # 1번 아이템은 텍스트가 없어 제외된 경우
+
+
+def _catalog(rows=ROWS):
+    vector = sp.random(len(rows), 8, density=0.5, format='csr', random_state=0)
+    return Catalog.from_rows(ITEMS, rows, vector, vectorizer=None, vectorizer_version=1)
+
+
+def test_ids_and_rows_round_trip():
+    catalog = _catalog()
+    assert catalog.ids_for([0, 1, 2]) == [30, 20, 5]
+    rows = catalog.rows_for([5, 30, 20, 10, 999])
+    assert rows.tolist() == [2, 0, 1, -1, -1]
+    assert catalog.ids_for(rows[:3]) == [5, 30, 20]
+    assert catalog.row_for(20) == 1
+
+
+def test_columns_are_compact_and_shared():
+    catalog = _catalog()
+    assert catalog.activity_ids.dtype == np.int64 and catalog.content_types.dtype == np.int8
+    assert catalog.genres == ['', '드라마', '뮤지컬']  # 장르 문자열은 한 번만 저장
+    assert catalog.genre_codes.tolist() == [1, 2, 1]
+    assert [catalog.content_type(row) for row in range(3)] == ['movie', 'performance', 'exhibition']
+    assert catalog.type_counts() == {'movie': 1, 'performance': 1, 'exhibition': 1}
+    assert '가족' in catalog.vocabulary
+    assert catalog.nbytes() > 0
+
+
+def test_empty_catalog_and_missing_neighbor_table():
+    empty = _catalog(rows=[])
+    assert len(empty) == 0 and empty.rows_for([1]).tolist() == [-1]
+    rows, sims = _catalog().neighbors(0)
+    assert rows.size == 0 and sims.size == 0
+
+
+def test_fingerprint_depends_on_content_not_version():
+    first, second = _catalog(), _catalog()
+    second.version = 7
+    assert first.fingerprint() == second.fingerprint()
+    changed = Catalog.from_rows(ITEMS, [0, 2], first.vector[:2], vectorizer=None, vectorizer_version=1)
+    assert changed.fingerprint() != first.fingerprint()
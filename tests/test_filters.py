@@ -0,0 +1,72 @@
+import sqlite3
+
+import numpy as np
+
+from recommendation.filters import AttributeBitsets, ItemFilter, NO_FILTER
+
+NO_PREFERENCE_USER = 999999
+
+
+def _bitsets():
+    content_types = np.array([0, 1, 2, 0, 1], dtype=np.int8)
+    genre_codes = np.array([0, 1, 2, 1, 0], dtype=np.int32)
+    return AttributeBitsets(content_types, ('movie', 'performance', 'exhibition'), genre_codes,
+                            ['드라마, 코미디', '멜로/로맨스', ''])
+
+
+def test_item_filter_normalizes_request_values():
+    item_filter = ItemFilter.create(content_types='Movie, performance', genres=['드라마', ' 드라마 '],
+                                    valid_types=('movie', 'performance', 'exhibition'))
+    assert item_filter.content_types == ('movie', 'performance')
+    assert item_filter.genres == ('드라마',)
+    assert item_filter and not NO_FILTER
+
+
+def test_item_filter_rejects_unknown_content_type():
+    try:
+        ItemFilter.create(content_types='tv', valid_types=('movie',))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('ValueError가 발생해야 합니다.')
+
+
+def test_mask_combines_type_genre_and_excluded_rows():
+    bitsets = _bitsets()
+    assert bitsets.mask(NO_FILTER) is None
+    assert bitsets.mask(ItemFilter(exclude_reviewed=True), exclude_rows=[]) is None
+
+    mask = bitsets.mask(ItemFilter(content_types=('movie',), genres=('로맨스',)))
+    assert mask.tolist() == [False, False, False, True, False]
+
+    mask = bitsets.mask(ItemFilter(genres=('코미디',), exclude_reviewed=True), exclude_rows=[4, -1])
+    assert mask.tolist() == [True, False, False, False, False]
+
+
+def test_cold_start_exclude_reviewed_without_reviews(client):
+    # 선호도도 리뷰도 없는 사용자가 exclude_reviewed만 보내면 필터 마스크가 None -> 인기 목록 그대로
+    response = client.post('/recommendations', json={'user_id': NO_PREFERENCE_USER, 'exclude_reviewed': True})
+    assert response.json['status'] == 'success'
+    assert response.json['recommendations']
+
+    response = client.post('/recommendations',
+                           json={'user_id': NO_PREFERENCE_USER, 'exclude_reviewed': True, 'limit': 5})
+    assert response.json['status'] == 'success'
+    assert len(response.json['recommendations']) == 5
+
+
+def test_filtered_recommendations_match_filter(client, recommender, local_db):
+    conn = sqlite3.connect(local_db)
+    user_id, = conn.execute(
+        "SELECT r.user_id FROM REVIEW r JOIN PREFERENCE p ON p.user_id = r.user_id "
+        "GROUP BY r.user_id ORDER BY COUNT(*) DESC LIMIT 1").fetchone()
+    reviewed = {row[0] for row in conn.execute("SELECT activity_id FROM REVIEW WHERE user_id = ?", (user_id,))}
+    conn.close()
+
+    response = client.post('/recommendations',
+                           json={'user_id': user_id, 'content_type': 'movie', 'exclude_reviewed': True})
+    recommendations = response.json['recommendations']
+    assert recommendations
+    catalog = recommender.current_catalog
+    assert {catalog.content_type(row) for row in catalog.rows_for(recommendations)} == {'movie'}
+    assert not reviewed & set(recommendations)
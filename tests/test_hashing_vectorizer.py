@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from recommendation.preprocessor import DataPreprocessor
+
+GENRES = ['드라마', '코미디', '액션']
+
+
+def _items(ids, changed=()):
+    return [{'activity_id': i, 'content_type': 'movie', 'title': f"영화 {i} {'새' if i in changed else ''}",
+             'genre_nm': GENRES[i % 3], 'keywords': '["가족"]'} for i in ids]
+
+
+def _preprocessor():
+    return DataPreprocessor(vectorizer_mode='hashing', hashing_features=2 ** 12)
+
+
+def test_incremental_document_frequency_equals_full_rebuild():
+    incremental = _preprocessor()
+    incremental.preprocess_items(_items(range(100)))
+    # 0-9 삭제, 100-119 추가, 50/51 내용 변경
+    latest = _items(list(range(10, 120)), changed={50, 51})
+    updated = incremental.preprocess_items(latest)
+
+    rebuilt = _preprocessor()
+    expected = rebuilt.preprocess_items(latest)
+    assert incremental._hashing.n_docs == rebuilt._hashing.n_docs == 110
+    assert np.array_equal(incremental._hashing.df, rebuilt._hashing.df)
+    assert abs(updated['vector'] - expected['vector']).max() < 1e-12
+
+
+def test_failed_refresh_leaves_document_frequency_untouched(monkeypatch):
+    preprocessor = _preprocessor()
+    preprocessor.preprocess_items(_items(range(50)))
+    df, n_docs = preprocessor._hashing.df.copy(), preprocessor._hashing.n_docs
+    hashed_items = dict(preprocessor._hashed_items)
+
+    def fail(*args, **kwargs):
+        raise RuntimeError('weight failed')
+    monkeypatch.setattr(preprocessor._hashing, 'weight', fail)
+    with pytest.raises(RuntimeError):
+        preprocessor._hash_items([('movie', i) for i in range(20, 80)], [f'영화 {i}' for i in range(20, 80)])
+
+    assert preprocessor._hashed_items == hashed_items
+    assert np.array_equal(preprocessor._hashing.df, df) and preprocessor._hashing.n_docs == n_docs
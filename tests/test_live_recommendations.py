@@ -0,0 +1,39 @@
+import json
+import sqlite3
+
+USER_ID = 999998
+
+
+def _save_preference(path, like_words):
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "INSERT INTO PREFERENCE (user_id, movie_genre_preference, performance_genre_preference, "
+        "exhibition_genre_preference, like_words, created_at) VALUES (?, '[]', '[]', '[]', ?, '2999-01-01')",
+        (USER_ID, json.dumps(like_words, ensure_ascii=False)))
+    conn.commit()
+    conn.close()
+
+
+def test_saved_preferences_invalidate_stored_vector(app, recommender, local_db):
+    # 선호도가 없는 사용자는 '없음'이 보관되어 인기 목록을 받음
+    assert recommender._stored_user_vector(USER_ID, recommender.current_catalog) is None
+    cold_start = recommender.get_live_recommendations(USER_ID, [], k=10)
+    assert cold_start == recommender.get_cold_start_recommendations(k=10)
+
+    _save_preference(local_db, ['드라마', '가족'])
+    # 저장 경로(/chatbot/save)에서 호출하는 무효화
+    app.extensions['forest'].preferences_changed(USER_ID)
+
+    assert recommender._stored_user_vector(USER_ID, recommender.current_catalog) is not None
+    assert recommender.get_live_recommendations(USER_ID, [], k=10) != cold_start
+
+
+def test_stored_vector_expires_after_ttl(recommender, monkeypatch):
+    catalog = recommender.current_catalog
+    recommender.invalidate_user(USER_ID + 1)
+    assert recommender._stored_user_vector(USER_ID + 1, catalog) is None
+    recommender.user_data[USER_ID + 1]['vector'] = 'stale'
+    assert recommender._stored_user_vector(USER_ID + 1, catalog) == 'stale'
+
+    monkeypatch.setitem(recommender._settings, 'user_vector_ttl_s', 0)
+    assert recommender._stored_user_vector(USER_ID + 1, catalog) is None
@@ -0,0 +1,82 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from chatbot.llm_client import CircuitBreaker, LLMClient, LLMUnavailableError
+
+
+class _FakeOpenAI:
+    """chat.completions.create만 흉내 내는 클라이언트 (응답 지연/실패를 호출 순서별로 지정)"""
+
+    def __init__(self, behaviours):
+        self._behaviours = list(behaviours)
+        self.calls = 0
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def with_options(self, **options):
+        return self
+
+    def _create(self, **request):
+        with self._lock:
+            behaviour = self._behaviours[min(self.calls, len(self._behaviours) - 1)]
+            self.calls += 1
+        delay, content = behaviour
+        time.sleep(delay)
+        if isinstance(content, Exception):
+            raise content
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _client(behaviours, **settings):
+    client = LLMClient(api_key='test', settings={'hedge_enabled': False, **settings})
+    client._client = _FakeOpenAI(behaviours)
+    return client
+
+
+def test_breaker_opens_after_consecutive_failures_and_probes_once():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+    breaker.record_failure()
+    assert breaker.state == 'open' and not breaker.allow()
+
+    time.sleep(0.06)
+    assert breaker.state == 'half_open'
+    assert breaker.allow() and not breaker.allow()  # 시험 호출은 하나만
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == 'closed' and breaker.allow()
+
+
+def test_open_breaker_short_circuits_without_calling_api():
+    client = _client([(0, RuntimeError('500'))], breaker_failures=2, breaker_reset_s=60)
+    for _ in range(2):
+        with pytest.raises(LLMUnavailableError):
+            client.complete('keywords', [], model='m')
+    calls = client._client.calls
+
+    with pytest.raises(LLMUnavailableError, match='서킷 브레이커'):
+        client.complete('keywords', [], model='m')
+    assert client._client.calls == calls
+
+
+def test_deadline_bounds_slow_calls():
+    client = _client([(0.5, 'late')])
+    start = time.monotonic()
+    with pytest.raises(LLMUnavailableError, match='시간 초과'):
+        client.complete('keywords', [], model='m', timeout=0.1)
+    assert time.monotonic() - start < 0.4
+
+
+def test_hedge_returns_faster_duplicate():
+    client = _client([(0.5, 'primary'), (0, 'hedge')], hedge_enabled=True, hedge_initial_delay_s=0.05)
+    start = time.monotonic()
+    assert client.complete('keywords', [], model='m', timeout=2) == 'hedge'
+    assert time.monotonic() - start < 0.4
@@ -0,0 +1,62 @@
+import pytest
+
+from chatbot.keyword_examples import PREFERENCE_KEYWORD_EXAMPLES
+from chatbot.local_keywords import KeywordTrie, LocalKeywordExtractor, clause_polarity
+
+
+@pytest.fixture
+def extractor():
+    extractor = LocalKeywordExtractor(PREFERENCE_KEYWORD_EXAMPLES)
+    extractor.set_vocabulary(['사랑', '다큐멘터리'], version=1)
+    return extractor
+
+
+def test_trie_prefers_longest_match():
+    trie = KeywordTrie(['로맨스', '로맨스 코미디', 'sf'])
+    assert [term for _, _, term in trie.find('로맨스 코미디랑 sf 좋아요')] == ['로맨스 코미디', 'sf']
+    assert trie.find('sfx') == []  # 영문 어휘는 단어 경계에서만
+
+
+def test_clear_preferences_stay_local(extractor):
+    result = extractor.extract('스릴러 좋아해요. 공포는 별로예요', ['스릴러', '공포'])
+    assert result.confident and result.keywords == ['스릴러']
+    assert result.polarity == {'스릴러': 'positive', '공포': 'negative'}
+
+
+@pytest.mark.parametrize('text', ['스릴러 안 좋은 편', '스릴러는 안좋아요', '스릴러 좋아하지 않아요'])
+def test_negated_clauses(extractor, text):
+    result = extractor.extract(text, ['스릴러'])
+    assert result.keywords == []
+    assert result.polarity == {'스릴러': 'negative'}
+
+
+@pytest.mark.parametrize('text, nouns', [
+    ('감동 있는 드라마는 잘 모르겠어요', ['감동', '드라마']),
+    ('요즘 힐링 좋은지 모르겠어요', ['힐링']),
+    ('글쎄요, 로맨스 좋아하긴 하는데', ['로맨스']),
+    ('코미디 재밌을까요', ['코미디']),
+])
+def test_hedged_clauses_go_to_gpt(extractor, text, nouns):
+    result = extractor.extract(text, nouns)
+    assert not result.confident
+    assert 'positive' not in result.polarity.values()
+
+
+def test_question_clause_goes_to_gpt(extractor):
+    result = extractor.extract('스릴러 좋아해요? 음악은 좋아요', ['스릴러', '음악'])
+    assert not result.confident and result.reason == 'uncertain_polarity'
+    assert result.polarity == {'스릴러': 'neutral', '음악': 'positive'}
+
+
+def test_matched_terms_do_not_vote_for_themselves(extractor):
+    # '감동', '사랑'은 어휘이면서 긍정 표현이기도 하지만, 절에 다른 긍정 표현이 없으면 극성을 정하지 않음
+    result = extractor.extract('감동 다큐멘터리', ['감동', '다큐멘터리'])
+    assert not result.confident
+    assert extractor.extract('사랑 이야기가 좋아요', ['사랑', '이야기']).polarity == {'사랑': 'positive'}
+
+
+def test_clause_polarity_rules():
+    assert clause_polarity('정말 좋아해요') == 'positive'
+    assert clause_polarity('정말 좋아해요', '?') == 'neutral'
+    assert clause_polarity('안 좋은 편') == 'negative'
+    assert clause_polarity('좋은지 모르겠어요') == 'neutral'
@@ -0,0 +1,48 @@
+from monitoring.metrics import REGISTRY, MetricsRegistry
+
+
+def test_counter_and_histogram_render_prometheus_text():
+    registry = MetricsRegistry(enabled=True)
+    counter = registry.counter('forest_test_total', '테스트 카운터', ['path'])
+    histogram = registry.histogram('forest_test_seconds', '테스트 지연', ['stage'], buckets=(0.1, 1.0))
+    registry.gauge_callback('forest_test_size', '테스트 게이지', lambda: {('a"b',): 3}, ['name'])
+    counter.inc(path='scored')
+    counter.inc(2, path='scored')
+    histogram.observe(0.05, stage='db')
+    histogram.observe(0.5, stage='db')
+    histogram.observe(5, stage='db')
+
+    assert registry.render().splitlines() == [
+        '# HELP forest_test_total 테스트 카운터',
+        '# TYPE forest_test_total counter',
+        'forest_test_total{path="scored"} 3',
+        '# HELP forest_test_seconds 테스트 지연',
+        '# TYPE forest_test_seconds histogram',
+        'forest_test_seconds_bucket{stage="db",le="0.1"} 1',
+        'forest_test_seconds_bucket{stage="db",le="1.0"} 2',
+        'forest_test_seconds_bucket{stage="db",le="+Inf"} 3',
+        'forest_test_seconds_sum{stage="db"} 5.55',
+        'forest_test_seconds_count{stage="db"} 3',
+        '# HELP forest_test_size 테스트 게이지',
+        '# TYPE forest_test_size gauge',
+        'forest_test_size{name="a\\"b"} 3',
+    ]
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    counter = registry.counter('forest_test_total', '테스트 카운터')
+    counter.inc()
+    assert counter.value() == 0
+
+
+def test_metrics_endpoint(client, monkeypatch):
+    assert client.get('/metrics').status_code == 404  # 테스트 환경은 METRICS_ENABLED=false
+
+    monkeypatch.setattr(REGISTRY, 'enabled', True)
+    client.post('/recommendations', json={'user_id': 1, 'limit': 5})
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+    assert 'version=0.0.4' in response.headers['Content-Type']
+    assert '# TYPE forest_request_duration_seconds histogram' in response.text
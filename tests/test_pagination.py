@@ -0,0 +1,79 @@
+import json
+import sqlite3
+
+import pytest
+
+from recommendation.filters import ItemFilter
+from recommendation.pagination import decode_cursor, encode_cursor
+
+USER_ID = 1
+
+
+def _pages(client, limit, **body):
+    seen, cursor = [], None
+    while True:
+        data = client.post('/recommendations', json={'user_id': USER_ID, 'cursor': cursor, 'limit': limit, **body}).json
+        assert data['status'] == 'success'
+        seen += data['recommendations']
+        cursor = data['next_cursor']
+        if cursor is None:
+            return seen
+
+
+def test_cursor_round_trip_keeps_filter():
+    item_filter = ItemFilter(('movie',), ('드라마',), True)
+    cursor = encode_cursor(USER_ID, 'abc', 'catalog01', 40, item_filter)
+    assert decode_cursor(cursor, USER_ID) == {
+        'fingerprint': 'abc', 'catalog_id': 'catalog01', 'offset': 40, 'item_filter': item_filter
+    }
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, USER_ID + 1)
+    with pytest.raises(ValueError):
+        decode_cursor('not-a-cursor', USER_ID)
+
+
+def test_pages_cover_ranked_list_without_duplicates(client, recommender):
+    seen = _pages(client, 37)
+    assert len(seen) == len(set(seen))
+    assert len(seen) == min(recommender._settings['ranked_list_size'], len(recommender.current_catalog))
+
+
+def test_cursor_from_another_process_with_same_catalog(client, recommender):
+    first = client.post('/recommendations', json={'user_id': USER_ID, 'limit': 10}).json
+    expected = client.post('/recommendations', json={'user_id': USER_ID, 'limit': 10,
+                                                     'cursor': first['next_cursor']}).json['recommendations']
+    # 다른 워커: 순위 목록 캐시가 비어 있어도 같은 내용의 카탈로그면 같은 다음 페이지
+    recommender._ranked_lists.clear()
+    replayed = client.post('/recommendations', json={'user_id': USER_ID, 'limit': 10,
+                                                     'cursor': first['next_cursor']}).json
+    assert replayed['recommendations'] == expected
+
+
+def test_cursor_from_different_catalog_is_rejected(client, recommender):
+    first = client.post('/recommendations', json={'user_id': USER_ID, 'limit': 10}).json
+    position = decode_cursor(first['next_cursor'], USER_ID)
+    # 같은 버전 번호라도 내용이 다른 카탈로그(다른 워커/노드)에서 만든 커서
+    foreign = encode_cursor(USER_ID, position['fingerprint'], 'other-catalog', position['offset'])
+    recommender._ranked_lists.clear()
+    response = client.post('/recommendations', json={'user_id': USER_ID, 'limit': 10, 'cursor': foreign})
+    assert response.status_code == 400
+
+
+def test_cursor_after_preference_change_is_rejected(client, recommender, local_db):
+    user_id = 1000000
+    first = client.post('/recommendations', json={'user_id': user_id, 'limit': 10}).json
+    # 스크롤 도중 선호도 저장 (다음 요청이 캐시가 없는 다른 워커로 간 경우)
+    conn = sqlite3.connect(local_db)
+    (original,) = conn.execute("SELECT like_words FROM PREFERENCE WHERE user_id = ?", (user_id,)).fetchone()
+    conn.execute("UPDATE PREFERENCE SET like_words = ? WHERE user_id = ?",
+                 (json.dumps(['공포', '스릴러'], ensure_ascii=False), user_id))
+    conn.commit()
+    try:
+        recommender._ranked_lists.clear()
+        response = client.post('/recommendations', json={'user_id': user_id, 'limit': 10,
+                                                         'cursor': first['next_cursor']})
+        assert response.status_code == 400
+    finally:
+        conn.execute("UPDATE PREFERENCE SET like_words = ? WHERE user_id = ?", (original, user_id))
+        conn.commit()
+        conn.close()
@@ -0,0 +1,33 @@
+from recommendation.popularity import build_popularity_lists
+
+IDS = [1, 2, 3, 4, 5]
+TYPES = ['movie', 'movie', 'movie', 'performance', 'exhibition']
+STATS = [
+    {'activity_id': 1, 'review_count': 1, 'avg_rate': 5.0},    # 리뷰 하나뿐인 만점
+    {'activity_id': 2, 'review_count': 50, 'avg_rate': 4.6},
+    {'activity_id': 3, 'review_count': 40, 'avg_rate': 2.0},
+    {'activity_id': 4, 'review_count': 0, 'avg_rate': None},
+]
+
+
+def test_bayesian_average_ranks_well_reviewed_items_first():
+    popularity = build_popularity_lists(IDS, TYPES, STATS, prior_count=5)
+    assert popularity['movie'] == [2, 1, 3]
+    assert popularity['performance'] == [4] and popularity['exhibition'] == [5]
+
+
+def test_all_list_interleaves_types_in_content_type_order():
+    popularity = build_popularity_lists(IDS, TYPES, STATS)
+    assert popularity['all'] == [2, 4, 5, 1, 3]
+
+
+def test_editorial_pins_come_first_once_and_must_exist():
+    popularity = build_popularity_lists(IDS, TYPES, STATS, editorial_ids=[3, 999, 3, 5])
+    assert popularity['all'] == [3, 5, 2, 4, 1]
+    assert popularity['movie'] == [2, 1, 3]  # 타입별 목록에는 영향 없음
+
+
+def test_cold_start_endpoint_serves_precomputed_list(client, recommender):
+    expected = recommender.current_catalog.popularity['all'][:5]
+    response = client.post('/recommendations', json={'user_id': 999999, 'limit': 5})
+    assert response.json['recommendations'] == expected
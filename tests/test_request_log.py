@@ -0,0 +1,63 @@
+import logging
+
+from config.settings import LOGGING_SETTINGS
+from monitoring.request_log import RequestLog, current_request, log_payload, request_scope, stage
+
+
+class _Payload:
+    """포맷팅될 때만 횟수를 세는 큰 페이로드 대역"""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return 'payload'
+
+
+def test_payload_is_not_formatted_unless_logged(caplog):
+    logger = logging.getLogger('forest.test.payload')
+    payload = _Payload()
+    with caplog.at_level(logging.INFO, logger=logger.name):
+        log_payload(logger, "profile: %s", payload)
+    assert payload.formatted == 0 and not caplog.records
+
+    with caplog.at_level(logging.DEBUG, logger=logger.name):
+        log_payload(logger, "profile: %s", payload)
+    assert payload.formatted >= 1 and caplog.records[-1].levelno == logging.DEBUG
+
+
+def test_sampled_request_logs_payload_at_info(caplog, monkeypatch):
+    logger = logging.getLogger('forest.test.sampled')
+    monkeypatch.setitem(LOGGING_SETTINGS, 'payload_sample_rate', 1.0)
+    with caplog.at_level(logging.INFO):
+        with request_scope('/test') as req_log:
+            assert req_log.sampled and current_request() is req_log
+            log_payload(logger, "profile: %s", 'payload')
+    assert [record.levelno for record in caplog.records if record.name == logger.name] == [logging.INFO]
+
+
+def test_request_scope_writes_one_summary_line(caplog):
+    with caplog.at_level(logging.INFO, logger='forest.request'):
+        with request_scope('/recommendations') as req_log:
+            req_log.set(user_id=7, status=200)
+            with stage('db.test'):
+                pass
+    assert current_request() is None
+    (record,) = [record for record in caplog.records if record.name == 'forest.request']
+    message = record.getMessage()
+    assert message.startswith('endpoint=/recommendations status=200 ')
+    assert 'user_id=7' in message and 'db.test_ms=' in message
+
+
+def test_no_info_logs_from_database_queries_per_request(client, caplog):
+    with caplog.at_level(logging.DEBUG):
+        client.post('/recommendations', json={'user_id': 1, 'limit': 5})
+        client.post('/recommendations', json={'user_id': 999999, 'limit': 5})  # 선호도 없는 사용자
+    noisy = [record for record in caplog.records
+             if record.name.startswith('database') and record.levelno >= logging.INFO]
+    assert noisy == []
+
+
+def test_zero_sample_rate_never_samples():
+    assert RequestLog('/x', payload_sample_rate=0).sampled is False
@@ -0,0 +1,22 @@
+import numpy as np
+
+from recommendation.reranker import mmr_rerank
+
+# 0과 1은 거의 같은 아이템, 2는 다른 아이템
+NEIGHBOR_ROWS = np.array([[1, -1], [0, -1], [-1, -1]])
+NEIGHBOR_SIMS = np.array([[0.99, 0.0], [0.99, 0.0], [0.0, 0.0]])
+
+
+def test_lambda_one_keeps_relevance_order():
+    selected = mmr_rerank(np.array([0, 1, 2]), [0.9, 0.85, 0.5], NEIGHBOR_ROWS, NEIGHBOR_SIMS, k=3, mmr_lambda=1.0)
+    assert selected.tolist() == [0, 1, 2]
+
+
+def test_near_duplicate_is_pushed_down():
+    selected = mmr_rerank(np.array([0, 1, 2]), [0.9, 0.85, 0.5], NEIGHBOR_ROWS, NEIGHBOR_SIMS, k=2, mmr_lambda=0.5)
+    assert selected.tolist() == [0, 2]
+
+
+def test_k_larger_than_pool():
+    selected = mmr_rerank(np.array([2]), [0.5], NEIGHBOR_ROWS, NEIGHBOR_SIMS, k=5)
+    assert selected.tolist() == [2]
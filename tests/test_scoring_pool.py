@@ -0,0 +1,47 @@
+import copy
+
+import numpy as np
+import pytest
+
+from recommendation.scoring_pool import ScoringPool
+
+
+@pytest.fixture(scope='module')
+def pool():
+    pool = ScoringPool(n_workers=1, batch_wait_ms=1.0, timeout=60)
+    yield pool
+    pool.close()
+
+
+def _assert_same(pool, recommender, catalog, user_vector, mask=None, top_k=10):
+    settings = recommender._settings
+    expected_rows, expected_sims = recommender._score_inline(catalog, user_vector, top_k, settings['candidate_pool'],
+                                                             mask)
+    rows, sims = pool.score(catalog, user_vector, pool_size=settings['candidate_pool'], top_k=top_k,
+                            use_mmr=settings['use_mmr'], mmr_lambda=settings['mmr_lambda'], mask=mask)
+    assert np.asarray(rows).tolist() == np.asarray(expected_rows).tolist()
+    assert np.allclose(sims, expected_sims)
+
+
+def test_pool_matches_inline_scoring(pool, recommender):
+    catalog = recommender.current_catalog
+    for row in (0, 7, 42):
+        _assert_same(pool, recommender, catalog, catalog.vector[row])
+
+    mask = np.zeros(len(catalog), dtype=bool)
+    mask[::3] = True
+    _assert_same(pool, recommender, catalog, catalog.vector[7], mask=mask)
+
+
+def test_pool_matches_inline_without_neighbor_table(pool, recommender):
+    catalog = copy.copy(recommender.current_catalog)
+    catalog.neighbor_rows = catalog.neighbor_sims = None
+    catalog.version = -1  # 공유 메모리는 버전별로 게시되므로 다른 버전으로
+    _assert_same(pool, recommender, catalog, catalog.vector[3])
+
+
+def test_pool_size_divides_cores_between_web_workers(monkeypatch):
+    monkeypatch.setattr('os.cpu_count', lambda: 8)
+    assert ScoringPool(web_workers=4)._n_workers == 2
+    assert ScoringPool(web_workers=16)._n_workers == 1
+    assert ScoringPool(n_workers=3, web_workers=4)._n_workers == 3
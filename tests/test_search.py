@@ -0,0 +1,50 @@
+import numpy as np
+
+from recommendation.search import SearchIndex, char_bigrams
+
+TITLES = ['귀멸의 칼날: 무한열차편', '어벤져스: 엔드게임', '가족 드라마', '조용한 전시']
+GENRES = [['애니메이션'], ['액션'], ['드라마'], ['전시']]
+KEYWORDS = [['감동'], ['히어로', '액션'], ['가족', '감동'], ['무한']]
+
+
+def _index():
+    return SearchIndex.build(TITLES, GENRES, KEYWORDS)
+
+
+def test_char_bigrams_ignore_spaces():
+    assert char_bigrams('무한 열차') == ['무한', '한열', '열차']
+    assert char_bigrams('a') == ['a']
+
+
+def test_title_words_outrank_keywords():
+    rows, scores = _index().search('무한열차편', 5)
+    assert rows[0] == 0
+    rows, _ = _index().search('감동', 5)
+    assert set(rows.tolist()) == {0, 2}
+    assert np.all(np.diff(scores) <= 0)
+
+
+def test_partial_title_falls_back_to_bigrams():
+    rows, _ = _index().search('어벤져', 5)
+    assert rows.tolist() == [1]
+    rows, _ = _index().search('무한열차', 5)
+    assert rows[0] == 0
+
+
+def test_allowed_mask_filters_results():
+    allowed = np.array([False, True, True, True])
+    rows, _ = _index().search('감동', 5, allowed)
+    assert rows.tolist() == [2]
+
+
+def test_search_endpoint(client, recommender):
+    catalog = recommender.current_catalog
+    title = next(title for title in catalog.titles if title)
+    response = client.get('/search', query_string={'q': title, 'k': 3})
+    items = response.json['items']
+    assert response.json['status'] == 'success'
+    assert items[0]['title'] == title
+    assert len(items) <= 3
+
+    assert client.get('/search', query_string={'q': ''}).status_code == 400
+    assert client.get('/search', query_string={'q': title, 'content_type': 'tv'}).status_code == 400
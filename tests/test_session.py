@@ -0,0 +1,107 @@
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from chatbot.keyword_extractor import KeywordExtractor
+from chatbot.llm_client import LLMUnavailableError
+from chatbot.session import ChatSession, SessionStore
+
+
+def _session(*messages):
+    session = ChatSession('u1')
+    for message in messages:
+        session.add_turn(message)
+    return session
+
+
+def test_finalize_merges_collected_turns_without_reextracting():
+    session = _session('로맨스 좋아요', '코미디도 좋아요')
+    for turn, keywords in enumerate([['로맨스'], ['코미디', '로맨스']]):
+        future = Future()
+        session.track(turn, future)
+        future.set_result(keywords)
+
+    calls = []
+    keywords = session.finalize(lambda text: calls.append(text) or [], timeout=1)
+    assert calls == []
+    assert keywords == ['로맨스', '코미디']
+
+
+def test_finalize_reextracts_failed_and_unfinished_turns():
+    session = _session('실패한 턴', '끝나지 않은 턴')
+    failed, unfinished = Future(), Future()
+    session.track(0, failed)
+    session.track(1, unfinished)
+    failed.set_exception(LLMUnavailableError("LLM 서킷 브레이커 열림"))
+
+    keywords = session.finalize(lambda text: [text.split()[0]], timeout=0.05)
+    assert sorted(keywords) == ['끝나지', '실패한']
+
+    # finalize 이후 도착한 이전 작업의 결과는 반영하지 않음
+    unfinished.set_result(['늦은키워드'])
+    assert '늦은키워드' not in session.keywords_so_far()
+    assert session.pending_turns == 0
+
+
+def test_turn_after_finalize_is_collected():
+    session = _session('첫 턴')
+    first = Future()
+    session.track(0, first)
+    session.finalize(lambda text: ['첫'], timeout=0)
+    first.set_result(['늦은키워드'])
+    turn = session.add_turn('둘째 턴')
+    future = Future()
+    session.track(turn, future)
+    future.set_result(['둘째'])
+    assert set(session.keywords_so_far()) == {'첫', '둘째'}
+
+
+class _FailingLLM:
+    def complete(self, call, messages, model, **params):
+        raise LLMUnavailableError("LLM 응답 시간 초과")
+
+
+def test_strict_extraction_raises_llm_errors():
+    extractor = KeywordExtractor(openai_api_key='test', llm_client=_FailingLLM(), settings={'result_log_path': ''})
+    assert extractor._extract_keywords_gpt('로맨스 영화') == []
+    assert extractor._is_positive('로맨스', '로맨스 영화') is False
+    with pytest.raises(LLMUnavailableError):
+        extractor._extract_keywords_gpt('로맨스 영화', strict=True)
+    with pytest.raises(LLMUnavailableError):
+        extractor._is_positive('로맨스', '로맨스 영화', strict=True)
+
+
+def test_background_failure_reaches_finalize_retry():
+    store = SessionStore(workers=1)
+    session = store.get_or_create('u1')
+    turn = session.add_turn('로맨스 좋아요')
+    done = threading.Event()
+
+    def extract(text):
+        try:
+            raise LLMUnavailableError("LLM 서킷 브레이커 열림")
+        finally:
+            done.set()
+
+    store.extract_in_background(session, turn, '로맨스 좋아요', extract)
+    done.wait(1)
+    assert session.finalize(lambda text: ['로맨스'], timeout=1) == ['로맨스']
+
+
+def test_sessions_expire_after_ttl():
+    store = SessionStore(workers=1, ttl_s=0.05)
+    session = store.get_or_create('u1')
+    session.add_turn('안녕하세요')
+    assert store.get('u1') is session
+
+    time.sleep(0.08)
+    assert store.get('u1') is None
+    assert store.get_or_create('u1') is not session
+    store.get_or_create('u2')
+    assert len(store) == 2
+
+    time.sleep(0.08)
+    store.get_or_create('u3')
+    assert len(store) == 1
@@ -0,0 +1,41 @@
+import numpy as np
+
+
+def _item_with_mixed_neighbors(catalog):
+    for row in range(len(catalog)):
+        rows, _ = catalog.neighbors(row)
+        if rows.size and len(set(catalog.content_types[rows].tolist())) > 1:
+            return row
+    raise AssertionError('컨텐츠 타입이 섞인 이웃을 가진 아이템이 없습니다.')
+
+
+def test_similar_items_follow_neighbor_table(client, recommender):
+    catalog = recommender.current_catalog
+    row = _item_with_mixed_neighbors(catalog)
+    activity_id = int(catalog.activity_ids[row])
+    neighbor_rows, neighbor_sims = catalog.neighbors(row)
+
+    data = client.get(f'/items/{activity_id}/similar', query_string={'k': 5}).json
+    assert data['status'] == 'success' and data['activity_id'] == activity_id
+    assert [item['activity_id'] for item in data['items']] == catalog.ids_for(neighbor_rows[:5])
+    similarities = [item['similarity'] for item in data['items']]
+    assert similarities == sorted(similarities, reverse=True)
+    assert np.allclose(similarities, neighbor_sims[:5], atol=1e-4)
+    assert activity_id not in [item['activity_id'] for item in data['items']]
+
+
+def test_content_type_filter(client, recommender):
+    catalog = recommender.current_catalog
+    activity_id = int(catalog.activity_ids[_item_with_mixed_neighbors(catalog)])
+    items = client.get(f'/items/{activity_id}/similar', query_string={'content_type': 'movie'}).json['items']
+    assert items and all(item['content_type'] == 'movie' for item in items)
+
+    response = client.get(f'/items/{activity_id}/similar', query_string={'content_type': 'tv'})
+    assert response.status_code == 400
+
+
+def test_unknown_item_and_bad_k(client, recommender):
+    missing = int(recommender.current_catalog.activity_ids.max()) + 1
+    assert client.get(f'/items/{missing}/similar').status_code == 404
+    activity_id = int(recommender.current_catalog.activity_ids[0])
+    assert client.get(f'/items/{activity_id}/similar', query_string={'k': 0}).status_code == 400
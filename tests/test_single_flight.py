@@ -0,0 +1,69 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from recommendation.cache import SingleFlight
+
+
+def _run_concurrently(n, call):
+    with ThreadPoolExecutor(max_workers=n) as executor:
+        futures = [executor.submit(call) for _ in range(n)]
+    return futures
+
+
+def test_concurrent_calls_share_one_computation():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return [1, 2, 3]
+
+    def call():
+        return flight.do('user-1', compute)
+
+    threading.Timer(0.1, release.set).start()
+    results = [future.result() for future in _run_concurrently(8, call)]
+    assert len(calls) == 1
+    assert all(result == [1, 2, 3] for result, _ in results)
+    assert sorted(shared for _, shared in results) == [False] + [True] * 7
+    assert flight.in_flight() == 0
+    # 끝난 뒤의 호출은 결과를 캐시하지 않으므로 다시 계산
+    flight.do('user-1', compute)
+    assert len(calls) == 2
+
+
+def test_error_is_shared_with_waiters():
+    flight = SingleFlight()
+
+    def compute():
+        time.sleep(0.1)
+        raise RuntimeError('db down')
+
+    futures = _run_concurrently(4, lambda: flight.do('user-1', compute))
+    for future in futures:
+        with pytest.raises(RuntimeError, match='db down'):
+            future.result()
+    assert flight.in_flight() == 0
+
+
+def test_identical_recommendation_requests_are_coalesced(recommender, monkeypatch):
+    calls = []
+    compute = recommender._compute_recommendations
+
+    def slow_compute(*args, **kwargs):
+        calls.append(args)
+        time.sleep(0.2)
+        return compute(*args, **kwargs)
+    monkeypatch.setattr(recommender, '_compute_recommendations', slow_compute)
+
+    futures = _run_concurrently(6, lambda: recommender.get_recommendations(1))
+    results = [future.result() for future in futures]
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+    results[0].append(-1)  # 호출한 쪽마다 복사본
+    assert results[1] != results[0]
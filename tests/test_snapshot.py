@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from recommendation.recommendation import RecommendationAlgorithm
+from recommendation.snapshot import read_manifest
+
+USER_ID = 1
+
+
+@pytest.fixture
+def publisher(local_db, tmp_path):
+    return RecommendationAlgorithm({'snapshot_mode': 'publish', 'snapshot_dir': str(tmp_path), 'snapshot_keep': 2})
+
+
+@pytest.fixture
+def follower(local_db, tmp_path):
+    return RecommendationAlgorithm({'snapshot_mode': 'follow', 'snapshot_dir': str(tmp_path)})
+
+
+def test_follower_serves_published_catalog(publisher, follower):
+    assert follower.load_catalog_snapshot() is None  # 아직 배포된 스냅샷 없음
+
+    published = publisher.refresh_catalog()
+    loaded = follower.load_catalog_snapshot()
+    assert loaded.snapshot_id == published.snapshot_id == read_manifest(follower._settings['snapshot_dir'])['snapshot_id']
+    assert loaded.fingerprint() == published.fingerprint()
+    assert np.array_equal(loaded.activity_ids, published.activity_ids)
+
+    assert follower.get_recommendations(USER_ID) == publisher.get_recommendations(USER_ID)
+    assert follower.search_items('드라마') == publisher.search_items('드라마')
+    # 이미 최신이면 다시 불러오지 않음
+    assert follower.load_catalog_snapshot() is None
+
+
+def test_follower_hot_swaps_new_snapshot(publisher, follower):
+    publisher.refresh_catalog()
+    first = follower.load_catalog_snapshot()
+    page = follower.get_recommendation_page(USER_ID, limit=5)
+
+    second_published = publisher.refresh_catalog()
+    second = follower.load_catalog_snapshot()
+    assert second is follower.current_catalog
+    assert second.snapshot_id == second_published.snapshot_id != first.snapshot_id
+    assert second.version > first.version
+
+    # 교체 전에 받은 커서는 캐시된 순위 목록으로 이어짐
+    next_page = follower.get_recommendation_page(USER_ID, cursor=page['next_cursor'], limit=5)
+    assert not set(page['recommendations']) & set(next_page['recommendations'])
+
+
+def test_cursor_from_publisher_pages_on_follower(publisher, follower):
+    publisher.refresh_catalog()
+    follower.load_catalog_snapshot()
+    page = publisher.get_recommendation_page(USER_ID, limit=5)
+    expected = publisher.get_recommendation_page(USER_ID, cursor=page['next_cursor'], limit=5)
+    assert follower.get_recommendation_page(USER_ID, cursor=page['next_cursor'], limit=5) == expected
@@ -0,0 +1,20 @@
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = ('konlpy', 'jpype', 'openai', 'sklearn')
+
+
+def test_app_import_does_not_load_heavy_dependencies():
+    # 새 인터프리터에서 확인 (이 테스트 프로세스에는 다른 테스트가 이미 import한 모듈이 남아 있음)
+    code = (
+        "import sys, app\n"
+        "app.create_app('all')\n"
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+    )
+    src_dir = os.path.join(os.path.dirname(__file__), '..', 'src')
+    env = dict(os.environ, LOG_LEVEL='WARNING')
+    result = subprocess.run([sys.executable, '-c', code], cwd=src_dir, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ''
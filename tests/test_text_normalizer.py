@@ -0,0 +1,38 @@
+from recommendation.preprocessor import DataPreprocessor
+from recommendation.text_normalizer import content_digest, extract_fields, normalize_rows, split_list
+
+
+def _item(activity_id, **fields):
+    return {'activity_id': activity_id, 'content_type': 'movie', 'title': f'영화 {activity_id}', **fields}
+
+
+def test_split_list_parses_json_columns():
+    assert split_list('["가족", "성장, 우정"]') == ['가족', '성장, 우정']
+    assert split_list('드라마,코미디') == ['드라마', '코미디']
+    assert split_list('[깨진 json') == ['[깨진 json']
+    assert split_list(['a', 1]) == ['a', '1'] and split_list(None) == []
+
+
+def test_normalize_rows_keeps_column_order():
+    item = _item(1, title='Title', description='설명', genre='드라마, 가족', keywords='["감동", null]')
+    assert normalize_rows([extract_fields(item)]) == ['title title 설명 드라마 가족 감동']
+
+
+def test_text_cache_reuses_unchanged_items_and_renormalizes_changed(monkeypatch):
+    preprocessor = DataPreprocessor()
+    items = [_item(i, keywords='["가족"]') for i in range(3)]
+    preprocessor._preprocess_texts(items)
+    assert preprocessor._text_cache[('movie', 1)][0] == content_digest(extract_fields(items[1]))
+
+    normalized = []
+
+    def record(rows):
+        normalized.extend(rows)
+        return normalize_rows(rows)
+    monkeypatch.setattr(preprocessor, '_normalize', record)
+    items[1] = _item(1, keywords='["공포"]')
+    texts = preprocessor._preprocess_texts(items[:2])
+
+    assert normalized == [extract_fields(items[1])]
+    assert texts[1].endswith('공포')
+    assert ('movie', 2) not in preprocessor._text_cache  # 카탈로그에서 빠진 아이템은 캐시에서도 제거
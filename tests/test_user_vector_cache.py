@@ -0,0 +1,44 @@
+import pytest
+
+from recommendation.preprocessor import DataPreprocessor
+
+ITEMS = [
+    {'activity_id': 1, 'content_type': 'movie', 'title': '가족 드라마', 'keywords': '["감동", "가족"]'},
+    {'activity_id': 2, 'content_type': 'movie', 'title': '액션 스릴러', 'keywords': '["긴장감"]'},
+    {'activity_id': 3, 'content_type': 'exhibition', 'title': '사진 전시', 'keywords': '["여행"]'},
+]
+PROFILE = {'movie_genre_preference': ['드라마'], 'performance_genre_preference': [],
+           'exhibition_genre_preference': [], 'like_words': ['가족']}
+
+
+@pytest.fixture
+def preprocessor():
+    preprocessor = DataPreprocessor()
+    preprocessor.preprocess_items(ITEMS)
+    return preprocessor
+
+
+def test_same_tokens_hit_the_cache(preprocessor):
+    first = preprocessor.vectorize_keywords(['드라마', '가족'])
+    # 대소문자/앞뒤 공백/None만 다른 조합은 같은 키
+    assert preprocessor.vectorize_keywords([' 드라마 ', None, '가족']) is first
+    stats = preprocessor.user_vector_cache_stats()
+    assert (stats['hits'], stats['misses']) == (1, 1)
+
+
+def test_refit_changes_version_and_misses(preprocessor):
+    before = preprocessor.preprocess_user_data(PROFILE)
+    processed = preprocessor.preprocess_items(ITEMS, refit=True)
+    after = preprocessor.preprocess_user_data(PROFILE)
+
+    assert processed['vectorizer_version'] == before['vectorizer_version'] + 1 == after['vectorizer_version']
+    assert after['vector'] is not before['vector']
+    assert preprocessor.user_vector_cache_stats()['misses'] == 2
+
+
+def test_vector_for_a_non_current_vectorizer_is_not_cached(preprocessor):
+    old_vectorizer = preprocessor.preprocess_items(ITEMS)['vectorizer']
+    preprocessor.preprocess_items(ITEMS, refit=True)
+    processed = preprocessor.preprocess_user_data(PROFILE, vectorizer=old_vectorizer)
+    assert processed['vectorizer_version'] is None
+    assert preprocessor.user_vector_cache_stats()['size'] == 0